@@ -0,0 +1,63 @@
+import sys
+import tracemalloc
+from datetime import date
+from prettytable import PrettyTable
+
+from classes.GEDCOM_Units import Individual, Family, CompactIndividual, CompactFamily
+
+#Measures how many bytes each Individual and Family record takes up, for the different versions of the classes
+#Only the records themselves are measured. The strings and dates they point to are made beforehand, since they're the same no matter which class is used
+
+#How the units were laid out before they used __slots__ (a __dict__ for every instance, and a list for every spouseIn/childIds)
+class DictIndividual():
+    def __init__(self, id: str, name: str = None, sex: str = None, birthDate: date = None, deathDate: date = None, childIn: str = None, spouseIn: list[str] = None):
+        self.id = id
+        self.rawDates = None
+        self.name = name
+        self.sex = sex
+        self.birthDate = birthDate
+        self.deathDate = deathDate
+        self.childIn = childIn
+        self.spouseIn = [] if spouseIn is None else spouseIn
+
+class DictFamily():
+    def __init__(self, id: str, husbandId: str = None, wifeId: str = None, childIds: list[str] = None, marriageDate: date = None, divorceDate: date = None):
+        self.id = id
+        self.rawDates = None
+        self.husbandId = husbandId
+        self.wifeId = wifeId
+        self.childIds = [] if childIds is None else childIds
+        self.marriageDate = marriageDate
+        self.divorceDate = divorceDate
+
+
+#Returns the average number of bytes allocated per record when making count of them
+#Roughly half of the individuals have no spousal family, and roughly a third of the families have no children, which is about what real trees look like
+def measure(indiType: type, famType: type, count: int) -> tuple[float, float]:
+    ids: list[str] = [f"@I{i}@" for i in range(count)]
+    famIds: list[str] = [f"@F{i}@" for i in range(count)]
+    birthDate: date = date(1950, 1, 1)
+    spouseLists: list[list[str]] = [[famIds[i]] if i % 2 == 0 else None for i in range(count)]
+    childLists: list[list[str]] = [[ids[i]] if i % 3 != 0 else None for i in range(count)]
+
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    individuals: list = [indiType(ids[i], "John /Doe/", "M", birthDate, None, famIds[i], spouseLists[i]) for i in range(count)]
+    indiBytes: int = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(individuals)
+    before = tracemalloc.get_traced_memory()[0]
+    families: list = [famType(famIds[i], ids[i], ids[i], childLists[i], birthDate, None) for i in range(count)]
+    famBytes: int = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(families)
+    tracemalloc.stop()
+
+    #The lists that were passed in were made before measuring, so they're not counted. Lists made by the constructors themselves (the empty ones) are
+    return indiBytes / count, famBytes / count
+
+
+if __name__ == "__main__":
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    table = PrettyTable(["Layout", "Bytes per Individual", "Bytes per Family"])
+    for (label, indiType, famType) in [("__dict__ (before)", DictIndividual, DictFamily), ("__slots__", Individual, Family), ("__slots__ + shared empty IDs (compact)", CompactIndividual, CompactFamily)]:
+        indiBytes, famBytes = measure(indiType, famType, count)
+        table.add_row([label, f"{indiBytes:.1f}", f"{famBytes:.1f}"])
+    print(f"Memory per record ({count} of each):")
+    print(table)
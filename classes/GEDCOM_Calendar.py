@@ -0,0 +1,100 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from calendar import isleap
+from datetime import date, timedelta
+from typing import Iterable, Iterator
+
+#Contains the date indexes: the day of year index used for upcoming birthdays and anniversaries (US38, US39), and the event index used for recent births and
+#deaths (US35, US36) and any other date range question
+#The day of year index stores every date by its month and day only, sorted, so the ones coming up in any window can be found with a binary search instead of
+#going through everyone. The year doesn't matter for these, except for leap days: a February 29th date falls on February 28th in years that don't have one
+#The event index stores every event (birth, death, marriage, divorce) sorted by its full date, so any range of dates is a binary search away
+
+#Month and day as a single number that sorts the same way (ex. 229 for February 29th)
+def monthDay(value: date) -> int:
+    return value.month * 100 + value.day
+
+
+class DayOfYearIndex():
+    #entries are (ID, date) pairs, in the order the records are in. Entries without a date are left out
+    def __init__(self, entries: Iterable[tuple[str, date]]):
+        #Sorted by month and day, then by the order the records are in (sorting is stable)
+        ordered: list[tuple[int, int, str]] = sorted(((monthDay(value), position, id) for position, (id, value) in enumerate(entries) if value is not None), key=lambda entry: entry[0])
+        self.keys: list[int] = [key for key, _, _ in ordered]
+        self.positions: list[int] = [position for _, position, _ in ordered]
+        self.ids: list[str] = [id for _, _, id in ordered]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    #Returns the next time every date falls from the start date on (including the start date), for the ones that fall within the given number of days after it
+    #Gives back (ID, date) pairs sorted by date, with ties kept in the order the records are in. Nobody shows up more than once, even for windows over a year long
+    def upcoming(self, start: date, days: int) -> list[tuple[str, date]]:
+        end: date = start + timedelta(days=days)
+        found: list[tuple[date, int, str]] = []
+        startKey: int = monthDay(start)
+        split: int = bisect_left(self.keys, startKey)
+        #Dates from the start date to the end of the year fall this year, and the ones before it fall next year
+        for year, first, last in ((start.year, split, len(self.keys)), (start.year + 1, 0, split)):
+            if(date(year, 1, 1) > end):
+                break
+            for i in range(first, last):
+                key: int = self.keys[i]
+                if(key == 229 and not isleap(year)):
+                    occurrence: date = date(year, 2, 28)
+                else:
+                    occurrence: date = date(year, key // 100, key % 100)
+                if(occurrence > end):
+                    break
+                found.append((occurrence, self.positions[i], self.ids[i]))
+        #Moving leap days to the 28th can put them out of order with the people who were actually born on the 28th
+        found.sort(key=lambda entry: (entry[0], entry[1]))
+        return [(id, occurrence) for occurrence, _, id in found]
+
+
+#Kinds of events in an EventIndex, along with the record field they come from
+eventFields: dict[str, str] = {"birth": "birthDate", "death": "deathDate", "marriage": "marriageDate", "divorce": "divorceDate"}
+
+
+class EventIndex():
+    #Events of individuals (births and deaths) and families (marriages and divorces) are both indexed, each kind sorted by date on its own
+    #Events on the same day stay in the order the records are in. Divorces are only the recorded ones, not the deaths that end a marriage
+    def __init__(self, individuals: Iterable[tuple[str, object]], families: Iterable[tuple[str, object]]):
+        self.dates: dict[str, list[date]] = {}
+        self.ids: dict[str, list[str]] = {}
+        individuals = list(individuals)
+        families = list(families)
+        for kind, field in eventFields.items():
+            records = individuals if kind in ("birth", "death") else families
+            events: list[tuple[date, str]] = sorted(((getattr(record, field), id) for id, record in records if getattr(record, field) is not None), key=lambda event: event[0])
+            self.dates[kind] = [value for value, _ in events]
+            self.ids[kind] = [id for _, id in events]
+
+    #Number of events of the given kind
+    def count(self, kind: str) -> int:
+        return len(self.dates[kind])
+
+    #Goes through the events of the given kind from the start date to the end date (both included), in date order, as (ID, date) pairs
+    #Leaving out the start or end date leaves that side of the range open
+    def between(self, kind: str, start: date = None, end: date = None) -> Iterator[tuple[str, date]]:
+        dates: list[date] = self.dates[kind]
+        ids: list[str] = self.ids[kind]
+        first: int = 0 if start is None else bisect_left(dates, start)
+        last: int = len(dates) if end is None else bisect_right(dates, end)
+        for i in range(first, last):
+            yield (ids[i], dates[i])
+
+    #Goes through the events of the given kind in the given number of days up to and including the given date (today if not given)
+    def inLastDays(self, kind: str, days: int, today: date = None) -> Iterator[tuple[str, date]]:
+        today = date.today() if today is None else today
+        return self.between(kind, today - timedelta(days=days), today)
+
+    #Same as between(), but for several kinds of events at once, merged into date order as (kind, ID, date). Events on the same day come in the order of the kinds given
+    def events(self, start: date = None, end: date = None, kinds: Iterable[str] = eventFields) -> Iterator[tuple[str, str, date]]:
+        streams: list[Iterator[tuple[date, int, str, str]]] = [self._tagged(kind, order, start, end) for order, kind in enumerate(kinds)]
+        for value, _, kind, id in heapq.merge(*streams, key=lambda event: (event[0], event[1])):
+            yield (kind, id, value)
+
+    def _tagged(self, kind: str, order: int, start: date, end: date) -> Iterator[tuple[date, int, str, str]]:
+        for id, value in self.between(kind, start, end):
+            yield (value, order, kind, id)
@@ -0,0 +1,342 @@
+from array import array
+from collections.abc import Mapping
+from datetime import date
+from typing import Iterable, Iterator
+
+from classes.GEDCOM_Units import GEDCOMUnit, Individual, Family, GEDCOMReadException
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Names import splitName
+
+#Contains an optional column based (struct of arrays) store for individuals and families, as well as an adapter so the Report checks can read from it
+#Every ID gets a dense integer row number. Dates are stored as day ordinals (date.toordinal()), so whole columns can be scanned without touching any Python objects
+#The store can be filled straight from the parser (load_report(..., columnar=True)), in which case each record is written into the columns as soon as it's read
+#and then dropped, so the object maps are never built. It can also be made from records that already exist (fromUnits/fromReport)
+#Only the vectorized checks (see GEDCOM_Vectorized.py) and the memory use gain from this. Every other check reads the records through views (IndividualView, FamilyView),
+#which make new date objects, ID lists, and name parts every time a field is read, so those checks are slower on a columnar report than on a normal one
+
+#Stored in date columns when there's no date
+missingDay: int = 0
+#Stored in row columns when there's no reference
+noRow: int = -1
+
+#Sex is stored as one byte per individual
+sexToCode: dict[str, int] = {None: 0, "M": 1, "F": 2}
+codeToSex: list[str] = [None, "M", "F"]
+otherSexCode: int = 3 #Any other value. The actual value is kept in ColumnarStore.otherSex
+
+
+def dateToDay(value: date) -> int:
+    return missingDay if value is None else value.toordinal()
+
+def dayToDate(day: int) -> date:
+    return None if day == missingDay else date.fromordinal(day)
+
+
+class ColumnarStore():
+    def __init__(self):
+        #Individual columns. Every ID referenced anywhere gets a row, but only the ones that have an actual record are marked in indiExists (needed for US26)
+        self.indiIds: list[str] = []
+        self.indiRows: dict[str, int] = {}
+        self.indiExists: bytearray = bytearray()
+        #Rows of the actual records, in the order they were added (the order the checks go through them in). A record can be referenced before it's read,
+        #so this isn't always the same as the row order
+        self.indiOrder: array = array("l")
+        self.names: list[str] = []
+        self.sex: bytearray = bytearray()
+        self.otherSex: dict[int, str] = {}
+        self.birthDays: array = array("l")
+        self.deathDays: array = array("l")
+        self.childInRows: array = array("l")
+        #Spousal families of individual i are spouseRows[spouseOffsets[i]:spouseOffsets[i+1]]
+        self.spouseOffsets: array = array("l", [0])
+        self.spouseRows: array = array("l")
+
+        #Family columns. Same idea as the individual columns
+        self.famIds: list[str] = []
+        self.famRows: dict[str, int] = {}
+        self.famExists: bytearray = bytearray()
+        self.famOrder: array = array("l")
+        self.husbandRows: array = array("l")
+        self.wifeRows: array = array("l")
+        self.marriageDays: array = array("l")
+        self.divorceDays: array = array("l")
+        #Children of family f are childRows[childOffsets[f]:childOffsets[f+1]]
+        self.childOffsets: array = array("l", [0])
+        self.childRows: array = array("l")
+
+        #Links (owner row, linked row) added since the offsets were last worked out. References to records that haven't been read yet make new rows,
+        #so the offsets can only be worked out once nothing else is being added (see linkRows)
+        self.newSpouseLinks: tuple[array, array] = (array("l"), array("l"))
+        self.newChildLinks: tuple[array, array] = (array("l"), array("l"))
+
+    #Gives back the row of an individual, making an empty one if the ID hasn't been seen before
+    def indiRow(self, id: str) -> int:
+        if(id is None):
+            return noRow
+        row: int = self.indiRows.get(id, noRow)
+        if(row == noRow):
+            row = len(self.indiIds)
+            self.indiRows[id] = row
+            self.indiIds.append(id)
+            self.indiExists.append(0)
+            self.names.append(None)
+            self.sex.append(0)
+            self.birthDays.append(missingDay)
+            self.deathDays.append(missingDay)
+            self.childInRows.append(noRow)
+        return row
+
+    #Same as indiRow, but for families
+    def famRow(self, id: str) -> int:
+        if(id is None):
+            return noRow
+        row: int = self.famRows.get(id, noRow)
+        if(row == noRow):
+            row = len(self.famIds)
+            self.famRows[id] = row
+            self.famIds.append(id)
+            self.famExists.append(0)
+            self.husbandRows.append(noRow)
+            self.wifeRows.append(noRow)
+            self.marriageDays.append(missingDay)
+            self.divorceDays.append(missingDay)
+        return row
+
+    #Writes an individual into the columns. The record itself isn't kept
+    def addIndividual(self, indi: Individual) -> None:
+        row: int = self.indiRow(indi.id)
+        self.indiExists[row] = 1
+        self.indiOrder.append(row)
+        self.names[row] = indi.name
+        sexCode: int = sexToCode.get(indi.sex, otherSexCode)
+        if(sexCode == otherSexCode):
+            self.otherSex[row] = indi.sex
+        self.sex[row] = sexCode
+        self.birthDays[row] = dateToDay(indi.birthDate)
+        self.deathDays[row] = dateToDay(indi.deathDate)
+        self.childInRows[row] = self.famRow(indi.childIn)
+        for famId in indi.spouseIn:
+            self.newSpouseLinks[0].append(row)
+            self.newSpouseLinks[1].append(self.famRow(famId))
+
+    #Same as addIndividual, but for families
+    def addFamily(self, fam: Family) -> None:
+        row: int = self.famRow(fam.id)
+        self.famExists[row] = 1
+        self.famOrder.append(row)
+        self.husbandRows[row] = self.indiRow(fam.husbandId)
+        self.wifeRows[row] = self.indiRow(fam.wifeId)
+        self.marriageDays[row] = dateToDay(fam.marriageDate)
+        self.divorceDays[row] = dateToDay(fam.divorceDate)
+        for childId in fam.childIds:
+            self.newChildLinks[0].append(row)
+            self.newChildLinks[1].append(self.indiRow(childId))
+
+    #Works out the spouse and child offsets again if anything was added since the last time. Called before they're read
+    def linkRows(self) -> None:
+        if(self.newSpouseLinks[0] or len(self.spouseOffsets) <= len(self.indiIds)):
+            self.spouseOffsets, self.spouseRows = self.mergeLinks(self.spouseOffsets, self.spouseRows, self.newSpouseLinks, len(self.indiIds))
+            self.newSpouseLinks = (array("l"), array("l"))
+        if(self.newChildLinks[0] or len(self.childOffsets) <= len(self.famIds)):
+            self.childOffsets, self.childRows = self.mergeLinks(self.childOffsets, self.childRows, self.newChildLinks, len(self.famIds))
+            self.newChildLinks = (array("l"), array("l"))
+
+    #Returns new offsets and linked rows, with the new links added in after each row's old ones (in the order they were added)
+    @staticmethod
+    def mergeLinks(offsets: array, rows: array, newLinks: tuple[array, array], numRows: int) -> tuple[array, array]:
+        added: dict[int, array] = {}
+        for owner, linked in zip(*newLinks):
+            added.setdefault(owner, array("l")).append(linked)
+        mergedOffsets: array = array("l", [0])
+        mergedRows: array = array("l")
+        for row in range(numRows):
+            if(row + 1 < len(offsets)):
+                mergedRows.extend(rows[offsets[row]:offsets[row+1]])
+            mergedRows.extend(added.get(row, ()))
+            mergedOffsets.append(len(mergedRows))
+        return mergedOffsets, mergedRows
+
+    #Builds the store out of all the records in the given individuals and families
+    #Rows for every record are made first, so the row numbers follow the order of the records
+    @classmethod
+    def fromUnits(cls, individuals: Iterable[Individual], families: Iterable[Family]) -> "ColumnarStore":
+        store: ColumnarStore = cls()
+        individuals = list(individuals)
+        families = list(families)
+        for indi in individuals:
+            store.indiRow(indi.id)
+        for fam in families:
+            store.famRow(fam.id)
+        for indi in individuals:
+            store.addIndividual(indi)
+        for fam in families:
+            store.addFamily(fam)
+        store.linkRows()
+        return store
+
+    @classmethod
+    def fromReport(cls, report: Report) -> "ColumnarStore":
+        return cls.fromUnits(report.indi_map.values(), report.fam_map.values())
+
+    def getSex(self, row: int) -> str:
+        code: int = self.sex[row]
+        return self.otherSex.get(row) if code == otherSexCode else codeToSex[code]
+
+    def getSpouseRows(self, row: int) -> array:
+        self.linkRows()
+        return self.spouseRows[self.spouseOffsets[row]:self.spouseOffsets[row+1]]
+
+    def getChildRows(self, row: int) -> array:
+        self.linkRows()
+        return self.childRows[self.childOffsets[row]:self.childOffsets[row+1]]
+
+    #Makes a Report whose maps read straight from this store, so that all of the existing checks can be run on it
+    def asReport(self) -> "ColumnarReport":
+        return ColumnarReport(self)
+
+
+#Report whose maps are views into a columnar store. Records added to it are written into the store's columns instead of being kept
+class ColumnarReport(Report):
+    def __init__(self, store: ColumnarStore = None, date_cache = None):
+        super().__init__(date_cache)
+        self.store: ColumnarStore = ColumnarStore() if store is None else store
+        self.indi_map = ColumnarIndividualMap(self.store)
+        self.fam_map = ColumnarFamilyMap(self.store)
+
+    #Same as Report.addToReport, but the record goes into the store
+    def addToReport(self, unit: GEDCOMUnit) -> None:
+        if(unit is None):
+            return
+        elif(not isinstance(unit, (Individual, Family))):
+            raise GEDCOMReadException("Attempting to add non-GEDCOMUnit object to either the Individual or Family maps")
+        if(unit.id in (self.indi_map if isinstance(unit, Individual) else self.fam_map)):
+            unit.id = self.check_unique_id_and_fix(unit.id)
+        if(isinstance(unit, Individual)):
+            self.store.addIndividual(unit)
+            if(self.phonetic_index is not None):
+                self.phonetic_index.add(unit)
+            if(self.name_index is not None):
+                self.name_index.add(unit)
+        else:
+            self.store.addFamily(unit)
+        self.xrefs.intern(unit.id)
+        self.invalidate_indexes(names=False)
+
+
+#Views of a single row in the store. They have the same fields (and row data) as Individual and Family, so the checks can't tell the difference
+#Only the field the checks change (Family.childIds, reordered by US28) can be set
+class IndividualView():
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: ColumnarStore, row: int):
+        self.store = store
+        self.row = row
+
+    id = property(lambda self: self.store.indiIds[self.row])
+    name = property(lambda self: self.store.names[self.row])
+    givenName = property(lambda self: None if self.name is None else splitName(self.name)[0])
+    surname = property(lambda self: None if self.name is None else splitName(self.name)[1])
+    sex = property(lambda self: self.store.getSex(self.row))
+    birthDate = property(lambda self: dayToDate(self.store.birthDays[self.row]))
+    deathDate = property(lambda self: dayToDate(self.store.deathDays[self.row]))
+
+    @property
+    def childIn(self) -> str:
+        famRow: int = self.store.childInRows[self.row]
+        return None if famRow == noRow else self.store.famIds[famRow]
+
+    @property
+    def spouseIn(self) -> list[str]:
+        return [self.store.famIds[famRow] for famRow in self.store.getSpouseRows(self.row)]
+
+    calculateAge = Individual.calculateAge
+    getRowData = Individual.getRowData
+
+
+class FamilyView():
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: ColumnarStore, row: int):
+        self.store = store
+        self.row = row
+
+    id = property(lambda self: self.store.famIds[self.row])
+    marriageDate = property(lambda self: dayToDate(self.store.marriageDays[self.row]))
+
+    @property
+    def husbandId(self) -> str:
+        indiRow: int = self.store.husbandRows[self.row]
+        return None if indiRow == noRow else self.store.indiIds[indiRow]
+
+    @property
+    def wifeId(self) -> str:
+        indiRow: int = self.store.wifeRows[self.row]
+        return None if indiRow == noRow else self.store.indiIds[indiRow]
+
+    @property
+    def divorceDate(self) -> date:
+        return dayToDate(self.store.divorceDays[self.row])
+
+    @property
+    def childIds(self) -> list[str]:
+        return [self.store.indiIds[indiRow] for indiRow in self.store.getChildRows(self.row)]
+
+    #Only reordering the children is supported, since the number of children has to stay the same for the offsets to stay correct
+    @childIds.setter
+    def childIds(self, value: list[str]) -> None:
+        self.store.linkRows()
+        start: int = self.store.childOffsets[self.row]
+        if(len(value) != self.store.childOffsets[self.row+1] - start):
+            raise ValueError("Children of a columnar family can be reordered, but not added or removed")
+        for i, childId in enumerate(value):
+            self.store.childRows[start + i] = self.store.indiRows[childId]
+
+    getRowData = Family.getRowData
+
+
+#Read-only maps from ID to view, used in place of Report.indi_map and Report.fam_map
+#Rows made for references to missing records are skipped over, just like they'd be missing from the normal maps
+class ColumnarIndividualMap(Mapping):
+    def __init__(self, store: ColumnarStore):
+        self.store = store
+
+    def __getitem__(self, id: str) -> IndividualView:
+        row: int = self.store.indiRows.get(id, noRow) if id is not None else noRow
+        if(row == noRow or not self.store.indiExists[row]):
+            raise KeyError(id)
+        return IndividualView(self.store, row)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.store.indiIds[row] for row in self.store.indiOrder)
+
+    def __len__(self) -> int:
+        return len(self.store.indiOrder)
+
+    def values(self) -> Iterator[IndividualView]:
+        return (IndividualView(self.store, row) for row in self.store.indiOrder)
+
+    def items(self) -> Iterator[tuple[str, IndividualView]]:
+        return ((view.id, view) for view in self.values())
+
+
+class ColumnarFamilyMap(Mapping):
+    def __init__(self, store: ColumnarStore):
+        self.store = store
+
+    def __getitem__(self, id: str) -> FamilyView:
+        row: int = self.store.famRows.get(id, noRow) if id is not None else noRow
+        if(row == noRow or not self.store.famExists[row]):
+            raise KeyError(id)
+        return FamilyView(self.store, row)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.store.famIds[row] for row in self.store.famOrder)
+
+    def __len__(self) -> int:
+        return len(self.store.famOrder)
+
+    def values(self) -> Iterator[FamilyView]:
+        return (FamilyView(self.store, row) for row in self.store.famOrder)
+
+    def items(self) -> Iterator[tuple[str, FamilyView]]:
+        return ((view.id, view) for view in self.values())
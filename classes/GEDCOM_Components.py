@@ -0,0 +1,115 @@
+import heapq
+from prettytable import PrettyTable
+from classes.GEDCOM_Reporting import Report
+
+#Contains the splitting of a report into connected components: groups of records that refer to each other, directly or through other records
+#Large files are often many unrelated family trees stored together. Nothing in one tree can be related to anything in another, so the relationship checks
+#(US17, US18, US19) can be run on each tree on its own, or on many trees at once in different processes
+
+
+#Union-find (disjoint set) over numbers 0 to size-1
+class UnionFind():
+    def __init__(self, size: int):
+        self.parent: list[int] = list(range(size))
+        self.size: list[int] = [1] * size
+
+    #Returns the representative of the set the number is in
+    def find(self, number: int) -> int:
+        parent: list[int] = self.parent
+        while(parent[number] != number):
+            parent[number] = parent[parent[number]] #Path halving, so later finds are quicker
+            number = parent[number]
+        return number
+
+    #Merges the sets the two numbers are in. The smaller set is put under the larger one, so the trees stay shallow
+    def union(self, first: int, second: int) -> None:
+        first = self.find(first)
+        second = self.find(second)
+        if(first == second):
+            return
+        if(self.size[first] < self.size[second]):
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+
+
+class Components():
+    def __init__(self, report: Report):
+        self.report: Report = report
+        #Every record gets a number: individuals first (in the order of indi_map), then families (in the order of fam_map)
+        indiNumbers: dict[str, int] = {id: number for number, id in enumerate(report.indi_map)}
+        famNumbers: dict[str, int] = {id: number for number, id in enumerate(report.fam_map, len(indiNumbers))}
+
+        #Families join their husband, wife, and children together. References to records that don't exist are left out
+        sets: UnionFind = UnionFind(len(indiNumbers) + len(famNumbers))
+        for fam in report.fam_map.values():
+            famNumber: int = famNumbers[fam.id]
+            for indiId in (fam.husbandId, fam.wifeId, *fam.childIds):
+                if(indiId in indiNumbers):
+                    sets.union(famNumber, indiNumbers[indiId])
+        #Individuals join the families they say they're in, even if the family doesn't list them back (see US26)
+        for indi in report.indi_map.values():
+            for famId in (indi.childIn, *indi.spouseIn):
+                if(famId in famNumbers):
+                    sets.union(indiNumbers[indi.id], famNumbers[famId])
+
+        #Components are numbered in the order of their first record
+        labels: dict[int, int] = {}
+        self.indiLabels: dict[str, int] = {}
+        self.famLabels: dict[str, int] = {}
+        self.individuals: list[list[str]] = []
+        self.families: list[list[str]] = []
+        for numbers, labelMap, memberLists in ((indiNumbers, self.indiLabels, self.individuals), (famNumbers, self.famLabels, self.families)):
+            for id, number in numbers.items():
+                root: int = sets.find(number)
+                label: int = labels.get(root, -1)
+                if(label == -1):
+                    label = len(labels)
+                    labels[root] = label
+                    self.individuals.append([])
+                    self.families.append([])
+                labelMap[id] = label
+                memberLists[label].append(id)
+
+    def __len__(self) -> int:
+        return len(self.individuals)
+
+    #Returns the component an individual or family is in, or None if there's no record with that ID
+    def componentOf(self, id: str) -> int:
+        label: int = self.indiLabels.get(id)
+        return self.famLabels.get(id) if label is None else label
+
+    #Returns the number of records (individuals and families) in each component
+    def sizes(self) -> list[int]:
+        return [len(self.individuals[label]) + len(self.families[label]) for label in range(len(self))]
+
+    #Returns a report holding only the records in the given components. The records themselves are shared with the full report, not copied
+    #Errors and anomalies found while reading the file aren't carried over
+    def subReport(self, labels: list[int]) -> Report:
+        members: set[int] = set(labels)
+        report: Report = Report(self.report.date_cache)
+        #Kept in the same order as the full report
+        report.indi_map = {id: indi for id, indi in self.report.indi_map.items() if self.indiLabels[id] in members}
+        report.fam_map = {id: fam for id, fam in self.report.fam_map.items() if self.famLabels[id] in members}
+        return report
+
+    #Splits the components between the given number of workers so every worker has about the same number of records
+    #The largest components are handed out first, each to the worker with the fewest records so far. Workers that don't get anything are left out
+    def schedule(self, workers: int) -> list[list[int]]:
+        sizes: list[int] = self.sizes()
+        loads: list[tuple[int, int]] = [(0, worker) for worker in range(max(1, workers))] #Heap of (records so far, worker)
+        assigned: list[list[int]] = [[] for _ in loads]
+        for label in sorted(range(len(sizes)), key=lambda label: -sizes[label]):
+            load, worker = heapq.heappop(loads)
+            assigned[worker].append(label)
+            heapq.heappush(loads, (load + sizes[label], worker))
+        return [sorted(labels) for labels in assigned if labels]
+
+    #Prints the size of every component, largest first. Useful for seeing how much of a file can be split up
+    def printSizes(self) -> None:
+        sizes: list[int] = self.sizes()
+        print(f"[Connected Components] {len(self)} components, largest has {max(sizes, default=0)} of {sum(sizes)} records")
+        sizeTable = PrettyTable(["Component", "First Record", "Individuals", "Families"])
+        for label in sorted(range(len(self)), key=lambda label: -sizes[label]):
+            sizeTable.add_row([label, (self.individuals[label] or self.families[label])[0], len(self.individuals[label]), len(self.families[label])])
+        print(sizeTable)
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Iterable, Union
+from classes.GEDCOM_Units import GEDCOMReadException
+
+#Contains the conversion from GEDCOM date strings into Python dates, along with a cache that sits in front of it
+
+#Maps months to their integer value
+monthToInt = {
+    "JAN": 1,
+    "FEB": 2,
+    "MAR": 3,
+    "APR": 4,
+    "MAY": 5,
+    "JUN": 6,
+    "JUL": 7,
+    "AUG": 8,
+    "SEP": 9,
+    "OCT": 10,
+    "NOV": 11,
+    "DEC": 12
+}
+
+#Converts GEDCOM date string into a Python date
+def stringDateConversion(string: str) -> date:
+    if(string == None or string == ""):
+        raise GEDCOMReadException("Date is not provided")
+    dateParts = string.split(" ", 2)
+    if(len(dateParts) != 3):
+        raise GEDCOMReadException("Date is malformed. Should consist <day> <month> <year>, where <day> and <year> are numerical values, while <month> is the first three letters of the month capitalized")
+    day: int
+    #Parse day
+    try:
+        day = int(dateParts[0])
+    except ValueError:
+        raise GEDCOMReadException("<day> of date (" + dateParts[0] + ") is not a valid numerical value")
+    #Parse month
+    month: int = monthToInt.get(dateParts[1])
+    if(month is None):
+        raise GEDCOMReadException("<month> of date (" + dateParts[1] + ") is not a valid month string")
+    #Parse year
+    year: int
+    try:
+        year = int(dateParts[2])
+    except ValueError:
+        raise GEDCOMReadException("<year> of date (" + dateParts[2] + ") is not a valid numerical value")
+    #Create final date and return it
+    finalDate: date
+    try:
+        finalDate = date(year, month, day)
+    except ValueError:
+        raise GEDCOMReadException(string + " is not a valid date (the day is probably too large for the current month)")
+    return finalDate
+
+
+#Bounded cache of date conversions, since the same dates show up over and over again in real files
+#Keys are the raw date strings. Values are either the converted date, or (for invalid dates) the error message, so that the US42 error can still be given every time
+#Once the cache is full, the least recently used date gets evicted
+class DateCache():
+    def __init__(self, maxSize: int = 65536):
+        self.maxSize: int = maxSize
+        self.entries: OrderedDict[str, Union[date, str]] = OrderedDict()
+        #Counters, useful for figuring out if maxSize is large enough
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    #Same as stringDateConversion, but checks the cache first. Raises a GEDCOMReadException for invalid dates
+    def convert(self, string: str) -> date:
+        result: Union[date, str] = self.entries.get(string)
+        if(result is not None):
+            self.hits += 1
+            self.entries.move_to_end(string)
+        else:
+            self.misses += 1
+            try:
+                result = stringDateConversion(string)
+            except GEDCOMReadException as e:
+                result = e.message
+            self.entries[string] = result
+            if(len(self.entries) > self.maxSize):
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        if(isinstance(result, str)):
+            raise GEDCOMReadException(result)
+        return result
+
+    #Converts a whole list of date strings at once. Invalid dates become None in the returned list, and their error messages are added to errors (if it's given)
+    #Repeated strings within the list are only looked up once
+    def convertMany(self, strings: Iterable[str], errors: list[str] = None) -> list[date]:
+        seen: dict[str, Union[date, str]] = {}
+        results: list[date] = []
+        for string in strings:
+            result: Union[date, str] = seen.get(string)
+            if(result is None):
+                try:
+                    result = self.convert(string)
+                except GEDCOMReadException as e:
+                    result = e.message
+                seen[string] = result
+            else:
+                self.hits += 1
+            if(isinstance(result, str)):
+                if(errors is not None):
+                    errors.append(result)
+                results.append(None)
+            else:
+                results.append(result)
+        return results
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+#Cache shared by every Report that isn't given its own. Dates never change, so one process reading several files can reuse conversions between them
+defaultDateCache: DateCache = DateCache()
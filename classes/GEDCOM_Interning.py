@@ -0,0 +1,101 @@
+from array import array
+
+#Contains the interning of cross-reference IDs (ex. @I123@) into dense integers, along with a graph of all of the references that's built on top of them
+#Looking up and comparing integers is a lot cheaper than hashing the ID strings over and over again, so relationship checks work with these instead
+#The ID strings are only looked up again when writing out a message
+
+#Used in place of a number when there's no reference
+noXref: int = -1
+
+
+#Gives every ID its own number, counting up from 0 in the order the IDs are first seen
+#Individuals and families share one set of numbers, since they share one set of IDs in GEDCOM files (see US22)
+class XrefInterner():
+    def __init__(self):
+        self.ids: list[str] = []
+        self.numbers: dict[str, int] = {}
+
+    #Returns the number for the ID, giving it a new one if it hasn't been seen before
+    def intern(self, id: str) -> int:
+        if(id is None):
+            return noXref
+        number: int = self.numbers.get(id, noXref)
+        if(number == noXref):
+            number = len(self.ids)
+            self.numbers[id] = number
+            self.ids.append(id)
+        return number
+
+    #Returns the number for the ID, or noXref if it hasn't been seen
+    def lookup(self, id: str) -> int:
+        return self.numbers.get(id, noXref)
+
+    #Returns the ID string for a number
+    def name(self, number: int) -> str:
+        return None if number == noXref else self.ids[number]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+#Every reference between the individuals and families of a report, stored by number. Every list is indexed by the xref number
+#References to records that don't exist still get a number, but aren't marked in isIndividual/isFamily (same as them being missing from indi_map/fam_map)
+class InternedGraph():
+    def __init__(self, report):
+        xrefs: XrefInterner = report.xrefs
+        #Intern everything referenced first, so the lists can be made at their final size
+        for indi in report.indi_map.values():
+            xrefs.intern(indi.id)
+            xrefs.intern(indi.childIn)
+            for famId in indi.spouseIn:
+                xrefs.intern(famId)
+        for fam in report.fam_map.values():
+            xrefs.intern(fam.id)
+            xrefs.intern(fam.husbandId)
+            xrefs.intern(fam.wifeId)
+            for childId in fam.childIds:
+                xrefs.intern(childId)
+        size: int = len(xrefs)
+
+        self.xrefs: XrefInterner = xrefs
+        #Numbers of every record, in the same order as indi_map and fam_map
+        self.individuals: list[int] = [xrefs.lookup(id) for id in report.indi_map]
+        self.families: list[int] = [xrefs.lookup(id) for id in report.fam_map]
+        self.isIndividual: bytearray = bytearray(size)
+        self.isFamily: bytearray = bytearray(size)
+
+        #Individual references
+        self.childIn: array = array("l", [noXref]) * size
+        self.spouseIn: list[tuple[int, ...]] = [()] * size
+        for indi in report.indi_map.values():
+            number: int = xrefs.lookup(indi.id)
+            self.isIndividual[number] = 1
+            self.childIn[number] = xrefs.lookup(indi.childIn) if indi.childIn is not None else noXref
+            if(indi.spouseIn):
+                self.spouseIn[number] = tuple(xrefs.lookup(famId) for famId in indi.spouseIn)
+
+        #Family references
+        self.husband: array = array("l", [noXref]) * size
+        self.wife: array = array("l", [noXref]) * size
+        self.children: list[tuple[int, ...]] = [()] * size
+        #Reverse index of the families each individual is a parent (husband or wife) in. Built up in lists, then frozen into tuples once every family is in
+        parentIn: list[list[int]] = [[] for _ in range(size)]
+        for fam in report.fam_map.values():
+            number: int = xrefs.lookup(fam.id)
+            self.isFamily[number] = 1
+            self.husband[number] = xrefs.lookup(fam.husbandId) if fam.husbandId is not None else noXref
+            self.wife[number] = xrefs.lookup(fam.wifeId) if fam.wifeId is not None else noXref
+            if(fam.childIds):
+                self.children[number] = tuple(xrefs.lookup(childId) for childId in fam.childIds)
+            for parent in {self.husband[number], self.wife[number]}: #Set, so a family is only listed once if the husband and wife are the same person
+                if(parent != noXref):
+                    parentIn[parent].append(number)
+        self.parentIn: list[tuple[int, ...]] = [tuple(families) for families in parentIn]
+
+    #Returns the number if it belongs to an individual with a record, otherwise returns noXref
+    def individual(self, number: int) -> int:
+        return number if (number != noXref and self.isIndividual[number]) else noXref
+
+    #Same as individual(), but for families
+    def family(self, number: int) -> int:
+        return number if (number != noXref and self.isFamily[number]) else noXref
@@ -0,0 +1,134 @@
+from classes.GEDCOM_Interning import noXref
+from classes.GEDCOM_Traversal import Traversal
+
+#Contains the kinship engine, which answers "how are these two people related" (US17, US18, US19)
+#It walks the traversal engine's edges, so a child's parents come from both the families that list them (CHIL) and the family they name (FAMC)
+#Every person gets an ancestor depth index: each of their ancestors, mapped to every number of generations up that they can be reached at
+#Two people are related through the ancestors their indexes share, and the depths on each side give the relationship (ex. 2 and 2 is first cousins)
+#Indexes are only made for the people that are asked about (by relationship()), and are kept around for any later questions about them
+#Questions about one exact number of generations (areRelatedAs()) only walk up that far, and don't make indexes
+
+#Cousin relationships are only looked for this many generations up by default. Also stops ancestry loops from making the indexes go on forever
+defaultMaxDepth: int = 16
+
+ordinals: list[str] = ["zeroth", "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth"]
+removals: list[str] = ["", " once removed", " twice removed", " thrice removed"]
+
+
+#How two people are related, through their closest common ancestor
+#up is the number of generations from the first person up to the ancestor, down is the number from the second person (0 means the person is the ancestor)
+class Relationship():
+    def __init__(self, ancestor: int, up: int, down: int):
+        self.ancestor: int = ancestor
+        self.up: int = up
+        self.down: int = down
+
+    #0 for siblings, 1 for first cousins, 2 for second cousins, etc. -1 if one person is the other's ancestor
+    @property
+    def degree(self) -> int:
+        return min(self.up, self.down) - 1
+
+    #Number of generations between the two people (ex. first cousins once removed)
+    @property
+    def removed(self) -> int:
+        return abs(self.up - self.down)
+
+    #Gives back the relationship of the second person to the first, in words (ex. "grandchild", "second cousin once removed")
+    def describe(self) -> str:
+        if(self.up == 0 and self.down == 0):
+            return "self"
+        if(self.up == 0 or self.down == 0):
+            generations: int = self.up + self.down
+            base: str = "parent" if self.down == 0 else "child"
+            if(generations == 1):
+                return base
+            return "great-" * (generations - 2) + "grand" + base
+        if(self.up == 1 and self.down == 1):
+            return "sibling"
+        if(self.up == 1 or self.down == 1):
+            generations: int = max(self.up, self.down)
+            base: str = "aunt/uncle" if self.down == 1 else "niece/nephew"
+            return "great-" * (generations - 2) + base
+        degree: int = self.degree
+        name: str = ordinals[degree] if degree < len(ordinals) else f"{degree}th"
+        removed: int = self.removed
+        return name + " cousin" + (removals[removed] if removed < len(removals) else f" {removed} times removed")
+
+    def __eq__(self, other) -> bool:
+        if(not isinstance(other, Relationship)):
+            return False
+        return self.ancestor == other.ancestor and self.up == other.up and self.down == other.down
+
+    def __repr__(self) -> str:
+        return f"Relationship({self.ancestor}, {self.up}, {self.down})"
+
+
+class Kinship():
+    def __init__(self, traversal: Traversal, maxDepth: int = defaultMaxDepth):
+        self.traversal: Traversal = traversal
+        self.graph = traversal.graph
+        self.maxDepth: int = maxDepth
+        #Ancestor depth indexes, by person number. Worked out the first time someone's asked about
+        self.indexes: dict[int, dict[int, tuple[int, ...]]] = {}
+
+    #Returns every ancestor of the person (and the person themselves, at 0), mapped to every number of generations up they can be reached at
+    #Going one generation at a time means someone who's both a parent and a grandparent (through different lines) gets both depths
+    def ancestorIndex(self, number: int) -> dict[int, tuple[int, ...]]:
+        index: dict[int, tuple[int, ...]] = self.indexes.get(number)
+        if(index is None):
+            index = {}
+            if(number != noXref):
+                parentsOf: list[tuple[int, ...]] = self.traversal.parentsOf
+                frontier: set[int] = {number}
+                depth: int = 0
+                while(frontier and depth <= self.maxDepth):
+                    for ancestor in frontier:
+                        index[ancestor] = index.get(ancestor, ()) + (depth,)
+                    depth += 1
+                    frontier = {parent for current in frontier for parent in parentsOf[current]}
+            self.indexes[number] = index
+        return index
+
+    #Returns how the second person is related to the first through their closest common ancestor (the fewest generations in total), or None if they aren't
+    #Direct lines (ancestors and descendants) more than maxDepth generations apart aren't found. Use isAncestor() for those
+    def relationship(self, first: int, second: int) -> Relationship:
+        if(first == noXref or second == noXref):
+            return None
+        firstIndex: dict[int, tuple[int, ...]] = self.ancestorIndex(first)
+        secondIndex: dict[int, tuple[int, ...]] = self.ancestorIndex(second)
+        if(len(secondIndex) < len(firstIndex)): #Go through the smaller index
+            smaller, larger = secondIndex, firstIndex
+        else:
+            smaller, larger = firstIndex, secondIndex
+        best: Relationship = None
+        for ancestor, depths in smaller.items():
+            otherDepths: tuple[int, ...] = larger.get(ancestor)
+            if(otherDepths is None):
+                continue
+            #Depths are in increasing order, so the first ones are the closest
+            up, down = (depths[0], otherDepths[0]) if smaller is firstIndex else (otherDepths[0], depths[0])
+            if(best is None or (up + down, max(up, down), ancestor) < (best.up + best.down, max(best.up, best.down), best.ancestor)):
+                best = Relationship(ancestor, up, down)
+        return best
+
+    #Returns True if the two people share an ancestor exactly up generations above the first person and exactly down generations above the second
+    #Every line is checked, not just the closest one (ex. areRelatedAs(x, y, 2, 2) is True for first cousins, even if they're also related more closely)
+    #Only the given number of generations are walked on each side, so asking about close relatives stays cheap. Nothing past maxDepth is found
+    def areRelatedAs(self, first: int, second: int, up: int, down: int) -> bool:
+        if(first == noXref or second == noXref or up > self.maxDepth or down > self.maxDepth):
+            return False
+        firstAncestors: set[int] = self.traversal.generation(first, up)
+        if(not firstAncestors):
+            return False
+        return not firstAncestors.isdisjoint(self.traversal.generation(second, down))
+
+    #Returns True if the two people are children of the same family (US18), going by the family each of them names (FAMC)
+    #The traversal edges follow FAMC too, so relationship() finds them as siblings as well whenever that family has a husband or wife
+    def areSiblings(self, first: int, second: int) -> bool:
+        if(first == noXref or second == noXref):
+            return False
+        return self.graph.childIn[first] != noXref and self.graph.childIn[first] == self.graph.childIn[second]
+
+    #Returns True if the first person is an ancestor of the second (US17). Not limited by maxDepth, see Traversal.isAncestor()
+    def isAncestor(self, ancestor: int, descendant: int) -> bool:
+        return self.traversal.isAncestor(ancestor, descendant)
@@ -0,0 +1,37 @@
+from datetime import date
+from classes.GEDCOM_Units import Individual
+from classes.GEDCOM_Reporting import Report, effectiveDivorceDate
+
+#Contains the marital status table: when every family ended (divorce, or the death of a spouse), which of their families everyone is still married in, and
+#everyone's age. It's worked out once, and read by US11 (through the validation engine's facts) and the living married/living single listings (US30, US31)
+
+
+class MaritalStatusTable():
+    def __init__(self, report: Report):
+        indi_map = report.indi_map
+        #Effective end of every family (see get_divorceDate). None if it hasn't ended
+        self.effectiveEnds: dict[str, date] = {famId: effectiveDivorceDate(fam, indi_map.get(fam.husbandId, None), indi_map.get(fam.wifeId, None))
+                                               for famId, fam in report.fam_map.items()}
+        #Age of everyone with a birth date (at their death, or today if they're alive)
+        self.ages: dict[str, int] = {indi.id: indi.calculateAge() for indi in indi_map.values() if indi.birthDate}
+        #Families everyone is still married in, in the order they're listed in
+        self.currentFamilies: dict[str, list[str]] = {indi.id: self.familiesOf(indi) for indi in indi_map.values()}
+        self.individuals: list[Individual] = list(indi_map.values())
+
+    #Returns the families the individual is still married in. Families that don't have a record count as still going, since nothing says they've ended
+    def familiesOf(self, indi: Individual) -> list[str]:
+        ends: dict[str, date] = self.effectiveEnds
+        return [famId for famId in indi.spouseIn if ends.get(famId, None) is None]
+
+    #US30 - Every living individual who's still married, along with the families they're married in
+    def livingMarried(self) -> list[tuple[Individual, list[str]]]:
+        return [(indi, self.currentFamilies[indi.id]) for indi in self.individuals if indi.deathDate is None and self.currentFamilies[indi.id]]
+
+    #US31 - Every living individual over the given age who isn't married, along with their age
+    def livingSingles(self, minAge: int = 30) -> list[tuple[Individual, int]]:
+        singles: list[tuple[Individual, int]] = []
+        for indi in self.individuals:
+            age: int = self.ages.get(indi.id, None)
+            if(age is not None and indi.deathDate is None and age > minAge and not self.currentFamilies[indi.id]):
+                singles.append((indi, age))
+        return singles
@@ -0,0 +1,166 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Iterable
+
+#Contains name handling: splitting GEDCOM names into their given name and surname, and normalizing names so ones that are probably the same despite being
+#spelled differently can be found (see US23F), along with the name indexes: a phonetic (Soundex) index of everyone's surname for "sounds like" searches,
+#and a prefix index of every word in everyone's name for searching with partial names
+
+vowels: str = "aeiouyhw" #Along with h, w, and y, which barely change how a name sounds
+
+#Soundex digit of every letter that has one. Vowels (and y) don't have one, and h and w are skipped over entirely
+soundexDigits: dict[str, str] = {letter: digit for letters, digit in [("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6")] for letter in letters}
+
+
+#Splits a GEDCOM name into its given name and surname. The surname is between the slashes (ex. "John /Smith/" gives "John" and "Smith")
+#With no slashes, the whole name is the given name and the surname is empty. With only one slash, the surname goes until the end of the name
+#With two slashes next to each other, both are empty
+def splitName(name: str) -> tuple[str, str]:
+    surnameStartPos: int = name.find("/")
+    if(surnameStartPos == -1):
+        return (name, "")
+    surnameEndPos: int = name.find("/", surnameStartPos+1)
+    if(surnameEndPos == -1):
+        surnameEndPos = len(name)
+    if(surnameStartPos+1 == surnameEndPos):
+        return ("", "")
+    return (name[0:surnameStartPos].rstrip() + name[surnameEndPos+1:len(name)].lstrip(), name[surnameStartPos+1:surnameEndPos])
+
+
+#Folds a name down to lowercase ASCII letters (ex. "Müller-Smith" to "mullersmith")
+def foldName(name: str) -> str:
+    decomposed: str = unicodedata.normalize("NFKD", name)
+    return "".join(character for character in decomposed.lower() if "a" <= character <= "z")
+
+#Folds a name down to its first letter followed by its consonants, with repeated consonants only kept once (ex. both "Smith" and "Smyth" give "smt")
+#Spelling variants of the same name usually give the same skeleton, so it can be used as a key to group them without comparing every pair of names
+def nameSkeleton(name: str) -> str:
+    folded: str = foldName(name)
+    if(not folded):
+        return ""
+    skeleton: list[str] = [folded[0]]
+    for character in folded[1:]:
+        if(character not in vowels and character != skeleton[-1]):
+            skeleton.append(character)
+    return "".join(skeleton)
+
+#Splits a name into its words, each folded down (see foldName). Words are split by spaces and hyphens (ex. "Mary-Ann O'Neil" gives mary, ann, and oneil)
+def nameWords(name: str) -> list[str]:
+    return [folded for word in re.split(r"[\s\-]+", name) if (folded := foldName(word))]
+
+#American Soundex code of a name: its first letter followed by three digits for the sounds after it (ex. both "Robert" and "Rupert" give "R163")
+#Gives back the empty string if the name doesn't have any letters
+def soundex(name: str) -> str:
+    folded: str = foldName(name)
+    if(not folded):
+        return ""
+    code: list[str] = [folded[0].upper()]
+    previous: str = soundexDigits.get(folded[0], "")
+    for character in folded[1:]:
+        if(character in "hw"): #Doesn't separate letters with the same digit
+            continue
+        digit: str = soundexDigits.get(character, "")
+        if(digit and digit != previous):
+            code.append(digit)
+            if(len(code) == 4):
+                break
+        previous = digit
+    return "".join(code).ljust(4, "0")
+
+
+#Soundex code of everyone's surname, mapped to the IDs of everyone with that code in the order the records are in
+#People without a surname aren't indexed
+class PhoneticIndex():
+    def __init__(self, individuals: Iterable = ()):
+        self.codes: dict[str, list[str]] = {}
+        for indi in individuals:
+            self.add(indi)
+
+    #Adds an individual to the index
+    def add(self, indi) -> None:
+        if(indi.name):
+            code: str = soundex(indi.surname)
+            if(code):
+                self.codes.setdefault(code, []).append(indi.id)
+
+    #Returns the IDs of everyone whose surname sounds like the given one. A full GEDCOM name (with slashes) can be given too
+    def soundsLike(self, name: str) -> list[str]:
+        surname: str = splitName(name)[1] if "/" in name else name
+        return list(self.codes.get(soundex(surname), ()))
+
+
+#Every word of everyone's given name and surname (see nameWords), mapped to the people who have it. The distinct words are kept sorted,
+#so every word starting with a given prefix is a binary search away, and a search only ever touches the people whose names match
+#People are numbered in the order they're added, which is also how ties are ranked. People without a name aren't indexed
+class NameSearchIndex():
+    def __init__(self, individuals: Iterable = ()):
+        self.ids: list[str] = []
+        #Words of everyone's name, by number, so people who already matched one part of a search can be checked against the rest directly
+        self.names: list[tuple[str, ...]] = []
+        self.postings: dict[str, list[int]] = {}
+        for indi in individuals:
+            self.add(indi, False)
+        #Sorting once at the end is much faster than keeping the words sorted as they're added
+        self.words: list[str] = sorted(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    #Adds an individual to the index
+    def add(self, indi, keepSorted: bool = True) -> None:
+        if(not indi.name):
+            return
+        number: int = len(self.ids)
+        words: tuple[str, ...] = tuple(dict.fromkeys(nameWords(indi.givenName) + nameWords(indi.surname)))
+        self.ids.append(indi.id)
+        self.names.append(words)
+        for word in words:
+            numbers: list[int] = self.postings.get(word, None)
+            if(numbers is None):
+                self.postings[word] = [number]
+                if(keepSorted):
+                    insort(self.words, word)
+            else:
+                numbers.append(number)
+
+    #Returns the range of sorted words that start with the given prefix
+    def prefixRange(self, prefix: str) -> range:
+        first: int = bisect_left(self.words, prefix)
+        last: int = bisect_left(self.words, prefix + "{", first) #"{" comes right after "z", and words are only ever made of a-z
+        return range(first, last)
+
+    #Returns how well a word matches a prefix: 2 for the whole word, 1 for the start of it, and 0 if it doesn't match
+    @staticmethod
+    def matchScore(word: str, prefix: str) -> int:
+        return 2 if word == prefix else 1 if word.startswith(prefix) else 0
+
+    #Returns the IDs of the best matches for a partial name (ex. "jo sm" finds John /Smith/), best first, up to the given limit
+    #Every word of the search has to match the start of a word in the person's given name or surname. Whole words count for more than partial ones,
+    #and people who match equally well come in the order they were added
+    #Only the people matching the most specific word of the search are gone through, and they're checked against the rest of the words directly
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        prefixes: list[str] = list(dict.fromkeys(nameWords(query)))
+        if(not prefixes):
+            return []
+        ranges: dict[str, range] = {prefix: self.prefixRange(prefix) for prefix in prefixes}
+        sizes: dict[str, int] = {prefix: sum(len(self.postings[self.words[i]]) for i in ranges[prefix]) for prefix in prefixes}
+        first: str = min(prefixes, key=sizes.__getitem__)
+        scores: dict[int, int] = {}
+        for i in ranges[first]:
+            score: int = self.matchScore(self.words[i], first)
+            for number in self.postings[self.words[i]]:
+                if(scores.get(number, 0) < score):
+                    scores[number] = score
+        for prefix in prefixes:
+            if(prefix is first):
+                continue
+            matched: dict[int, int] = {}
+            for number, score in scores.items():
+                best: int = max(self.matchScore(word, prefix) for word in self.names[number])
+                if(best):
+                    matched[number] = score + best
+            scores = matched
+        best: list[tuple[int, int]] = heapq.nsmallest(limit, scores.items(), key=lambda match: (-match[1], match[0]))
+        return [self.ids[number] for number, _ in best]
@@ -0,0 +1,372 @@
+import os
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Iterable, Iterator, TextIO, Union
+
+from classes.GEDCOM_Units import GEDCOMUnit, Individual, Family, CompactIndividual, CompactFamily, GEDCOMReadException
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Columnar import ColumnarReport
+
+#Contains the library side of the GEDCOM reader. The parsing used to live in a module-level loop in GEDCOM_Reader.py, so it couldn't be imported and called
+#more than once per interpreter. Everything here can be called repeatedly from the same process (ex. a batch worker reading thousands of files)
+
+#Tags that indicate annotation. They exist to aid the reader of the file, not to add new content, so they can be skipped over
+annotationTags: list[str] = ["HEAD", "TRLR", "NOTE"]
+
+#Tags that indicate types of date values. Indicate what the date that's about to be read is meant for
+dateTags: list[str] = ["BIRT", "DEAT", "MARR", "DIV"]
+
+#Byte versions of the tags above, used when reading straight from a memory mapped file. Maps the raw tag to the (already existing) string version of it,
+#so known tags never need to be decoded
+annotationTagBytes: frozenset[bytes] = frozenset(tag.encode() for tag in annotationTags)
+dateTagBytes: dict[bytes, str] = {tag.encode(): tag for tag in dateTags}
+
+#Version of what the parser reads into a report. Needs to be bumped whenever that changes (ex. a new field on the records), so old snapshots are thrown out
+parserVersion: int = 1
+
+
+#Holds the state of a single read through a GEDCOM file (the object currently being filled in, and what the next date belongs to)
+#Lines are fed in one at a time, and every time a record is finished, it's added to the report and handed back to the caller
+class GEDCOMParser():
+    def __init__(self, report: Report = None, lazy_dates: bool = False, compact: bool = False):
+        #Stores all report data. Parse-time checks (US01, US22, US42) write their errors to this
+        self.report: Report = Report() if report is None else report
+        #If True, dates are stored as their raw strings and only converted when first read. US01 and US42 are then left for Report.validate_dates()
+        self.lazy_dates: bool = lazy_dates
+        #The classes that records are made with. With compact, the versions that don't make empty lists are used instead
+        self.individualType: type = CompactIndividual if compact else Individual
+        self.familyType: type = CompactFamily if compact else Family
+        #The current object that's being read. Can be either an Individual or a Family
+        self.current_obj: GEDCOMUnit = None
+        #The last seen tag that correpsonds to a date (BIRT, DEAT, MARR, DIV). Used to determine what field to fill in
+        self.readingDateOf: str = None
+
+    #Takes in a line that's already been split into its fields (at most three of them)
+    #Returns the previous record if this line started a new one, otherwise returns None
+    def readFields(self, fields: list[str]) -> GEDCOMUnit:
+        numFields: int = len(fields)
+        if(numFields <= 1):
+            raise GEDCOMReadException("Not enough arguments on the line")
+        secondField: str = fields[1]
+        match(fields[0]) : #The number of the line
+            case "0":
+                if(secondField in annotationTags):
+                    return None #These tags are simply for annotation, you don't need to record any data for them
+                elif(numFields == 3):
+                    if(fields[2] == "INDI"):
+                        return self.startUnit(self.individualType, secondField)
+                    elif(fields[2] == "FAM"):
+                        return self.startUnit(self.familyType, secondField)
+                raise GEDCOMReadException("Invalid tag for 0-numbered line")
+            case "1":
+                #Check to make sure object exists, then check if line is specifying a type of date or just a standard field
+                if(self.current_obj is None):
+                    raise GEDCOMReadException("No GEDCOM Unit (Individual or Family) to give field")
+                elif(secondField in dateTags):
+                    self.readingDateOf = secondField
+                else:
+                    self.current_obj.readDataFromFields(fields)
+            case "2":
+                #Check for errors, then set date to appropriate field
+                if(secondField != "DATE"):
+                    raise GEDCOMReadException("Invalid tags for 2-numbered line")
+                if(numFields == 2):
+                    raise GEDCOMReadException("Not enough fields for DATE")
+                self.readDate(fields[2])
+            case _: #Since all lines are assumed to be syntatically correct, this technically isn't needed
+                raise GEDCOMReadException("Line number is not valid (0, 1, 2)")
+        return None
+
+    #Finishes off the current record, and starts a new one of the given type. Returns the finished record (if there was one)
+    def startUnit(self, unitType: type, id: str) -> GEDCOMUnit:
+        finished: GEDCOMUnit = self.finishUnit() #Add current object to the map before you start with the new one
+        fixedId: str = self.report.check_unique_id_and_fix(id) #Checks for duplicate IDs, #US22
+        self.current_obj = unitType(fixedId)
+        return finished
+
+    #Adds the current object into the maps, and returns it
+    def finishUnit(self) -> GEDCOMUnit:
+        finished: GEDCOMUnit = self.current_obj
+        self.report.addToReport(finished)
+        self.current_obj = None
+        return finished
+
+    #Sets the value of a "2 DATE" line onto whatever field the last "1" date tag pointed to
+    def readDate(self, dateString: str) -> None:
+        if(self.current_obj is None):
+            raise GEDCOMReadException("No GEDCOM Unit (Individual or Family) to give field")
+        if(self.readingDateOf is None):
+            raise GEDCOMReadException("Type of date has not been specified")
+        if(self.lazy_dates):
+            self.current_obj.setRawDate(dateString, self.readingDateOf, self.report.date_cache)
+            self.readingDateOf = None
+            return
+        dateObj: date = self.report.getDateFromString(dateString) #US42
+        self.report.check_for_future_dates(dateObj) #US01
+        self.current_obj.setDate(dateObj, self.readingDateOf)
+        self.readingDateOf = None
+
+    #Called whenever a line can't be read. The line is skipped, and reading continues with the next one
+    #Nothing is printed, the message is only kept in the report's line_errors (it's up to the caller to show them)
+    def lineError(self, e: Exception) -> None:
+        message: str = e.message if isinstance(e, GEDCOMReadException) else str(e)
+        self.report.line_errors.append(message)
+
+
+#Opens the file if a path was given. Streams (anything that can be iterated over line by line) are passed through untouched
+def _openSource(path_or_stream: Union[str, os.PathLike, Iterable[str]]) -> tuple[Iterable[str], bool]:
+    if(isinstance(path_or_stream, (str, os.PathLike))):
+        return open(path_or_stream, "r"), True
+    return path_or_stream, False
+
+
+#Reads the GEDCOM data from either a file path or an already opened text stream, and yields every Individual and Family as soon as it's fully built
+#Records are also added into the report (which is needed to catch duplicate IDs). If no report is given, a fresh one is used
+#With lazy_dates, dates are only converted when they're first read, and US01/US42 are only checked once Report.validate_dates() is called
+#With compact, records are made as CompactIndividual and CompactFamily, which use less memory
+def parse(path_or_stream: Union[str, os.PathLike, TextIO, Iterable[str]], report: Report = None, lazy_dates: bool = False, compact: bool = False) -> Iterator[GEDCOMUnit]:
+    parser: GEDCOMParser = GEDCOMParser(report, lazy_dates, compact)
+    source, shouldClose = _openSource(path_or_stream)
+    try:
+        for line in source:
+            try:
+                fixedLine: str = line.replace("\n", "") #Remove any newline characters
+                finished: GEDCOMUnit = parser.readFields(fixedLine.split(" ", 2)) #Split the line into at most three seperate parts
+                if(finished is not None):
+                    yield finished
+            except Exception as e:
+                parser.lineError(e)
+        finished: GEDCOMUnit = parser.finishUnit() #Add the latest object into the maps
+        if(finished is not None):
+            yield finished
+    finally:
+        if(shouldClose):
+            source.close()
+
+
+#Reads the lines between start and end of a bytes-like buffer (such as a memory mapped file), and yields records the same way parse() does
+#Level, tag, and value are found by searching the buffer directly, so no strings are made for a line until it's known they're needed
+#Only values that get stored (names, sexes, IDs, and dates) are decoded. Annotation lines and date labels are never decoded at all
+def _readBuffer(parser: GEDCOMParser, buffer, start: int, end: int, encoding: str = "utf-8") -> Iterator[GEDCOMUnit]:
+    pos: int = start
+    while(pos < end):
+        lineEnd: int = buffer.find(b"\n", pos, end)
+        if(lineEnd == -1):
+            lineEnd = end
+        lineStart: int = pos
+        pos = lineEnd + 1
+        if(lineEnd > lineStart and buffer[lineEnd-1] == 13): #Files written on Windows end their lines with \r\n. Text mode hides the \r, so it has to be skipped here
+            lineEnd -= 1
+        try:
+            levelEnd: int = buffer.find(b" ", lineStart, lineEnd)
+            if(levelEnd == -1):
+                raise GEDCOMReadException("Not enough arguments on the line")
+            tagEnd: int = buffer.find(b" ", levelEnd+1, lineEnd)
+            hasValue: bool = tagEnd != -1
+            if(not hasValue):
+                tagEnd = lineEnd
+            level: bytes = buffer[lineStart:levelEnd]
+            tag: bytes = buffer[levelEnd+1:tagEnd]
+            if(level == b"0"):
+                if(tag in annotationTagBytes):
+                    continue #These tags are simply for annotation, you don't need to record any data for them
+                finished: GEDCOMUnit = None
+                value: bytes = buffer[tagEnd+1:lineEnd] if hasValue else None
+                if(value == b"INDI"):
+                    finished = parser.startUnit(parser.individualType, tag.decode(encoding))
+                elif(value == b"FAM"):
+                    finished = parser.startUnit(parser.familyType, tag.decode(encoding))
+                else:
+                    raise GEDCOMReadException("Invalid tag for 0-numbered line")
+                if(finished is not None):
+                    yield finished
+            elif(level == b"1"):
+                if(parser.current_obj is None):
+                    raise GEDCOMReadException("No GEDCOM Unit (Individual or Family) to give field")
+                dateLabel: str = dateTagBytes.get(tag)
+                if(dateLabel is not None):
+                    parser.readingDateOf = dateLabel
+                elif(hasValue):
+                    parser.current_obj.readDataFromFields(["1", tag.decode(encoding), buffer[tagEnd+1:lineEnd].decode(encoding)])
+                else:
+                    parser.current_obj.readDataFromFields(["1", tag.decode(encoding)])
+            elif(level == b"2"):
+                if(tag != b"DATE"):
+                    raise GEDCOMReadException("Invalid tags for 2-numbered line")
+                if(not hasValue):
+                    raise GEDCOMReadException("Not enough fields for DATE")
+                parser.readDate(buffer[tagEnd+1:lineEnd].decode(encoding))
+            else:
+                raise GEDCOMReadException("Line number is not valid (0, 1, 2)")
+        except Exception as e:
+            parser.lineError(e)
+
+
+#Alternate version of parse() for very large files. The file is memory mapped and read as bytes instead of being read line by line in text mode
+#Produces the same records (and the same report errors) as parse(), but only takes a path since the file has to be mapped
+def parse_mmap(path: Union[str, os.PathLike], report: Report = None, encoding: str = "utf-8", lazy_dates: bool = False, compact: bool = False) -> Iterator[GEDCOMUnit]:
+    parser: GEDCOMParser = GEDCOMParser(report, lazy_dates, compact)
+    with open(path, "rb") as file:
+        if(os.fstat(file.fileno()).st_size > 0): #Empty files can't be mapped
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield from _readBuffer(parser, buffer, 0, len(buffer), encoding)
+    finished: GEDCOMUnit = parser.finishUnit() #Add the latest object into the maps
+    if(finished is not None):
+        yield finished
+
+
+#Used by parse_parallel(). Reads a chunk of the file on its own, but doesn't touch any report maps, since it can't see the records in the other chunks
+#Instead, everything that would have changed the report is written down (in file order) in the events list, so it can all be replayed in the main process:
+# # ("unit", original ID, unit) when a record starts. The ID still needs to be checked for duplicates (US22)
+# # ("error", ReportDetail) for errors found while reading dates (US01, US42)
+# # ("line", message) for lines that couldn't be read
+class _ChunkParser(GEDCOMParser):
+    def __init__(self, lazy_dates: bool = False, compact: bool = False):
+        super().__init__(lazy_dates=lazy_dates, compact=compact)
+        self.events: list[tuple] = []
+
+    def startUnit(self, unitType: type, id: str) -> GEDCOMUnit:
+        self.current_obj = unitType(id)
+        self.events.append(("unit", id, self.current_obj))
+        return None
+
+    def finishUnit(self) -> GEDCOMUnit:
+        self.current_obj = None
+        return None
+
+    def readDate(self, dateString: str) -> None:
+        try:
+            super().readDate(dateString)
+        finally:
+            for error in self.report.errors:
+                self.events.append(("error", error))
+            self.report.errors.clear()
+
+    def lineError(self, e: Exception) -> None:
+        self.events.append(("line", e.message if isinstance(e, GEDCOMReadException) else str(e)))
+
+
+#Runs in a worker process. Reads the lines between start and end, and returns everything that happened while reading them
+def _parseChunk(path: Union[str, os.PathLike], start: int, end: int, encoding: str, lazy_dates: bool, compact: bool) -> list[tuple]:
+    parser: _ChunkParser = _ChunkParser(lazy_dates, compact)
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for _ in _readBuffer(parser, buffer, start, end, encoding):
+                pass
+    return parser.events
+
+
+#Returns True if the line is the start of a record (0 <ID> INDI or 0 <ID> FAM)
+def _isRecordLine(line: bytes) -> bool:
+    fields: list[bytes] = line.rstrip(b"\r").split(b" ", 2)
+    return len(fields) == 3 and fields[0] == b"0" and fields[1] not in annotationTagBytes and fields[2] in (b"INDI", b"FAM")
+
+
+#Finds the first line at or after pos that starts a record. Returns end if there aren't any left
+def _findRecordStart(buffer, pos: int, end: int) -> int:
+    if(pos > 0): #Move up to the start of the next full line (unless pos is already at the start of one)
+        newline: int = buffer.find(b"\n", pos-1, end)
+        if(newline == -1):
+            return end
+        pos = newline + 1
+    while(pos < end):
+        if(buffer[pos:pos+2] == b"0 "):
+            lineEnd: int = buffer.find(b"\n", pos, end)
+            if(_isRecordLine(buffer[pos:(end if lineEnd == -1 else lineEnd)])):
+                return pos
+        nextLevel0: int = buffer.find(b"\n0 ", pos, end)
+        if(nextLevel0 == -1):
+            return end
+        pos = nextLevel0 + 1
+    return end
+
+
+#Splits the file into (start, end) byte ranges, roughly numChunks of them, where every range (other than the first) begins at the start of a record
+def _findChunks(buffer, numChunks: int) -> list[tuple[int, int]]:
+    size: int = len(buffer)
+    boundaries: list[int] = [0]
+    for i in range(1, numChunks):
+        boundary: int = _findRecordStart(buffer, max(size * i // numChunks, boundaries[-1] + 1), size)
+        if(boundary >= size):
+            break
+        if(boundary > boundaries[-1]):
+            boundaries.append(boundary)
+    boundaries.append(size)
+    return [(boundaries[i], boundaries[i+1]) for i in range(len(boundaries) - 1)]
+
+
+#Process-parallel version of parse_mmap(). The file is cut into chunks at record boundaries, and the chunks are read by a pool of jobs worker processes
+#The results are merged back in file order, with duplicate IDs (US22) fixed up in the main process. This means that the records, their IDs, and the report errors
+#all come out exactly the same as if the file had been read in one go
+#NOTE: A date tag (BIRT, DEAT, MARR, DIV) at the very end of one record whose DATE line only shows up in the next record won't be carried across chunks
+def parse_parallel(path: Union[str, os.PathLike], jobs: int, report: Report = None, encoding: str = "utf-8", lazy_dates: bool = False, compact: bool = False) -> Iterator[GEDCOMUnit]:
+    if(jobs <= 1):
+        yield from parse_mmap(path, report, encoding, lazy_dates, compact)
+        return
+    report = Report() if report is None else report
+    with open(path, "rb") as file:
+        if(os.fstat(file.fileno()).st_size == 0): #Empty files can't be mapped
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            chunks: list[tuple[int, int]] = _findChunks(buffer, jobs * 4) #More chunks than workers, so one slow chunk doesn't hold everything up
+    current_obj: GEDCOMUnit = None
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for events in executor.map(_parseChunk, [path] * len(chunks), [start for (start, _) in chunks], [end for (_, end) in chunks], [encoding] * len(chunks), [lazy_dates] * len(chunks), [compact] * len(chunks)):
+            for event in events:
+                match(event[0]):
+                    case "unit":
+                        #Same order as GEDCOMParser.startUnit(), the previous record is added before the new ID is checked
+                        report.addToReport(current_obj)
+                        if(current_obj is not None):
+                            yield current_obj
+                        current_obj = event[2]
+                        current_obj.id = report.check_unique_id_and_fix(event[1]) #US22
+                        if(lazy_dates): #Raw dates were given the worker's cache
+                            current_obj.useDateCache(report.date_cache)
+                    case "error":
+                        report.errors.append(event[1])
+                    case "line":
+                        report.line_errors.append(event[1])
+    report.addToReport(current_obj) #Add the latest object into the maps
+    if(current_obj is not None):
+        yield current_obj
+
+
+#Reads the whole file into a report, and returns the report. Only the parse-time checks (US01, US22, US42) are run, the rest are left up to the caller
+#If use_mmap is True, the file is read through parse_mmap() instead. If jobs is more than 1, it's read by that many processes through parse_parallel()
+#Both of these need path_or_stream to be a path. lazy_dates and compact work the same as they do in parse()
+#If snapshot is True, and a path is given for an empty report, the file's snapshot is used instead of reading it if it's still valid (see GEDCOM_Snapshot.py)
+#Otherwise, the file is read and a new snapshot is saved for next time. Lines that couldn't be read are in report.line_errors either way
+#Snapshots are kept in snapshot_folder, or the user's cache folder if it isn't given
+#If columnar is True, the records are written straight into a columnar store as they're read (see GEDCOM_Columnar.py), and a ColumnarReport is given back
+#Dates are stored as day numbers there, so columnar can't be used with lazy_dates, and there aren't any objects to snapshot, so it can't be used with snapshot either
+def load_report(path_or_stream: Union[str, os.PathLike, TextIO, Iterable[str]], report: Report = None, use_mmap: bool = False, jobs: int = 1, lazy_dates: bool = False, compact: bool = False,
+                snapshot: bool = False, snapshot_folder: str = None, columnar: bool = False) -> Report:
+    if(columnar):
+        if(lazy_dates or snapshot):
+            raise ValueError("Columnar reports can't be read with lazy dates or snapshots")
+        if(report is None):
+            report = ColumnarReport()
+        elif(not isinstance(report, ColumnarReport)):
+            raise ValueError("Columnar reading needs a ColumnarReport to read into")
+    report = Report() if report is None else report
+    digest: str = None
+    if(snapshot and isinstance(path_or_stream, (str, os.PathLike)) and not (report.indi_map or report.fam_map or report.errors)):
+        from classes.GEDCOM_Snapshot import fileHash, load_snapshot #Imported here, since snapshots need parserVersion from this file
+        digest = fileHash(path_or_stream)
+        if(load_snapshot(report, digest, lazy_dates, compact, snapshot_folder)):
+            return report
+    records: Iterator[GEDCOMUnit]
+    if(jobs > 1):
+        records = parse_parallel(path_or_stream, jobs, report, lazy_dates=lazy_dates, compact=compact)
+    elif(use_mmap):
+        records = parse_mmap(path_or_stream, report, lazy_dates=lazy_dates, compact=compact)
+    else:
+        records = parse(path_or_stream, report, lazy_dates, compact)
+    for _ in records:
+        pass
+    if(digest is not None):
+        from classes.GEDCOM_Snapshot import save_snapshot
+        save_snapshot(report, digest, lazy_dates, compact, snapshot_folder)
+    return report
@@ -2,62 +2,22 @@ from abc import ABC, abstractmethod
 from datetime import datetime, date, timedelta
 from prettytable import PrettyTable
 from classes.GEDCOM_Units import GEDCOMUnit, Individual, Family, GEDCOMReadException
+from classes.GEDCOM_Dates import monthToInt, stringDateConversion, DateCache, defaultDateCache
+from classes.GEDCOM_Interning import XrefInterner, InternedGraph
+from classes.GEDCOM_Traversal import Traversal
+from classes.GEDCOM_Kinship import Kinship, Relationship
+from classes.GEDCOM_Calendar import DayOfYearIndex, EventIndex
+from classes.GEDCOM_Names import splitName, PhoneticIndex, NameSearchIndex
 
 #Contains the report class used to contain all of the report data, as well as a couple of utility functions to help out
-
-#Maps months to their integer value
-monthToInt = {
-    "JAN": 1,
-    "FEB": 2,
-    "MAR": 3,
-    "APR": 4,
-    "MAY": 5,
-    "JUN": 6,
-    "JUL": 7,
-    "AUG": 8,
-    "SEP": 9,
-    "OCT": 10,
-    "NOV": 11,
-    "DEC": 12
-}
-
-#Converts GEDCOM date string into a Python date
-def stringDateConversion(string: str) -> date:
-    if(string == None or string == ""):
-        raise GEDCOMReadException("Date is not provided")
-    dateParts = string.split(" ", 2)
-    if(len(dateParts) != 3):
-        raise GEDCOMReadException("Date is malformed. Should consist <day> <month> <year>, where <day> and <year> are numerical values, while <month> is the first three letters of the month capitalized")
-    day: int
-    #Parse day
-    try:
-        day = int(dateParts[0])
-    except ValueError:
-        raise GEDCOMReadException("<day> of date (" + dateParts[0] + ") is not a valid numerical value")
-    #Parse month
-    month: int = monthToInt.get(dateParts[1])
-    if(month is None):
-        raise GEDCOMReadException("<month> of date (" + dateParts[1] + ") is not a valid month string")
-    #Parse year
-    year: int
-    try:
-        year = int(dateParts[2])
-    except ValueError:
-        raise GEDCOMReadException("<year> of date (" + dateParts[2] + ") is not a valid numerical value")
-    #Create final date and return it
-    finalDate: date
-    try:
-        finalDate = date(year, month, day)
-    except ValueError:
-        raise GEDCOMReadException(string + " is not a valid date (the day is probably too large for the current month)")
-    return finalDate
+#NOTE: The date conversion functions live in GEDCOM_Dates.py, but are imported here so they can still be found in this file
 
 #Will contain all of the data of the report, such as...
 # # Errors and anomalies that are caught within the file
 # # Upcoming birthdays and anniversaries
 class Report():
 
-    def __init__(self):
+    def __init__(self, date_cache: DateCache = None):
         #Storage for all of the individual records
         # IDs are the keys, Individual objects are the values
         self.indi_map: dict[str, Individual] = {}
@@ -74,11 +34,41 @@ class Report():
 
         self.recent_births: list[ReportDetail] = []
         self.recent_deaths: list[ReportDetail] = []
+        #US30/US31 listings: living married people along with the families they're still married in, and living singles over 30 along with their age
+        self.living_married: list[tuple[Individual, list[str]]] = []
+        self.living_singles: list[tuple[Individual, int]] = []
+        #Messages for the lines that couldn't be read, in the order they were found. Nothing prints them while reading, it's up to the caller (ex. GEDCOM_Reader.py)
+        self.line_errors: list[str] = []
 
         #Used for US01 - Dates before current date. Micro-optimization so that this doesn't need to be recalculated for every date checked (since it won't change).
         self.run_date: date = datetime.today().date()
         #Used for US22 - Unique IDs. Key is ID that's attempting to be duplicated, int is the amount of times it's duplicated (used to differentiate between IDs)
         self.duplicate_id_map: dict[str, int] = {}
+        #Used for US42 - Reject invalid dates. Repeated date strings are only converted once. Shared between reports unless a cache is given
+        self.date_cache: DateCache = defaultDateCache if date_cache is None else date_cache
+        #Every ID gets a dense integer as it's added, so the relationship checks can work with integers instead of strings
+        self.xrefs: XrefInterner = XrefInterner()
+        #Graph of all the references between records, by xref number. Built the first time it's needed, and thrown away whenever a record is added
+        self.interned_graph: InternedGraph = None
+        #Ancestor/descendant traversal built on top of the graph. Thrown away along with it
+        self.traversal: Traversal = None
+        #Kinship engine (how two people are related) built on top of the traversal. Also thrown away along with the graph
+        self.kinship: Kinship = None
+        #Connected components (separate family trees) of the records. Also thrown away along with the graph
+        self.components = None
+        #Day of year indexes of birthdays and (still going) marriages, for US38 and US39. Also thrown away along with the graph
+        self.birthday_index: DayOfYearIndex = None
+        self.anniversary_index: DayOfYearIndex = None
+        #Every birth, death, marriage, and divorce sorted by date, for US35, US36, and date range searches. Also thrown away along with the graph
+        self.event_index: EventIndex = None
+        #When every family ended, who's still married, and everyone's age. Used by US11 and the US30/US31 listings. Also thrown away along with the graph
+        self.marital_status = None
+        #Name indexes: the Soundex code of everyone's surname for "sounds like" searches, and every word of everyone's name for partial name searches
+        #Like everything above, they're only built the first time they're needed. Unlike everything above, they're then kept up to date as individuals are added instead of being thrown away
+        self.phonetic_index: PhoneticIndex = None
+        self.name_index: NameSearchIndex = None
+        #Derived facts (ex. everyone's age) shared between the checks while they're being run. Filled in and emptied out by the validation engine
+        self.facts: dict[str, object] = {}
 
 
     #Used to add the current object to either the Individual or Family maps
@@ -91,57 +81,174 @@ class Report():
                 newId: str = self.check_unique_id_and_fix(unit.id)
                 unit.id = newId
             self.indi_map.update({unit.id: unit})
+            self.xrefs.intern(unit.id)
+            self.invalidate_indexes(names=False)
+            if(self.phonetic_index is not None):
+                self.phonetic_index.add(unit)
+            if(self.name_index is not None):
+                self.name_index.add(unit)
         elif(isinstance(unit, Family)):
             dup_check: Family = self.fam_map.get(unit.id, None)
             if(dup_check is not None):
                 newId: str = self.check_unique_id_and_fix(unit.id)
                 unit.id = newId
             self.fam_map.update({unit.id: unit})
+            self.xrefs.intern(unit.id)
+            self.invalidate_indexes(names=False)
         else:
             raise GEDCOMReadException("Attempting to add non-GEDCOMUnit object to either the Individual or Family maps")
 
 
+    #Returns the graph of references between records, building it if needed
+    #NOTE: If a record's references are changed after it's been added, call invalidate_indexes() so the graph gets rebuilt
+    def get_interned_graph(self) -> InternedGraph:
+        if(self.interned_graph is None):
+            self.interned_graph = InternedGraph(self)
+        return self.interned_graph
+
+    #Returns the ancestor/descendant traversal engine, building it (and the graph) if needed
+    def get_traversal(self) -> Traversal:
+        if(self.traversal is None):
+            self.traversal = Traversal(self.get_interned_graph())
+        return self.traversal
+
+    #Returns the kinship engine, building it (and everything under it) if needed
+    def get_kinship(self) -> Kinship:
+        if(self.kinship is None):
+            self.kinship = Kinship(self.get_traversal())
+        return self.kinship
+
+    #Returns the connected components (separate family trees) of the records, working them out if needed
+    def get_components(self):
+        if(self.components is None):
+            from classes.GEDCOM_Components import Components #Imported here, since the components are made up of reports
+            self.components = Components(self)
+        return self.components
+
+    #Returns the day of year index of everyone's birthday, building it if needed
+    def get_birthday_index(self) -> DayOfYearIndex:
+        if(self.birthday_index is None):
+            self.birthday_index = DayOfYearIndex((id, indi.birthDate) for id, indi in self.indi_map.items())
+        return self.birthday_index
+
+    #Returns the day of year index of the marriage date of every family that's still together, building it if needed
+    def get_anniversary_index(self) -> DayOfYearIndex:
+        if(self.anniversary_index is None):
+            #Don't return anniversary dates for divorced (or widowed) couples
+            ends: dict[str, date] = self.get_marital_status().effectiveEnds
+            self.anniversary_index = DayOfYearIndex((id, fam.marriageDate) for id, fam in self.fam_map.items() if ends[id] is None)
+        return self.anniversary_index
+
+    #Returns the index of every event (birth, death, marriage, and divorce) sorted by date, building it if needed
+    def get_event_index(self) -> EventIndex:
+        if(self.event_index is None):
+            self.event_index = EventIndex(self.indi_map.items(), self.fam_map.items())
+        return self.event_index
+
+    #Returns the marital status table (see GEDCOM_MaritalStatus.py), building it if needed
+    def get_marital_status(self):
+        if(self.marital_status is None):
+            from classes.GEDCOM_MaritalStatus import MaritalStatusTable #Imported here, since the table needs effectiveDivorceDate from this file
+            self.marital_status = MaritalStatusTable(self)
+        return self.marital_status
+
+    #Returns the phonetic index of everyone's surname (see GEDCOM_Names.py), building it if needed
+    def get_phonetic_index(self) -> PhoneticIndex:
+        if(self.phonetic_index is None):
+            self.phonetic_index = PhoneticIndex(self.indi_map.values())
+        return self.phonetic_index
+
+    #Returns the IDs of everyone whose surname sounds like the given one (ex. "Smith" finds both Smith and Smyth)
+    def find_sounds_like(self, surname: str) -> list[str]:
+        return self.get_phonetic_index().soundsLike(surname)
+
+    #Returns the partial name search index (see GEDCOM_Names.py), building it if needed
+    def get_name_index(self) -> NameSearchIndex:
+        if(self.name_index is None):
+            self.name_index = NameSearchIndex(self.indi_map.values())
+        return self.name_index
+
+    #Returns the IDs of the people whose names best match a partial name (ex. "jo sm" finds John /Smith/), best first
+    def search_names(self, query: str, limit: int = 10) -> list[str]:
+        return self.get_name_index().search(query, limit)
+
+    #Returns how the second individual is related to the first in words (ex. "first cousin once removed"), or None if they aren't related
+    def describe_relationship(self, ind_id_1: str, ind_id_2: str) -> str:
+        relationship: Relationship = self.get_kinship().relationship(self.xrefs.lookup(ind_id_1), self.xrefs.lookup(ind_id_2))
+        return None if relationship is None else relationship.describe()
+
+    #Runs the checks with the given IDs (every registered check if none are given), minus any skipped ones, through the validation engine
+    #The engine goes through each record once for all of the checks. See GEDCOM_Validation.py for the list of checks
+    #If jobs is more than 1, the checks that only look at one family at a time are split up between that many processes
+    #Records read with lazy dates have their dates validated (US01, US42) first, since those checks are normally done while reading
+    def run_checks(self, rule_ids: list[str] = None, skip_ids: list[str] = None, jobs: int = 1) -> None:
+        from classes.GEDCOM_Validation import Validator #Imported here, since the validation engine needs ReportDetail from this file
+        if(self.has_unvalidated_dates()):
+            self.validate_dates()
+        Validator(self, rule_ids, skip_ids).run(jobs)
+
+    #Throws away anything built from the records, so it gets rebuilt the next time it's needed
+    #The name indexes can be kept (names=False) when the names haven't changed, since they're kept up to date as individuals are added
+    def invalidate_indexes(self, names: bool = True) -> None:
+        self.interned_graph = None
+        self.traversal = None
+        self.kinship = None
+        self.components = None
+        self.birthday_index = None
+        self.anniversary_index = None
+        self.event_index = None
+        self.marital_status = None
+        if(names):
+            self.phonetic_index = None
+            self.name_index = None
+
+
     #US01 - Dates before current date
     # Make sure all of the dates present in the file occur before the scanning of the file.
     def check_for_future_dates(self, dateVal : date):
         if(dateVal and dateVal > self.run_date):
             self.errors.append(ReportDetail("Future Date", f"Date that has yet to happen ({dateVal}) has been detected"))
 
+    #Returns True if any record still has dates being held as raw strings (read with lazy dates, and not validated yet)
+    #Records that don't hold raw dates at all (ex. the views of a columnar store) are skipped
+    def has_unvalidated_dates(self) -> bool:
+        return any(getattr(unit, "rawDates", None) for units in (self.indi_map.values(), self.fam_map.values()) for unit in units)
+
+    #US01 and US42 for records read with lazy dates. Converts every date that's still being held as a raw string, giving the same errors the parser would have given
+    #Records are gone through individuals first, then families, so the errors may be in a different order than when reading normally
+    def validate_dates(self):
+        for unit in self.indi_map.values():
+            unit.materializeDates(self.getValidatedDate)
+        for unit in self.fam_map.values():
+            unit.materializeDates(self.getValidatedDate)
+
+    #Converts the date string while checking for both invalid (US42) and future (US01) dates
+    def getValidatedDate(self, string: str) -> date:
+        dateObj: date = self.getDateFromString(string)
+        self.check_for_future_dates(dateObj)
+        return dateObj
+
     #US02 - Birth before Marriage
     # This is to check if birth occurred before marriage of an individual
     def birth_before_marriage(self):
-        for fam in self.fam_map.values():
-            husband = self.indi_map.get(fam.husbandId, None)
-            if(husband and husband.birthDate and fam.marriageDate and husband.birthDate > fam.marriageDate):
-                self.errors.append(ReportDetail("Birth After Marriage", "Birth of " + husband.id + " (" +  str(husband.birthDate) + ") occurred after their marriage (" + str(fam.marriageDate) + ")"))
-            wife = self.indi_map.get(fam.wifeId, None)
-            if(wife and wife.birthDate and fam.marriageDate and wife.birthDate > fam.marriageDate):
-                self.errors.append(ReportDetail("Birth After Marriage", "Birth of " + wife.id + " (" +  str(wife.birthDate) + ") occurred after their marriage (" + str(fam.marriageDate) + ")"))
+        self.run_checks(["US02"])
     
     #US03 - Birth before Death
     # This is to check if birth occurred before death of an individual
     def birth_before_death(self):
-        for indi in self.indi_map.values():
-            if indi.birthDate and indi.deathDate and indi.deathDate < indi.birthDate:
-                self.errors.append(ReportDetail("Birth After Death", "Birth of " + indi.id + " (" + str(indi.birthDate) + ") occurs after their death (" + str(indi.deathDate) + ")" ))
+        self.run_checks(["US03"])
 
     
     #US04 - Marriage before divorce
     #Marriage should occur before divorce of spouses, and divorce can only occur after marriage
     def marriage_before_divorce(self):
-        for fam in self.fam_map.values():
-            if fam.marriageDate and fam.divorceDate and fam.divorceDate < fam.marriageDate:
-                    self.errors.append(ReportDetail("Divorce Before Marriage", "Divorce of " + fam.id + " (" + str(fam.divorceDate) + ") occurs before their marriage (" + str(fam.marriageDate) + ")"))
-            elif fam.divorceDate and not fam.marriageDate:
-                    self.errors.append(ReportDetail("Divorce Without Marriage", "Divorce of " + fam.id + " (" + str(fam.divorceDate) + ") occurs without a recorded marriage date."))
+        self.run_checks(["US04"])
 
 
     # US05 - Marriage before death  
     # Marriage should occur before death of either spouse
     def marriage_before_death(self):
-        for fam in self.fam_map.values():
-            self.check_marriage_before_death(fam.husbandId, fam)
-            self.check_marriage_before_death(fam.wifeId, fam)
+        self.run_checks(["US05"])
 
     def check_marriage_before_death(self, spouse_id, family):
         spouse = self.indi_map.get(spouse_id, None)
@@ -154,191 +261,43 @@ class Report():
     #US06 - Divorce before death
     # Divorce can only occur before death of both spouses
     def divorce_before_death(self):
-        for fam in self.fam_map.values():
-            if fam.divorceDate:
-                husband = self.indi_map.get(fam.husbandId, None)
-                wife = self.indi_map.get(fam.wifeId, None)
-                if (husband and husband.deathDate and fam.divorceDate > husband.deathDate):
-                    self.errors.append(ReportDetail("Divorce After Death", f"Divorce for family {fam.id} ({fam.divorceDate}) occurs after the death of the husband ({husband.deathDate})"))
-                if (wife and wife.deathDate and fam.divorceDate > wife.deathDate):
-                    self.errors.append(ReportDetail("Divorce Afte Death", f"Divorce for family {fam.id} ({fam.divorceDate}) occurs after the death of the wife ({wife.deathDate})"))
+        self.run_checks(["US06"])
 
 
     #US07 - Less than 150 years old
     # Make sure all individuals are less than 150 years old
     def check_max_age(self):
-        for indi in self.indi_map.values():
-            if(indi.birthDate):
-                age: int = indi.calculateAge()
-                if(age > 150):
-                    self.errors.append(ReportDetail("Over 150 Years Old", f"{indi.id} is over 150 years old ({age} years old)"))
+        self.run_checks(["US07"])
 
     #US08 - Birth after marriage of parents
     def check_birth_after_parents_marriage (self):
-        for fam in self.fam_map.values():
-            divorceDate = self.get_divorceDate (fam)
-            if len(fam.childIds) > 0:
-                for childId in fam.childIds:
-                    child = self.indi_map.get(childId, None)
-                    if child and fam.marriageDate == None:
-                        self.anomalies.append(ReportDetail("Birth Without Marriage of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured without parents marriage"))
-                    elif child and child.birthDate and fam.marriageDate and fam.marriageDate > child.birthDate:
-                        self.anomalies.append(ReportDetail("Birth Before Marriage of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured before marriage of parents (" + str(fam.marriageDate) + ")"))
-                    if child and child.birthDate and divorceDate != None and (child.birthDate - divorceDate).days > 270:
-                        self.anomalies.append(ReportDetail("Birth After Divorce of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured after 9 months after divorce of parents (" + str(divorceDate) + ")"))
+        self.run_checks(["US08"])
 
 
     #US09 - Birth before death of parents
     def check_birth_before_death_parents (self):
-        for fam in self.fam_map.values():
-            husband = self.indi_map.get(fam.husbandId, None)
-            wife = self.indi_map.get(fam.wifeId, None)
-            if wife and wife.deathDate != None and len(fam.childIds) > 0:
-                for childId in fam.childIds:
-                    child = self.indi_map.get(childId, None)
-                    if child and child.birthDate and child.birthDate > wife.deathDate:
-                        self.errors.append(ReportDetail("Birth After Death of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured after death of mother (" + str(wife.deathDate) + ")"))
-            if husband and husband.deathDate != None and len(fam.childIds) > 0:
-                for childId in fam.childIds:
-                    child = self.indi_map.get(childId, None)
-                    if child and child.birthDate and (child.birthDate - husband.deathDate).days > 270:
-                        self.errors.append(ReportDetail("Birth After Death of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured after 9 months after death of father (" + str(husband.deathDate) + ")"))
+        self.run_checks(["US09"])
     
     #US10 - Marriage after 14
     # Marriage should be at least 14 years after birth of both spouses (husband and wife must be at least 14 years old)
     def marriage_after_14(self):
-        for fam in self.fam_map.values():
-            husband = self.indi_map.get(fam.husbandId, None)
-            if(husband and husband.birthDate and fam.marriageDate):
-                if (fam.marriageDate.month < husband.birthDate.month or fam.marriageDate.month == husband.birthDate.month and fam.marriageDate.day < husband.birthDate.day):
-                    if (fam.marriageDate.year - husband.birthDate.year - 1 < 14):
-                        self.errors.append(ReportDetail("Marriage Before 14", "Marriage for " + husband.id + " (" +  str(fam.marriageDate) + ") occurs before 14 (" + str(husband.birthDate) + ")"))
-                else:
-                    if (fam.marriageDate.year - husband.birthDate.year < 14):
-                        self.errors.append(ReportDetail("Marriage Before 14", "Marriage for " + husband.id + " (" +  str(fam.marriageDate) + ") occurs before 14 (" + str(husband.birthDate) + ")"))
-            wife = self.indi_map.get(fam.wifeId, None)
-            if(wife and wife.birthDate and fam.marriageDate):
-                if (fam.marriageDate.month < wife.birthDate.month or fam.marriageDate.month == wife.birthDate.month and fam.marriageDate.day < wife.birthDate.day):
-                    if (fam.marriageDate.year - wife.birthDate.year - 1 < 14):
-                        self.errors.append(ReportDetail("Marriage Before 14", "Marriage for " + wife.id + " (" +  str(fam.marriageDate) + ") occurs before 14 (" + str(wife.birthDate) + ")"))
-                else:
-                    if (fam.marriageDate.year - wife.birthDate.year < 14):
-                        self.errors.append(ReportDetail("Marriage Before 14", "Marriage for " + wife.id + " (" +  str(fam.marriageDate) + ") occurs before 14 (" + str(wife.birthDate) + ")"))
+        self.run_checks(["US10"])
 
     #Calculate divorce date
     def get_divorceDate (self, family):
         if(family is None):
             return None
-        husband = self.indi_map.get(family.husbandId, None)
-        wife = self.indi_map.get(family.wifeId, None)
-        if family.divorceDate:
-            divorceDate = family.divorceDate
-        elif husband and wife and husband.deathDate and wife.deathDate and husband.deathDate > wife.deathDate:
-            divorceDate = wife.deathDate
-        elif husband and wife and husband.deathDate and wife.deathDate and wife.deathDate > husband.deathDate:
-            divorceDate = husband.deathDate
-        elif husband and wife and husband.deathDate and wife.deathDate == None:
-            divorceDate = husband.deathDate
-        elif husband and wife and wife.deathDate and husband.deathDate == None:
-            divorceDate = wife.deathDate
-        else:
-            divorceDate = None
-        return divorceDate
+        return effectiveDivorceDate(family, self.indi_map.get(family.husbandId, None), self.indi_map.get(family.wifeId, None))
 
     #US11 - No bigamy
     # Marriage should not occur during marriage to another spouse
     def check_bigamy(self):
-        bigamy_true = []
-        for fam in self.fam_map.values():
-            divorceDate = None
-            if fam.divorceDate == None:
-                divorceDate = self.get_divorceDate (fam)
-                fam.divorceDate = divorceDate
-            if fam.id in bigamy_true:
-                continue
-            husband = self.indi_map.get(fam.husbandId, None)
-            wife = self.indi_map.get(fam.wifeId, None)
-            marriageDate = fam.marriageDate
-            if husband and len(husband.spouseIn) > 1:
-                for famId in husband.spouseIn:
-                    if famId != fam.id:
-                        family = self.fam_map.get(famId, None)
-                        if family is None:
-                            continue
-                        marriageDateNew = family.marriageDate
-                        divorceDateNew = self.get_divorceDate(family)
-                        if divorceDate is not None and divorceDateNew is not None:
-                            if marriageDate and marriageDateNew and marriageDate < marriageDateNew and divorceDate > marriageDateNew:
-                                bigamy_true.append(famId)
-                                self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + husband.id + " and families are " + fam.id + " and " + famId))
-                            elif marriageDate > marriageDateNew and divorceDateNew > marriageDate:
-                                bigamy_true.append(famId)
-                                self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + husband.id + " and families are " + fam.id + " and " + famId))
-                        elif divorceDate == None and divorceDateNew == None:
-                            bigamy_true.append(famId)
-                            self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + husband.id + " and families are " + fam.id + " and " + famId))
-                        elif divorceDateNew == None and divorceDate > marriageDateNew:
-                            bigamy_true.append(famId)
-                            self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + husband.id + " and families are " + fam.id + " and " + famId))
-                        elif divorceDateNew and marriageDate and divorceDate is None and marriageDate < divorceDateNew:
-                            bigamy_true.append(famId)
-                            self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + husband.id + " and families are " + fam.id + " and " + famId))
-                        
-            if wife and len(wife.spouseIn) > 1:
-                for famId in wife.spouseIn:
-                    if famId != fam.id:
-                        family = self.fam_map.get(famId, None)
-                        if family is None:
-                            continue
-                        marriageDateNew = family.marriageDate
-                        divorceDateNew = self.get_divorceDate(family)
-                        if divorceDate is not None and divorceDateNew is not None:
-                            if marriageDate and marriageDateNew and marriageDate < marriageDateNew and divorceDate > marriageDateNew:
-                                bigamy_true.append(famId)
-                                self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + wife.id + " and families are " + fam.id + " and " + famId))
-                            elif marriageDate > marriageDateNew and divorceDateNew > marriageDate:
-                                bigamy_true.append(famId)
-                                self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + wife.id + " and families are " + fam.id + " and " + famId))
-                        elif divorceDate == None and divorceDateNew == None:
-                            bigamy_true.append(famId)
-                            self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + wife.id + " and families are " + fam.id + " and " + famId))
-                        elif divorceDateNew == None and divorceDate > marriageDateNew:
-                            bigamy_true.append(famId)
-                            self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + wife.id + " and families are " + fam.id + " and " + famId))
-                        elif divorceDateNew and marriageDate and divorceDate is None and marriageDate < divorceDateNew:
-                            bigamy_true.append(famId)
-                            self.errors.append(ReportDetail("Bigamy", "Spouse details are: " + wife.id + " and families are " + fam.id + " and " + famId))
+        self.run_checks(["US11"])
 
     #US12 - Parents not too old
     # This checks all of the families and compares the ages of both parents to their 
     def check_parent_child_age_difference(self):
-        for fam in self.fam_map.values():
-            #Store the information and age for the kids in the array so all that doesn't have to be fetched twice (once for father, once for mother)
-            kidsInfo: list[str] = []
-            kidsAges: list[int] = []
-            if(len(fam.childIds) == 0 or (fam.husbandId is None and fam.wifeId is None)): #Don't bother if there's no children or no parents
-                continue
-            else:
-                kidsInfo = list(filter(lambda kid: (kid is not None and kid.birthDate is not None), map(lambda kidId: self.indi_map.get(kidId, None), fam.childIds))) #Get the information of all the kids, and remove the ones without birthdays
-                kidsAges = list(map(lambda kid: kid.calculateAge(), kidsInfo)) #Get all fo their ages
-            dadInfo: Individual = self.indi_map.get(fam.husbandId, None)
-            if(dadInfo and dadInfo.birthDate):
-                dadTooOldFor: list[str] = [] #The ids of all the kids that the dad is more than 80 years older than
-                dadAge: int = dadInfo.calculateAge()
-                for i in range(len(kidsInfo)):
-                    if dadAge - kidsAges[i] > 80: #Father is over 80 years older than this child
-                        dadTooOldFor.append(kidsInfo[i].id)
-                if(len(dadTooOldFor) > 0):
-                    self.anomalies.append(ReportDetail("Parent Too Old", f"Father in family {fam.id} is over 80 years older than one or more of his children {dadTooOldFor}"))
-            momInfo: Individual = self.indi_map.get(fam.wifeId, None)
-            if(momInfo and momInfo.birthDate):
-                momTooOldFor: list[str] = [] #The ids of all the kids that the mom is more than 60 years older than
-                momAge: int = momInfo.calculateAge()
-                for i in range(len(kidsInfo)):
-                    if momAge - kidsAges[i] > 60: #Mom is over 60 years older than this child
-                        momTooOldFor.append(kidsInfo[i].id)
-                if(len(momTooOldFor) > 0):
-                    self.anomalies.append(ReportDetail("Parent Too Old", f"Mother in family {fam.id} is over 60 years older than one or more of her children {momTooOldFor}"))
+        self.run_checks(["US12"])
             
             
 
@@ -346,107 +305,36 @@ class Report():
     #US14 - Multiple births <= 5
     # No more than five siblings born at the same time
     def check_multiple_births(self):
-        for fam in self.fam_map.values():
-            birth_dates = {}  # Dictionary to store birth dates and their counts
-            for child_id in fam.childIds:
-                child = self.indi_map.get(child_id, None)
-                if child and child.birthDate:
-                    birth_date = child.birthDate
-                    if birth_date in birth_dates:
-                        birth_dates[birth_date] += 1
-                    else:
-                        birth_dates[birth_date] = 1
-            for date, count in birth_dates.items():
-                if count > 5:
-                    self.anomalies.append(ReportDetail("Multiple Births", f"More than five siblings were born on {date} in family {fam.id}."))
+        self.run_checks(["US14"])
 
 
     # US15 - Fewer than 15 siblings
     def fewer_than_15_siblings(self):
-    # Iterate through all families in the GEDCOM file
-        for fam in self.fam_map.values():
-        # Check the number of children (siblings) in the family
-            if len(fam.childIds) >= 15:
-            # If there are 15 or more children, add an error to the report
-            # This means that the family has too many siblings
-                error_message = f"Family {fam.id} has 15 or more children"
-                self.anomalies.append(ReportDetail("Too Many Siblings", error_message))
+        self.run_checks(["US15"])
 
     
     #US16 - Male last names
     #Makes sure that all male members of a family share the same last name
+    #Individuals already have their surname split out (indi.surname), this is for any other name
     def get_surname(self, name: str):
-        surnameStartPos: int = name.find("/")
-        if(surnameStartPos == -1): #No slashes present, so no surname. Just return the empty string.
-            return ""
-        surnameEndPos: int = name.find("/", surnameStartPos+1) #Find the next slash after the previous one
-        if(surnameEndPos == -1): #If that's the only slash present, then just assume that the last name is until the end of the name
-            surnameEndPos = len(name)
-        if(surnameStartPos+1 == surnameEndPos): #Have encountered two slashes next to each other, this name is empty
-            return ""
-        else: #Assumes that there's at least one character in the name, which is why the previous check is needed
-            return name[surnameStartPos+1:surnameEndPos]
+        return splitName(name)[1]
 
 
     def check_family_male_surnames(self):
-        for fam in self.fam_map.values():
-            male_surnames: list[str] = []
-            #First, check the husband of the family
-            husband: Individual = self.indi_map.get(fam.husbandId, None)
-            if(husband and husband.name):
-                #Since the husband is always the first person checked, just put their last name in automatically
-                male_surnames = [self.get_surname(husband.name)]
-            for id in fam.childIds:
-                child: Individual = self.indi_map.get(id, None)
-                if(child and child.name and child.sex == "M"):
-                    child_surname: str = self.get_surname(child.name)
-                    if(child_surname not in male_surnames):
-                        male_surnames.append(child_surname)
-            if(len(male_surnames) > 1):
-                self.anomalies.append(ReportDetail("Differing Male Surnames", f"Males in family {fam.id} have several different surnames {male_surnames}")) 
+        self.run_checks(["US16"])
 
 
     # US17: No Marriage to Descendants
     # Marriage between ancestors and descendants is not allowed.
 
     # Helper function to get descendants of an individual.
+    # Uses the traversal engine, which walks down the tree without recursion and stops at anyone it's already seen
     def get_descendants(self, individual_id):
-        descendants = set()
-        for family in self.fam_map.values():
-            if family.husbandId == individual_id or family.wifeId == individual_id:
-                for child_id in family.childIds:
-                    descendants.add(child_id)
-                    if(child_id != individual_id): #To prevent infinite recursion when a child is marked as their own parent
-                        descendants.update(self.get_descendants(child_id))
-        return descendants
+        traversal: Traversal = self.get_traversal()
+        return {self.xrefs.name(number) for number in traversal.descendants(self.xrefs.lookup(individual_id))}
 
     def no_marriage_to_descendants(self):
-        # Iterate through individuals.
-        for ind in self.indi_map.values():
-            # Get descendants of the current individual.
-            descendants = self.get_descendants(ind.id)
-            if descendants:
-                # Iterate through families associated with the current individual.
-                for fam_id in ind.spouseIn:
-                    family = self.fam_map.get(fam_id, None)
-                    if family is not None:
-                        husband_id = family.husbandId
-                        wife_id = family.wifeId
-
-                        # Check if either the husband or wife is a descendant of the current individual.
-                        if husband_id in descendants or wife_id in descendants:
-                            if ind.id == husband_id and husband_id not in family.childIds: #Second check is to prevent incorrect recursive descendants
-                                otherIndi = self.indi_map.get(wife_id, None)
-                                otherIndiId = "NA" if otherIndi is None else otherIndi.id
-                                # Add a note about the marriage if the current individual is the husband.
-                                self.anomalies.append(ReportDetail("Marriage to Descendant",
-                                    f"{ind.id} is married to descendant, {otherIndiId}."))
-                            elif wife_id not in family.childIds:
-                                otherIndi = self.indi_map.get(husband_id, None)
-                                otherIndiId = "NA" if otherIndi is None else otherIndi.id
-                                # Add a note about the marriage if the current individual is the wife.
-                                self.anomalies.append(ReportDetail("Marriage to Descendant",
-                                    f"{ind.id} is married to descendant, {otherIndiId}."))
+        self.run_checks(["US17"])
         
                       
     #US18 - Siblings should not marry
@@ -462,90 +350,22 @@ class Report():
             return False
 
     def no_sibling_marriage(self):
-        # Iterate through families.
-        for family in self.fam_map.values():
-            husband_id = family.husbandId
-            wife_id = family.wifeId
-
-            # Check if the husband and wife are siblings.
-            if self.are_siblings(husband_id, wife_id):
-                # Add a note about the marriage.
-                self.anomalies.append(ReportDetail("Sibling Marriage",
-                    f"Siblings {husband_id} and {wife_id} should not marry."))
+        self.run_checks(["US18"])
                 
     #US19
     def first_cousins_should_not_marry(self):
-        # Create a dictionary to store the families of the grandparents of each individual
-        grandparents = {}
+        self.run_checks(["US19"])
 
-        # Iterate through all families in the GEDCOM file
-        for fam in self.fam_map.values():
-            # Check if the family has children (individuals)
-            if fam.childIds:
-                # Get the grandparents (parents of the parents)
-                father = self.indi_map.get(fam.husbandId, None)
-                mother = self.indi_map.get(fam.wifeId, None)
-
-                patGrandpa = None
-                patGrandma = None
-                matGrandpa = None
-                matGrandma = None
-
-                if(father and father.childIn):
-                    fatherFamily = self.fam_map.get(father.childIn, None)
-                    if(fatherFamily):
-                        patGrandpa = fatherFamily.husbandId
-                        patGrandma = fatherFamily.wifeId
-
-                if(mother and mother.childIn):
-                    motherFamily = self.fam_map.get(mother.childIn, None)
-                    if(motherFamily):
-                        matGrandpa = motherFamily.husbandId
-                        matGrandma = motherFamily.wifeId
-
-                grandparentsSet = {patGrandpa, patGrandma, matGrandpa, matGrandma}
-                grandparentsSet.discard(None) #Get rid of None value if it's in the set
-
-                #if father or mother:
-                for child_id in fam.childIds:
-                    child = self.indi_map.get(child_id, None)
-                    if child:
-                        grandparents[child.id] = grandparentsSet
-
-        # Iterate through the families to check if any have common grandparents (first cousins)
-        for fam in self.fam_map.values():
-            husband_parents = grandparents.get(fam.husbandId, set())
-            wife_parents = grandparents.get(fam.wifeId, set())
-
-            # Find common grandparents (first cousins)
-            common_grandparents = husband_parents.intersection(wife_parents)
 
-            # If there are common grandparents, it means first cousins are getting married
-            if common_grandparents:
-                error_message = f"First cousins are getting married in Family {fam.id}"
-                self.anomalies.append(ReportDetail("First Cousins Marrying", error_message))
+    #Ancestry loops
+    # Nobody can be their own ancestor. Ancestry loops can only come from corrupted data, and would make any walk through the family tree go on forever
+    def check_ancestry_cycles(self):
+        self.run_checks(["CYCLES"])
 
 
     #US21 - Correct Gender of Role
     def check_correct_gender_for_roles(self):
-        # Iterate through all families in the GEDCOM file
-        for fam in self.fam_map.values():
-            husband_id = fam.husbandId
-            wife_id = fam.wifeId
-            
-            # Check the husband's gender
-            if husband_id:
-                husband = self.indi_map.get(husband_id)
-                if husband and husband.sex != "M":
-                    # Add the issue to the list
-                    self.errors.append(ReportDetail("Incorrect Sex", f"Husband in family {fam.id} is female"))
-            
-            # Check the wife's gender
-            if wife_id:
-                wife = self.indi_map.get(wife_id)
-                if wife and wife.sex != "F":
-                    # Add the issue to the list
-                    self.errors.append(ReportDetail("Incorrect Sex", f"Wife in family {fam.id} is male"))
+        self.run_checks(["US21"])
 
 
     #US22 - Unique IDs
@@ -563,124 +383,22 @@ class Report():
 
     #US23 - Unique Name and Birth Date
     def check_unique_name_and_birth_date(self):
-        # Dictionary to store individuals based on name and birth date
-        name_birth_dict = {}
-
-        # Iterate through all individuals in the GEDCOM file
-        for indi in self.indi_map.values():
-            # Check if the individual has a name and a birth date
-            if indi.name and indi.birthDate:
-                # Create a unique key based on name and birth date
-                unique_key = f"{indi.name} {indi.birthDate}"
-                
-                # Check if the unique key already exists in the dictionary
-                if unique_key in name_birth_dict:
-                    # If the key exists, it means there's already an individual with the same name and birth date
-                    # Add the issue to the list of duplicates
-                    name_birth_dict[unique_key].append(indi.id)
-                else:
-                    # If the key doesn't exist, create a list for it and add the individual
-                    name_birth_dict[unique_key] = [indi.id]
-
-        # Iterate through the dictionary to find duplicates
-        for key, duplicates in name_birth_dict.items():
-            if len(duplicates) > 1:
-                # If there are duplicates, create a new anomaly detailing all of them
-                detailStr = ""
-                for i in range(len(duplicates)):
-                    #print(f"Multiple individuals with the same name '{issue[0]['name']}' and birth date '{issue[0]['birth_date']}' found:")
-                    detailStr += duplicates[i]
-                    if i < len(duplicates) - 1:
-                        detailStr += ","
-                    detailStr += " "
-                sharedDetails = key.split(" ")
-                sharedBDay = sharedDetails.pop()
-                sharedName = ""
-                for i in range(len(sharedDetails)): #Need to reassemble the name
-                    sharedName += sharedDetails[i]
-                    if i != len(sharedDetails) - 1:
-                        sharedName += " "
-                detailStr += f"share a name ({sharedName}) and birthday ({sharedBDay})"
-                self.anomalies.append(ReportDetail("Duplicate Name and Birthdate", detailStr))
+        self.run_checks(["US23"])
 
 
     #US25 - Unique first names in families
+    #Individuals already have their given name split out (indi.givenName), this is for any other name
     def get_first_name(self, name: str):
-        surnameStartPos: int = name.find("/")
-        if(surnameStartPos == -1): #No slashes present, so no surname. Just return the whole name.
-            return name
-        surnameEndPos: int = name.find("/", surnameStartPos+1) #Find the next slash after the previous one
-        if(surnameEndPos == -1): #If that's the only slash present, then just assume that the last name is until the end of the name
-            surnameEndPos = len(name)
-        if(surnameStartPos+1 == surnameEndPos): #Have encountered two slashes next to each other, this name is empty
-            return ""
-        else: #Get the stuff not in between the slashes  (including the spaces before and after the slashes)
-            return name[0:surnameStartPos].rstrip() + name[surnameEndPos+1:len(name)].lstrip()
+        return splitName(name)[0]
         
     def check_sibling_same_name(self):
-        for fam in self.fam_map.values():
-            sibling_name_dict = {}
-            for siblingId in fam.childIds:
-                sibling = self.indi_map.get(siblingId, None)
-                if(sibling and sibling.name):
-                    firstName = self.get_first_name(sibling.name)
-                    if(firstName in sibling_name_dict):
-                        sibling_name_dict[firstName].append(sibling.id)
-                    else:
-                        sibling_name_dict[firstName] = [sibling.id]
-            
-            for name, ids in sibling_name_dict.items():
-                if(len(ids) > 1):
-                    self.anomalies.append(ReportDetail("Siblings Shared Name", f"Siblings {ids} share a first name ({name})"))
+        self.run_checks(["US25"])
 
 
     #US26 - Corresponding Entries
     # Makes sure that families specified in individual records exist and match, same for individuals mentioned in family records
     def check_corresponding_entries(self):
-        for indi in self.indi_map.values():
-            #Childhood family check
-            if(indi.childIn):
-                childhoodFamily: Family = self.fam_map.get(indi.childIn, None)
-                if(childhoodFamily is None):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Family {indi.childIn} specified in individual {indi.id} is not present in the family records"))
-                elif(indi.id not in childhoodFamily.childIds):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Family {indi.childIn} specified in individual {indi.id} does not have {indi.id} as a child"))
-            #Spousal families check
-            if(len(indi.spouseIn) > 0):
-                for famId in indi.spouseIn:
-                    spousalFamily: Family = self.fam_map.get(famId, None)
-                    if(spousalFamily is None):
-                        self.errors.append(ReportDetail("Correspondance Error", f"Family {famId} specified in individual {indi.id} is not present in the family records"))
-                    #elif(indi.sex == "M" and spousalFamily.husbandId != indi.id):
-                    #    self.errors.append(ReportDetail("Correspondance Error", f"Family {famId} specified in individual {indi.id} does not have {indi.id} as its husband"))
-                    #elif(indi.sex == "F" and spousalFamily.wifeId != indi.id):
-                    #    self.errors.append(ReportDetail("Correspondance Error", f"Family {famId} specified in individual {indi.id} does not have {indi.id} as its wife"))
-                    #Previous stuff has been commented out since it's covered by another error
-                    elif(spousalFamily.husbandId != indi.id and spousalFamily.wifeId != indi.id): 
-                        self.errors.append(ReportDetail("Correspondance Error", f"Family {famId} specified in individual {indi.id} does not have {indi.id} as a spouse"))
-
-        for fam in self.fam_map.values():
-            #Check husband
-            if(fam.husbandId):
-                husband: Individual = self.indi_map.get(fam.husbandId, None)
-                if(husband is None):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Husband {fam.husbandId} specified in family {fam.id} is not present in the individual records"))
-                elif(fam.id not in husband.spouseIn):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Husband {fam.husbandId} specified in family {fam.id} does not have {fam.id} as a corresponding spousal family"))
-            #Check wife
-            if(fam.wifeId):
-                wife: Individual = self.indi_map.get(fam.wifeId, None)
-                if(wife is None):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Wife {fam.wifeId} specified in family {fam.id} is not present in the individual records"))
-                elif(fam.id not in wife.spouseIn):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Wife {fam.wifeId} specified in family {fam.id} does not have {fam.id} as a corresponding spousal family"))
-            #Check children
-            for childId in fam.childIds:
-                child: Individual = self.indi_map.get(childId, None)
-                if(child is None):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Child {childId} specified in family {fam.id} is not present in the individual records"))
-                elif(fam.id != child.childIn):
-                    self.errors.append(ReportDetail("Correspondance Error", f"Child {childId} specified in family {fam.id} does not have {fam.id} as their childhood family")) 
+        self.run_checks(["US26"])
 
 
 
@@ -701,120 +419,60 @@ class Report():
             fam.childIds = sorted_siblings
 
     #US30 - List Living Married
+    # Returns the families the individual is still married in, from the marital status table
     def check_married_status (self, indi):
-        famID_list = []
-        if len(indi.spouseIn) > 0:
-            for famId in indi.spouseIn:
-                family = self.fam_map.get(famId)
-                divorceDate = self.get_divorceDate(family)
-                if divorceDate == None:
-                    famID_list.append(famId)
-        return famID_list
+        return self.get_marital_status().familiesOf(indi)
 
     #US31 - List Living Single
     def check_single_status (self, indi):
-        if len(indi.spouseIn) > 0:
-            for famId in indi.spouseIn:
-                family = self.fam_map.get(famId)
-                divorceDate = self.get_divorceDate(family)
-                if divorceDate == None:
-                    return False
-            return True
-        else:
-            return True
+        return len(self.get_marital_status().familiesOf(indi)) == 0
 
+    #US30 - List Living Married
+    # Everyone alive who's still married, from the marital status table
+    def list_living_married(self):
+        self.living_married = self.get_marital_status().livingMarried()
 
-    # US34 - List couples married when the older spouse was more than twice as old as the younger spouse
-    def list_couples_with_large_age_difference(self):
-        #userStoryName('US34-List Couples with Large Age Difference')
-        #output('\t' + 'HUSBAND' + '\t\t\t\t' + 'WIFE' + '\t\t\t\t' + 'MARRIAGE DATE')
+    #US31 - List Living Single
+    # Everyone alive over min_age who isn't married, from the marital status table
+    def list_living_singles(self, min_age=30):
+        self.living_singles = self.get_marital_status().livingSingles(min_age)
 
-        for family_id, family in self.fam_map.items():
-            husband = self.indi_map.get(family.husbandId)
-            wife = self.indi_map.get(family.wifeId)
 
-            if husband and wife and husband.birthDate and wife.birthDate:# and family.marriageDate:
-                age_difference = abs((husband.birthDate - wife.birthDate).days) // 365
-                husbandAge = husband.calculateAge()
-                wifeAge = wife.calculateAge()
-                if age_difference > min(husbandAge, wifeAge):
-                    if husband.birthDate < wife.birthDate:
-                        self.anomalies.append(ReportDetail("Large Couple Age Gap", f"Husband {husband.id} (age {husbandAge}) is over twice as old as his wife {wife.id} (age {wifeAge})"))
-                    else:
-                        self.anomalies.append(ReportDetail("Large Couple Age Gap", f"Wife {wife.id} (age {wifeAge}) is over twice as old as her husband {husband.id} (age {husbandAge})"))
+    # US34 - List couples married when the older spouse was more than twice as old as the younger spouse
+    def list_couples_with_large_age_difference(self):
+        self.run_checks(["US34"])
 
 
     # US35 - List recent births
+    # Every birth on or after the date days_threshold days ago, in date order, found with the event index
     def list_recent_births(self, days_threshold=30):
-        self.recent_births = []  # Clear the previous list
-        current_date = datetime.now()
-        threshold_date = current_date - timedelta(days=days_threshold)
-
-        for individual_id, individual in self.indi_map.items():
-            if individual.birthDate is not None and individual.birthDate >= threshold_date.date():
-                self.recent_births.append(ReportDetail(individual_id, individual.birthDate))
-
-        # Sort recent_births by birth date
-        self.recent_births.sort(key=lambda x: x.message)
+        threshold_date = datetime.now().date() - timedelta(days=days_threshold)
+        self.recent_births = [ReportDetail(individual_id, birthDate) for individual_id, birthDate in self.get_event_index().between("birth", threshold_date)]
 
 
     # US36 - List recent deaths
+    # Same as US35, but for deaths
     def list_recent_deaths(self, days_threshold=30):
-        self.recent_deaths = []  # Clear the previous list
-        current_date = datetime.now()
-        threshold_date = current_date - timedelta(days=days_threshold)
-
-        for individual_id, individual in self.indi_map.items():
-            if individual.deathDate is not None and individual.deathDate >= threshold_date.date():
-                self.recent_deaths.append(ReportDetail(individual_id, individual.deathDate))
-
-        # Sort recent_deaths by death date
-        self.recent_deaths.sort(key=lambda x: x.message)
+        threshold_date = datetime.now().date() - timedelta(days=days_threshold)
+        self.recent_deaths = [ReportDetail(individual_id, deathDate) for individual_id, deathDate in self.get_event_index().between("death", threshold_date)]
 
 
     # US38 - List upcoming birthdays
-    def list_upcoming_birthdays(self, days_threshold=30):
-        upcoming_birthdays = []  # A list to store upcoming birthday records
-        current_date = datetime.now().date()
-        threshold_date = current_date + timedelta(days=days_threshold)
-
-        for individual_id, individual in self.indi_map.items():
-            if individual.birthDate is not None:
-                bdayHasPassedInt = 1 if (individual.birthDate.month < current_date.month or (individual.birthDate.month == current_date.month and individual.birthDate.day < current_date.day)) else 0
-                #bdayHasPassedInt is 1 if birthday has passed within the year, otherwise it's 0. Used to get the year that the individual's next birthday will be on
-                upcoming_birthday: date
-                try:
-                    upcoming_birthday = individual.birthDate.replace(year=current_date.year + bdayHasPassedInt)
-                except ValueError: #If date exists yet a value error is still raised, then they were born on a leap year, but next birthday won't be on a leap year
-                    upcoming_birthday = date(current_date.year + bdayHasPassedInt, 2, 28)
-                if upcoming_birthday >= current_date and upcoming_birthday <= threshold_date: #If birthday is upcoming, it should be after or equal to today's date, but before (or equal to) the threshold
-                    upcoming_birthdays.append((individual_id, upcoming_birthday))
-
-        upcoming_birthdays.sort(key=lambda x: x[1])
+    # Birthdays from the start date (today if not given) up to and including days_threshold days after it, found with the day of year index
+    # Leap day birthdays fall on February 28th in years without one
+    def list_upcoming_birthdays(self, days_threshold=30, start_date: date = None):
+        current_date = datetime.now().date() if start_date is None else start_date
+        upcoming_birthdays = self.get_birthday_index().upcoming(current_date, days_threshold)
         for (individual_id, bday) in upcoming_birthdays:
             self.upcomingBirthdays.append(ReportDetail(individual_id, bday))
         return upcoming_birthdays
 
 
     # US39 - List upcoming anniversaries
-    def list_upcoming_anniversaries(self, days_threshold=30):
-        upcoming_anniversaries = []  # A list to store upcoming anniversary records
-        current_date = datetime.now().date()
-        threshold_date = current_date + timedelta(days=days_threshold)
-
-        for family_id, family in self.fam_map.items():
-            if family.marriageDate is not None and family.divorceDate is None: #Don't return anniversary dates for divorced couples
-                anvHasPassedInt = 1 if (family.marriageDate.month < current_date.month or (family.marriageDate.month == current_date.month and family.marriageDate.day < current_date.day)) else 0
-                #anvHasPassedInt is 1 if birthday has passed within the year, otherwise it's 0. Used to get the year that the individual's next birthday will be on
-                upcoming_anniversary: date
-                try:
-                    upcoming_anniversary = family.marriageDate.replace(year=current_date.year + anvHasPassedInt)
-                except ValueError: #If date exists yet a value error is still raised, then the anniversary is on a leap year, but no leap day on the corresponding year
-                    upcoming_anniversary = date(current_date.year + anvHasPassedInt, 2, 28)
-                if upcoming_anniversary >= current_date and upcoming_anniversary <= threshold_date: #If anniversary is upcoming, it should be after or equal to today's date, but before (or equal to) the threshold
-                    upcoming_anniversaries.append((family_id, upcoming_anniversary))
-
-        upcoming_anniversaries.sort(key=lambda x: x[1])
+    # Same as US38, but for the marriages of couples that are still together
+    def list_upcoming_anniversaries(self, days_threshold=30, start_date: date = None):
+        current_date = datetime.now().date() if start_date is None else start_date
+        upcoming_anniversaries = self.get_anniversary_index().upcoming(current_date, days_threshold)
         for (family_id, anv) in upcoming_anniversaries:
             self.upcomingAnniversaries.append(ReportDetail(family_id, anv))
         return upcoming_anniversaries
@@ -825,18 +483,28 @@ class Report():
     def getDateFromString(self, string: str) -> str:
         dateObj: date = None
         try:
-            dateObj = stringDateConversion(string)
+            dateObj = self.date_cache.convert(string)
         except GEDCOMReadException as e:
             self.errors.append(ReportDetail("Invalid Date", e.message))
         finally:
             return dateObj
 
+    #Bulk version of getDateFromString. Converts a whole list of date strings in one call, with None in place of any invalid dates
+    def getDatesFromStrings(self, strings: list[str]) -> list[date]:
+        messages: list[str] = []
+        dates: list[date] = self.date_cache.convertMany(strings, messages)
+        for message in messages:
+            self.errors.append(ReportDetail("Invalid Date", message))
+        return dates
+
 
     def printReport(self) -> None:
         print("[GEDCOM File Report]")
+        #Ages and marriages are read from the marital status table, instead of being worked out again for every table
+        maritalStatus = self.get_marital_status()
         indiTable = PrettyTable(Individual.createRowHeader())
         for indi in self.indi_map.values():
-            indiTable.add_row(indi.getRowData())
+            indiTable.add_row(indi.getRowData(maritalStatus.ages.get(indi.id, None)))
 
         famTable = PrettyTable(Family.createRowHeader())
         for fam in self.fam_map.values():
@@ -859,24 +527,13 @@ class Report():
 
         #Will print out all living married individuals
         livingMarriedTable = PrettyTable(["ID", "Name", "Family ID"])
-        for indi in self.indi_map.values():
-            if indi.deathDate == None:
-                present_family = self.check_married_status (indi)
-                if len(present_family) > 0:
-                    livingMarriedTable.add_row([indi.id, indi.name, present_family])
+        for indi, present_family in self.living_married:
+            livingMarriedTable.add_row([indi.id, indi.name, present_family])
 
         #Will print out all singles who are above 30
         singleAbove30Table = PrettyTable(["ID", "Name", "Age"])
-        for indi in self.indi_map.values():
-            try:
-                indiAge = indi.calculateAge()
-            except ValueError:
-                continue
-            else:
-                if indi.deathDate == None and indiAge > 30:
-                    single_status = self.check_single_status (indi)
-                    if single_status == True:
-                        singleAbove30Table.add_row([indi.id, indi.name, indiAge])
+        for indi, indiAge in self.living_singles:
+            singleAbove30Table.add_row([indi.id, indi.name, indiAge])
 
         #Will print out all of the upcoming anniversaries stored in the anniversary list
         anniversaryTable = PrettyTable(["Family", "Anniversary"])
@@ -933,6 +590,23 @@ class Report():
         print(recentDeathTable)
             
 
+#When a family ended. This is the divorce date if there is one, otherwise it's the death of whichever spouse died first (if both spouses have records)
+def effectiveDivorceDate(family: Family, husband: Individual, wife: Individual) -> date:
+    if family.divorceDate:
+        divorceDate = family.divorceDate
+    elif husband and wife and husband.deathDate and wife.deathDate and husband.deathDate > wife.deathDate:
+        divorceDate = wife.deathDate
+    elif husband and wife and husband.deathDate and wife.deathDate and wife.deathDate > husband.deathDate:
+        divorceDate = husband.deathDate
+    elif husband and wife and husband.deathDate and wife.deathDate == None:
+        divorceDate = husband.deathDate
+    elif husband and wife and wife.deathDate and husband.deathDate == None:
+        divorceDate = wife.deathDate
+    else:
+        divorceDate = None
+    return divorceDate
+
+
 #Contains all of the data regarding a certain detail to look out for during a report
 #NOTE: Used to store Errors and anomalies inherit from the same class
 class ReportDetail():
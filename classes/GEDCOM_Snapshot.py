@@ -0,0 +1,158 @@
+import hashlib
+import hmac
+import io
+import os
+import pickle
+from datetime import date
+from typing import Union
+
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Parser import parserVersion
+
+#Contains the snapshot cache: the records of a parsed file, along with everything the parse-time checks found (US01, US22, US42), saved as a binary file
+#in the user's cache folder (see snapshotFolder). Reading the snapshot back is much faster than parsing the file again
+#Snapshots are keyed by the SHA-256 hash of the file's contents, the parser version, and the options the file was read with, so a snapshot is only ever used
+#for exactly the same file read exactly the same way. A future date (US01) stops being an error once that day comes, so snapshots holding one expire then
+#Snapshots are pickles, which can run code when they're read. So every snapshot is signed (HMAC-SHA256) with a secret key kept in the cache folder,
+#and nothing in a snapshot is unpickled unless the signature matches. Only snapshots this program wrote for this user are ever read
+
+#Size of the key snapshots are signed with, and of the signature at the start of every snapshot
+keySize: int = 32
+signatureSize: int = hashlib.sha256().digest_size
+#Size of the pieces files are hashed in, so big files don't have to be read into memory all at once
+hashChunkSize: int = 1 << 20
+
+
+#Folder snapshots are kept in. GEDCOM_SNAPSHOT_DIR if it's set, otherwise a gedcom_parser folder in the user's cache folder
+def snapshotFolder() -> str:
+    folder: str = os.environ.get("GEDCOM_SNAPSHOT_DIR")
+    if(folder):
+        return folder
+    cacheFolder: str = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cacheFolder, "gedcom_parser")
+
+#Location of the snapshot of a file with the given hash, read with the given options
+def snapshotPath(folder: str, digest: str, lazy_dates: bool = False, compact: bool = False) -> str:
+    return os.path.join(folder, digest + ("-lazy" if lazy_dates else "") + ("-compact" if compact else "") + ".snapshot")
+
+#SHA-256 hash of a file's contents
+def fileHash(path: Union[str, os.PathLike]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while(chunk := file.read(hashChunkSize)):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+#Everything that has to match for a snapshot to be used
+def snapshotKey(digest: str, lazy_dates: bool, compact: bool) -> tuple:
+    return (parserVersion, digest, lazy_dates, compact)
+
+#Returns the key snapshots in the folder are signed with. If create is True, a new one is made if there isn't one yet (only readable by the user)
+#Returns None if there isn't a usable key
+def signingKey(folder: str, create: bool) -> bytes:
+    keyPath: str = os.path.join(folder, "snapshot.key")
+    try:
+        with open(keyPath, "rb") as file:
+            key: bytes = file.read()
+        if(len(key) == keySize):
+            return key
+    except OSError:
+        pass
+    if(not create):
+        return None
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    key = os.urandom(keySize)
+    fileNumber: int = os.open(keyPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fileNumber, "wb") as file:
+        file.write(key)
+    return key
+
+#Pickler that leaves the report's date cache out (records read with lazy dates point to it), so it doesn't get saved with every snapshot
+class SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, dateCache):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.dateCache = dateCache
+
+    def persistent_id(self, obj):
+        return "dateCache" if obj is self.dateCache else None
+
+#Unpickler that points records read with lazy dates to the date cache of the report they're loaded into
+class SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, dateCache):
+        super().__init__(file)
+        self.dateCache = dateCache
+
+    def persistent_load(self, pid):
+        if(pid != "dateCache"):
+            raise pickle.UnpicklingError(f"Unknown persistent ID ({pid})")
+        return self.dateCache
+
+#Earliest date in the records that's after the day the report was made, or None if there isn't one. With lazy dates, nothing has been checked yet (see Report.validate_dates)
+def firstFutureDate(report: Report, lazy_dates: bool) -> date:
+    if(lazy_dates):
+        return None
+    future: list[date] = [value for units in (report.indi_map.values(), report.fam_map.values()) for unit in units
+                          for value in (getattr(unit, field) for field in unit.dateFields.values()) if value is not None and value > report.run_date]
+    return min(future, default=None)
+
+
+#Saves the records and parse-time errors of a freshly read report. Returns False if the snapshot couldn't be written (ex. the folder is read-only)
+#The snapshot is the signature, followed by the key and expiry date, and then the records
+def save_snapshot(report: Report, digest: str, lazy_dates: bool = False, compact: bool = False, folder: str = None) -> bool:
+    folder = snapshotFolder() if folder is None else folder
+    header: dict = {"key": snapshotKey(digest, lazy_dates, compact), "expires": firstFutureDate(report, lazy_dates)}
+    contents: dict = {"indi_map": report.indi_map, "fam_map": report.fam_map, "errors": report.errors, "line_errors": report.line_errors,
+                      "duplicate_id_map": report.duplicate_id_map, "xrefs": report.xrefs}
+    path: str = snapshotPath(folder, digest, lazy_dates, compact)
+    tempPath: str = path + ".tmp"
+    try:
+        key: bytes = signingKey(folder, True)
+        stream = io.BytesIO()
+        pickle.dump(header, stream, pickle.HIGHEST_PROTOCOL)
+        SnapshotPickler(stream, report.date_cache).dump(contents)
+        payload: bytes = stream.getvalue()
+        with open(tempPath, "wb") as file:
+            file.write(hmac.digest(key, payload, "sha256"))
+            file.write(payload)
+        os.replace(tempPath, path) #Swapped in all at once, so a half written snapshot is never read
+    except OSError:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+#Fills an empty report in from the snapshot of a file with the given hash, if there's one that's signed and still valid. Returns whether it was used
+def load_snapshot(report: Report, digest: str, lazy_dates: bool = False, compact: bool = False, folder: str = None) -> bool:
+    folder = snapshotFolder() if folder is None else folder
+    key: bytes = signingKey(folder, False)
+    if(key is None):
+        return False
+    try:
+        with open(snapshotPath(folder, digest, lazy_dates, compact), "rb") as file:
+            data: bytes = file.read()
+    except OSError:
+        return False
+    payload: memoryview = memoryview(data)[signatureSize:]
+    if(len(data) < signatureSize or not hmac.compare_digest(data[:signatureSize], hmac.digest(key, payload, "sha256"))):
+        return False #Not written by this program (or damaged), so it isn't unpickled at all
+    try:
+        stream = io.BytesIO(payload)
+        header: dict = pickle.load(stream)
+        if(header["key"] != snapshotKey(digest, lazy_dates, compact)):
+            return False
+        if(header["expires"] is not None and header["expires"] <= report.run_date):
+            return False
+        contents: dict = SnapshotUnpickler(stream, report.date_cache).load()
+    except Exception: #Signed snapshots from an older version of the records that can't be read anymore are just ignored, and the file is parsed again
+        return False
+    report.indi_map = contents["indi_map"]
+    report.fam_map = contents["fam_map"]
+    report.errors.extend(contents["errors"])
+    report.line_errors.extend(contents["line_errors"])
+    report.duplicate_id_map = contents["duplicate_id_map"]
+    report.xrefs = contents["xrefs"]
+    report.invalidate_indexes()
+    return True
@@ -0,0 +1,182 @@
+from array import array
+from collections import deque
+from classes.GEDCOM_Interning import InternedGraph, noXref
+
+#Contains the traversal engine used for ancestor/descendant questions (US17, US19). Everything here works on the xref numbers of an InternedGraph
+#None of it is recursive, since deep pedigrees would go past Python's recursion limit, and every walk keeps track of who it's already visited, so ancestry loops
+#(someone ending up as their own ancestor, which can happen in corrupted data) can't make it go around forever
+
+class Traversal():
+    def __init__(self, graph: InternedGraph):
+        self.graph: InternedGraph = graph
+        size: int = len(graph.childIn)
+        #Edges going down (parent to child) and up (child to parent). A child's parents are the husband and wife of every family they're a child of,
+        #which is every family that lists them as a child (CHIL) along with the family they say they're a child of (FAMC), since links are often only written on one side
+        familyChildren: dict[int, dict[int, None]] = {fam: dict.fromkeys(graph.children[fam]) for fam in graph.families} #Dictionaries, so the order of the children is kept
+        for indi in graph.individuals:
+            fam: int = graph.family(graph.childIn[indi])
+            if(fam != noXref):
+                familyChildren[fam][indi] = None
+        self.childrenOf: list[tuple[int, ...]] = [()] * size
+        parentsOf: list[list[int]] = [[] for _ in range(size)] #Built up in lists, then frozen into tuples once every parent is in
+        for parent in range(size):
+            if(graph.parentIn[parent]):
+                children: dict[int, None] = {}
+                for fam in graph.parentIn[parent]:
+                    children.update(familyChildren[fam])
+                self.childrenOf[parent] = tuple(children)
+                for child in children:
+                    parentsOf[child].append(parent)
+        self.parentsOf: list[tuple[int, ...]] = [tuple(parents) for parents in parentsOf]
+
+        #Worked out the first time they're needed
+        self.components: list[list[int]] = None
+        self.levels: array = None
+
+    #Returns every descendant of the given number, mapped to how many generations down they are (1 for children, 2 for grandchildren, etc)
+    #If someone shows up at more than one depth, the closest one is used
+    def descendants(self, number: int) -> dict[int, int]:
+        return self._walk(number, self.childrenOf)
+
+    #Same as descendants(), but going up (1 for parents, 2 for grandparents, etc)
+    def ancestors(self, number: int) -> dict[int, int]:
+        return self._walk(number, self.parentsOf)
+
+    #Breadth first walk along the given edges. The starting number is only included if there's a loop back around to it
+    def _walk(self, number: int, edges: list[tuple[int, ...]]) -> dict[int, int]:
+        depths: dict[int, int] = {}
+        if(number == noXref):
+            return depths
+        queue: deque[tuple[int, int]] = deque([(number, 0)])
+        while(queue):
+            current, depth = queue.popleft()
+            for nextNumber in edges[current]:
+                if(nextNumber not in depths):
+                    depths[nextNumber] = depth + 1
+                    queue.append((nextNumber, depth + 1))
+        return depths
+
+    #Returns everyone exactly the given number of generations up (or down, if up is False), going through every path
+    #Unlike ancestors(), someone who's both a parent and a grandparent still counts as a grandparent
+    def generation(self, number: int, depth: int, up: bool = True) -> set[int]:
+        edges: list[tuple[int, ...]] = self.parentsOf if up else self.childrenOf
+        frontier: set[int] = {number} if number != noXref else set()
+        for _ in range(depth):
+            frontier = {nextNumber for current in frontier for nextNumber in edges[current]}
+            if(not frontier):
+                break
+        return frontier
+
+    #Returns True if the first number is an ancestor of the second (the second is a descendant of the first)
+    #Someone is only their own ancestor if they're part of an ancestry loop
+    #Instead of working out everyone's descendants (which grows with the square of the number of generations), this walks up from the second number,
+    #skipping anyone whose level is too low to have the first number above them (see _findLevels)
+    def isAncestor(self, ancestor: int, descendant: int) -> bool:
+        if(ancestor == noXref or descendant == noXref):
+            return False
+        if(self.levels is None):
+            self._findLevels()
+        if(ancestor == descendant):
+            return bool(self.inCycle[ancestor])
+        component: int = self.componentOf[ancestor]
+        if(component == noXref):
+            return False
+        if(component == self.componentOf[descendant]):
+            return True
+        level: int = self.levels[ancestor]
+        if(level >= self.levels[descendant]):
+            return False
+        stack: list[int] = [descendant]
+        seen: set[int] = {descendant}
+        while(stack):
+            current: int = stack.pop()
+            for parent in self.parentsOf[current]:
+                if(self.componentOf[parent] == component):
+                    return True
+                if(parent not in seen and self.levels[parent] > level):
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    #Returns every ancestry loop, as the list of individuals that are part of it (each of them is their own ancestor)
+    def findCycles(self) -> list[list[int]]:
+        cycles: list[list[int]] = []
+        for component in self._findComponents():
+            if(len(component) > 1 or component[0] in self.childrenOf[component[0]]):
+                cycles.append(sorted(component))
+        return cycles
+
+    #Splits everyone with children into strongly connected components (groups where everyone is an ancestor of everyone else)
+    #This is Tarjan's algorithm, done with a stack instead of recursion. Components come out children first, so they're in the right order for _findLevels
+    def _findComponents(self) -> list[list[int]]:
+        if(self.components is not None):
+            return self.components
+        index: dict[int, int] = {}
+        lowLink: dict[int, int] = {}
+        onStack: set[int] = set()
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter: int = 0
+        for root in range(len(self.childrenOf)):
+            if(root in index or not self.childrenOf[root]):
+                continue
+            work: list[tuple[int, int]] = [(root, 0)] #Pairs of (number, position of the next child to look at)
+            while(work):
+                number, position = work.pop()
+                if(position == 0):
+                    index[number] = counter
+                    lowLink[number] = counter
+                    counter += 1
+                    stack.append(number)
+                    onStack.add(number)
+                children: tuple[int, ...] = self.childrenOf[number]
+                recursed: bool = False
+                while(position < len(children)):
+                    child: int = children[position]
+                    position += 1
+                    if(child not in index):
+                        work.append((number, position))
+                        work.append((child, 0))
+                        recursed = True
+                        break
+                    elif(child in onStack):
+                        lowLink[number] = min(lowLink[number], index[child])
+                if(recursed):
+                    continue
+                if(lowLink[number] == index[number]):
+                    component: list[int] = []
+                    while(True):
+                        member: int = stack.pop()
+                        onStack.discard(member)
+                        component.append(member)
+                        if(member == number):
+                            break
+                    components.append(component)
+                if(work): #Pass the low link back up to the parent
+                    parent: int = work[-1][0]
+                    lowLink[parent] = min(lowLink[parent], lowLink[number])
+        self.components = components
+        return components
+
+    #Gives everyone a level, which is one more than the highest level of their parents (0 if they don't have any). Everyone in a loop shares a level
+    #An ancestor always has a lower level than their descendants (outside of loops), so anyone at or below an ancestor's level can't be one of their descendants
+    #Components are gone through parents first (the reverse of how they come out of _findComponents), so the parents' levels are always known already
+    def _findLevels(self) -> None:
+        size: int = len(self.childrenOf)
+        self.componentOf: array = array("l", [noXref]) * size
+        self.levels: array = array("l", [0]) * size
+        self.inCycle: bytearray = bytearray(size)
+        components: list[list[int]] = self._findComponents()
+        for position in range(len(components) - 1, -1, -1):
+            component: list[int] = components[position]
+            level: int = 0
+            for member in component:
+                self.componentOf[member] = position
+            for member in component:
+                for parent in self.parentsOf[member]:
+                    if(self.componentOf[parent] != position):
+                        level = max(level, self.levels[parent] + 1)
+            cyclic: bool = len(component) > 1 or component[0] in self.childrenOf[component[0]]
+            for member in component:
+                self.levels[member] = level
+                self.inCycle[member] = cyclic
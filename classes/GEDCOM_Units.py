@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
 from datetime import date
+from classes.GEDCOM_Names import splitName
 
+#Every unit uses __slots__ instead of a per-instance __dict__, since files can hold millions of them
 class GEDCOMUnit(ABC):
+    __slots__ = ("id", "rawDates")
+
+    #Maps date labels (BIRT, DEAT, MARR, DIV) to the name of the field they fill in. Filled in by each subclass
+    dateFields: dict[str, str] = {}
+
     def __init__(self, id: str):
         self.id = id
+        #Dates that have been read in, but not converted yet (only used when reading with lazy dates). List of (field name, raw date string, date cache) entries,
+        #in the order they were read. The cache is the one of the report the record belongs to (None for the shared default cache)
+        self.rawDates: list[tuple[str, str, object]] = None
 
     #Used for altering data based on a line (or the line split up into its respective fields)
     #NOTE: This is not used for dates, since those go onto two lines
@@ -25,11 +35,76 @@ class GEDCOMUnit(ABC):
     def getRowData(self) -> list[str]:
         pass
 
+    #Lazy version of setDate. Holds onto the raw date string instead of converting it, and leaves the field unset until it's first read (see __getattr__)
+    #The date is converted with the given cache (the report's date_cache), or the shared default cache if none is given
+    def setRawDate(self, raw: str, label: str, cache=None) -> None:
+        fieldName: str = self.dateFields.get(label)
+        if(fieldName is None):
+            raise GEDCOMReadException("No date field corresponding to label (" + label + ") for " + type(self).__name__)
+        if(self.rawDates is None):
+            self.rawDates = []
+        self.rawDates.append((fieldName, raw, cache))
+        try:
+            delattr(self, fieldName)
+        except AttributeError: #Already unset from an earlier raw date
+            pass
+
+    #Only called when an attribute isn't set. The only ones that can be unset are date fields holding a raw date, so those are converted when they're first read
+    #Invalid dates become None. The errors for them (US42) are only given by materializeDates()
+    def __getattr__(self, name: str):
+        if(name not in self.dateFields.values() or not self.rawDates):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        from classes.GEDCOM_Dates import defaultDateCache #Imported here, since GEDCOM_Dates imports this file
+        value: date = None
+        for (fieldName, raw, cache) in self.rawDates:
+            if(fieldName == name):
+                try:
+                    value = (defaultDateCache if cache is None else cache).convert(raw)
+                except GEDCOMReadException:
+                    value = None
+        setattr(self, name, value)
+        return value
+
+    #Only the fields that are set are pickled (ex. when records are sent between processes). Going through getattr, like the default does,
+    #would convert every raw date through __getattr__
+    def __getstate__(self):
+        fields: dict[str, object] = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                try:
+                    fields[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        return (None, fields)
+
+    #Makes the raw dates get converted with the given cache from now on (ex. when a record is moved into another report)
+    def useDateCache(self, cache) -> None:
+        if(self.rawDates):
+            self.rawDates = [(fieldName, raw, cache) for (fieldName, raw, _) in self.rawDates]
+
+    #Converts all of the raw dates using the given function, in the order they were read. The function should return None for invalid dates
+    #Fields that were already read (or set directly) are left alone, but their raw dates are still passed to the function so any errors can be given
+    def materializeDates(self, convert) -> None:
+        if(not self.rawDates):
+            return
+        converted: dict[str, date] = {}
+        for (fieldName, raw, _) in self.rawDates:
+            converted[fieldName] = convert(raw)
+        self.rawDates = None
+        for fieldName, value in converted.items():
+            try:
+                object.__getattribute__(self, fieldName)
+            except AttributeError:
+                setattr(self, fieldName, value)
+
 
 class Individual(GEDCOMUnit):
+    __slots__ = ("name", "sex", "birthDate", "deathDate", "childIn", "spouseIn", "nameParts")
+    dateFields: dict[str, str] = {"BIRT": "birthDate", "DEAT": "deathDate"}
+
     def __init__(self, id: str, name: str = None, sex: str = None, birthDate: date = None, deathDate: date = None, childIn: str = None, spouseIn: list[str] = None):
         super().__init__(id)
-        self.name = name
+        self.setName(name)
         self.sex = sex
         self.birthDate = birthDate
         self.deathDate = deathDate
@@ -41,7 +116,7 @@ class Individual(GEDCOMUnit):
             raise GEDCOMReadException("Not enough arguments for line")
         match(fields[1]):
             case "NAME":
-                self.name = fields[2]
+                self.setName(fields[2])
             case "SEX":
                 self.sex = fields[2]
             case "FAMC":
@@ -51,6 +126,23 @@ class Individual(GEDCOMUnit):
             case _:
                 raise GEDCOMReadException("Specified field (" + fields[2] + ") is invalid for an Individual")
             
+    #Sets the name, and splits it into the given name and surname right away (see splitName), so they don't have to be worked out over and over again
+    def setName(self, name: str) -> None:
+        self.name = name
+        #The name the parts came from is kept with them, so they can be worked out again if the name is changed directly
+        self.nameParts: tuple[str, str, str] = None if name is None else (name, *splitName(name))
+
+    #Returns the given name and surname (both None if there's no name)
+    def getNameParts(self) -> tuple[str, str]:
+        if(self.name is None):
+            return (None, None)
+        if(self.nameParts is None or self.nameParts[0] is not self.name):
+            self.nameParts = (self.name, *splitName(self.name))
+        return self.nameParts[1:]
+
+    givenName = property(lambda self: self.getNameParts()[0])
+    surname = property(lambda self: self.getNameParts()[1])
+
     def setDate(self, date: date, label: str) -> None:
         match(label):
             case "BIRT":
@@ -73,7 +165,8 @@ class Individual(GEDCOMUnit):
     def createRowHeader() -> list[str]:
         return ["ID", "Name", "Sex", "Birthday", "Age", "Alive", "Death", "Child", "Spouse"]
     
-    def getRowData(self) -> list[str]:
+    #The age is worked out if it isn't given
+    def getRowData(self, age: int = None) -> list[str]:
         rowData: list[str] = [self.id]
         #Making sure name exists
         if(self.name is None):
@@ -91,7 +184,7 @@ class Individual(GEDCOMUnit):
             rowData.append("NA") #Age
         else:
             rowData.append(str(self.birthDate.year) + "-" + str(self.birthDate.month) + "-" + str(self.birthDate.day))
-            rowData.append(self.calculateAge())
+            rowData.append(self.calculateAge() if age is None else age)
         #Checking to see if death date exists, and formatting it appropriately if it does
         if(self.deathDate is None):
             rowData.append("True") #Alive
@@ -105,12 +198,15 @@ class Individual(GEDCOMUnit):
         else:
             rowData.append(self.childIn)
         #Getting string data of all family IDs the user is a spouse in
-        rowData.append(str(self.spouseIn))
+        rowData.append(str(list(self.spouseIn)))
         return rowData
 
 
 
 class Family(GEDCOMUnit):
+    __slots__ = ("husbandId", "wifeId", "childIds", "marriageDate", "divorceDate")
+    dateFields: dict[str, str] = {"MARR": "marriageDate", "DIV": "divorceDate"}
+
     def __init__(self, id: str, husbandId: str = None, wifeId: str = None, childIds: list[str] = None, marriageDate: date = None, divorceDate: date = None):
         super().__init__(id)
         self.husbandId = husbandId
@@ -181,10 +277,43 @@ class Family(GEDCOMUnit):
                 wifeData: Individual = indiLookup.get(self.wifeId, None)
                 rowData.append("NA" if (wifeData is None or wifeData.name is None) else wifeData.name)
         #Getting string data of all child IDs
-        rowData.append(str(self.childIds))
+        rowData.append(str(list(self.childIds)))
         return rowData
     
 
+#Shared stand-in for an empty list of IDs, used by the compact units below
+noIds: tuple = ()
+
+
+#Compact versions of Individual and Family, for very large files. They have the same fields as the normal versions,
+#but people with no spousal families (and families with no children) share one empty tuple instead of each getting their own empty list
+#The list is only made once the first ID is read in, so spouseIn and childIds should be treated as read-only (assign a new list to change them)
+class CompactIndividual(Individual):
+    __slots__ = ()
+
+    def __init__(self, id: str, name: str = None, sex: str = None, birthDate: date = None, deathDate: date = None, childIn: str = None, spouseIn: list[str] = None):
+        super().__init__(id, name, sex, birthDate, deathDate, childIn, noIds if spouseIn is None else spouseIn)
+
+    def readDataFromFields(self, fields: list[str]) -> None:
+        if(len(fields) > 2 and fields[1] == "FAMS" and self.spouseIn is noIds):
+            self.spouseIn = [fields[2]]
+        else:
+            super().readDataFromFields(fields)
+
+
+class CompactFamily(Family):
+    __slots__ = ()
+
+    def __init__(self, id: str, husbandId: str = None, wifeId: str = None, childIds: list[str] = None, marriageDate: date = None, divorceDate: date = None):
+        super().__init__(id, husbandId, wifeId, noIds if childIds is None else childIds, marriageDate, divorceDate)
+
+    def readDataFromFields(self, fields: list[str]) -> None:
+        if(len(fields) > 2 and fields[1] == "CHIL" and self.childIds is noIds):
+            self.childIds = [fields[2]]
+        else:
+            super().readDataFromFields(fields)
+
+
 class GEDCOMReadException(Exception):
     def __init__(self, message="Error while reading GEDCOM file"):
         self.message = message
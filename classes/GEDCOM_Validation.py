@@ -0,0 +1,758 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import date
+from typing import Callable
+
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Interning import InternedGraph, noXref
+from classes.GEDCOM_Kinship import Kinship
+from classes import GEDCOM_Vectorized as Vectorized
+from classes.GEDCOM_Names import nameSkeleton
+
+#Contains the validation engine, which runs all of the checks (errors and anomalies) on a report
+#Instead of every check going through all of the records and looking up the same husbands, wives, and children again, every individual and every family is only
+#visited once. The people a family refers to are looked up when it's visited, and that context is handed to every check that looks at families
+#Each check writes into its own list, and the lists are added to the report in the same order the checks used to be run in, so the output doesn't change
+
+
+#Everything a check needs to know about a family, looked up once
+class FamilyContext():
+    __slots__ = ("fam", "husband", "wife", "children", "husbandNumber", "wifeNumber")
+
+    def __init__(self, report: Report, fam: Family):
+        indi_map = report.indi_map
+        self.fam: Family = fam
+        self.husband: Individual = indi_map.get(fam.husbandId, None)
+        self.wife: Individual = indi_map.get(fam.wifeId, None)
+        #Pairs of (ID, record), with None as the record for children that don't have one
+        self.children: list[tuple[str, Individual]] = [(childId, indi_map.get(childId, None)) for childId in fam.childIds]
+        #Xref numbers of the husband and wife, or noXref if they don't have a record
+        self.husbandNumber: int = report.xrefs.lookup(fam.husbandId) if self.husband else noXref
+        self.wifeNumber: int = report.xrefs.lookup(fam.wifeId) if self.wife else noXref
+
+
+#Same as FamilyContext, but for an individual
+class IndividualContext():
+    __slots__ = ("indi", "number")
+
+    def __init__(self, report: Report, indi: Individual):
+        self.indi: Individual = indi
+        self.number: int = report.xrefs.lookup(indi.id)
+
+
+#What each category of rule adds to the report. Listings fill in their own lists on the report (ex. upcomingBirthdays), so they don't have one
+categoryTargets: dict[str, str] = {"error": "errors", "anomaly": "anomalies", "listing": None}
+
+#A derived fact: data worked out from the whole report that more than one rule needs (ex. everyone's age)
+#Facts are built once, right before the first rule that needs them, and are kept in Report.facts until the last rule that needs them is done
+#requires lists the other facts a fact is built from. release is called when the fact is thrown away, for facts that are also cached on the report
+#local facts only need the records they're about (ex. a family and its spouses), so they can be built from just part of the report (see Validator.run)
+#connected facts need more than that, but nothing outside of the family tree (connected component) the records are in (ex. everyone's ancestors)
+class Fact():
+    def __init__(self, name: str, build: Callable[[Report], object], requires: tuple[str, ...] = (), release: Callable[[Report], None] = None, local: bool = False,
+                 connected: bool = False):
+        self.name: str = name
+        self.build: Callable[[Report], object] = build
+        self.requires: tuple[str, ...] = requires
+        self.release: Callable[[Report], None] = release
+        self.local: bool = local
+        self.connected: bool = local or connected
+
+#Every fact, by name
+factRegistry: dict[str, Fact] = {}
+
+def registerFact(fact: Fact) -> Fact:
+    if(fact.name in factRegistry):
+        raise ValueError(f"Fact {fact.name} is already registered")
+    for name in fact.requires:
+        if(name not in factRegistry):
+            raise ValueError(f"Unknown fact {name} needed by fact {fact.name}")
+    factRegistry[fact.name] = fact
+    return fact
+
+#Returns the given facts along with every fact they're built from, with every fact coming after the ones it needs
+def factOrder(names: tuple[str, ...]) -> list[str]:
+    order: dict[str, None] = {}
+    def visit(name: str) -> None:
+        if(name not in order):
+            for required in factRegistry[name].requires:
+                visit(required)
+            order[name] = None
+    for name in names:
+        visit(name)
+    return list(order)
+
+def clearCache(attribute: str) -> Callable[[Report], None]:
+    return lambda report: setattr(report, attribute, None)
+
+#The marital status table (see GEDCOM_MaritalStatus.py), made again on every run in case any dates have changed
+#It's left on the report after the checks are done, since the US30/US31 listings read from it too
+def maritalStatus(report: Report):
+    report.marital_status = None
+    return report.get_marital_status()
+
+#Effective end of every family (divorce, or the death of a spouse). Used by US08 and US11
+def effectiveEnds(report: Report) -> dict[str, date]:
+    return report.facts["maritalStatus"].effectiveEnds
+
+#Age of everyone with a birth date (at their death, or today if they're alive). Used by US07, US12, and US34
+def ages(report: Report) -> dict[str, int]:
+    return report.facts["maritalStatus"].ages
+
+registerFact(Fact("maritalStatus", maritalStatus, local=True))
+registerFact(Fact("effectiveEnd", effectiveEnds, ("maritalStatus",), local=True))
+registerFact(Fact("ages", ages, ("maritalStatus",), local=True))
+#The graph, traversal, and kinship engine are also cached on the report, so they have to be cleared from there too when they're thrown away
+#The kinship engine keeps everyone's ancestor sets, and the traversal keeps the parent/child edges
+registerFact(Fact("graph", Report.get_interned_graph, release=clearCache("interned_graph"), connected=True))
+registerFact(Fact("traversal", Report.get_traversal, ("graph",), clearCache("traversal"), connected=True))
+registerFact(Fact("kinship", Report.get_kinship, ("traversal",), clearCache("kinship"), connected=True))
+#Every date as arrays of day ordinals, for the vectorized checks. Only used if NumPy is installed
+registerFact(Fact("dateColumns", Vectorized.DateColumns))
+
+
+#A single check. Checks can look at individuals, families, or both (individuals are always gone through first), or need the whole report at once
+#Whatever the check finds is added to the errors or the anomalies of the report, depending on its category
+#requires lists the facts (see Fact) the check uses
+#vectorized is a version of the check that works on the whole report at once with NumPy (see GEDCOM_Vectorized.py). It only needs the dateColumns fact,
+#and has to find exactly the same things, in the same order
+#optional checks are only run when they're asked for by ID (see selectRules)
+class Rule():
+    def __init__(self, id: str, name: str, category: str, individual: Callable = None, family: Callable = None, whole: Callable = None, requires: tuple[str, ...] = (),
+                 vectorized: Callable = None, optional: bool = False):
+        if(category not in categoryTargets):
+            raise ValueError(f"Unknown category {category} for check {id}")
+        for fact in requires:
+            if(fact not in factRegistry):
+                raise ValueError(f"Unknown fact {fact} needed by check {id}")
+        self.id: str = id
+        self.name: str = name
+        self.category: str = category
+        self.target: str = categoryTargets[category]
+        self.requires: tuple[str, ...] = requires
+        self.individual: Callable[[Report, IndividualContext, list[ReportDetail]], None] = individual
+        self.family: Callable[[Report, FamilyContext, list[ReportDetail]], None] = family
+        self.whole: Callable[[Report, list[ReportDetail]], None] = whole
+        self.vectorized: Callable[[Report, list[ReportDetail]], None] = vectorized
+        self.optional: bool = optional
+
+
+#US26 - Corresponding Entries
+# Makes sure that families specified in individual records exist and match, same for individuals mentioned in family records
+def correspondingEntriesIndividual(report: Report, ctx: IndividualContext, out: list[ReportDetail]):
+    indi: Individual = ctx.indi
+    #Childhood family check
+    if(indi.childIn):
+        childhoodFamily: Family = report.fam_map.get(indi.childIn, None)
+        if(childhoodFamily is None):
+            out.append(ReportDetail("Correspondance Error", f"Family {indi.childIn} specified in individual {indi.id} is not present in the family records"))
+        elif(indi.id not in childhoodFamily.childIds):
+            out.append(ReportDetail("Correspondance Error", f"Family {indi.childIn} specified in individual {indi.id} does not have {indi.id} as a child"))
+    #Spousal families check
+    for famId in indi.spouseIn:
+        spousalFamily: Family = report.fam_map.get(famId, None)
+        if(spousalFamily is None):
+            out.append(ReportDetail("Correspondance Error", f"Family {famId} specified in individual {indi.id} is not present in the family records"))
+        elif(spousalFamily.husbandId != indi.id and spousalFamily.wifeId != indi.id):
+            out.append(ReportDetail("Correspondance Error", f"Family {famId} specified in individual {indi.id} does not have {indi.id} as a spouse"))
+
+def correspondingEntriesFamily(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    #Check husband
+    if(fam.husbandId):
+        if(ctx.husband is None):
+            out.append(ReportDetail("Correspondance Error", f"Husband {fam.husbandId} specified in family {fam.id} is not present in the individual records"))
+        elif(fam.id not in ctx.husband.spouseIn):
+            out.append(ReportDetail("Correspondance Error", f"Husband {fam.husbandId} specified in family {fam.id} does not have {fam.id} as a corresponding spousal family"))
+    #Check wife
+    if(fam.wifeId):
+        if(ctx.wife is None):
+            out.append(ReportDetail("Correspondance Error", f"Wife {fam.wifeId} specified in family {fam.id} is not present in the individual records"))
+        elif(fam.id not in ctx.wife.spouseIn):
+            out.append(ReportDetail("Correspondance Error", f"Wife {fam.wifeId} specified in family {fam.id} does not have {fam.id} as a corresponding spousal family"))
+    #Check children
+    for childId, child in ctx.children:
+        if(child is None):
+            out.append(ReportDetail("Correspondance Error", f"Child {childId} specified in family {fam.id} is not present in the individual records"))
+        elif(fam.id != child.childIn):
+            out.append(ReportDetail("Correspondance Error", f"Child {childId} specified in family {fam.id} does not have {fam.id} as their childhood family"))
+
+
+#US02 - Birth before Marriage
+# This is to check if birth occurred before marriage of an individual
+def birthBeforeMarriage(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    for spouse in (ctx.husband, ctx.wife):
+        if(spouse and spouse.birthDate and fam.marriageDate and spouse.birthDate > fam.marriageDate):
+            out.append(ReportDetail("Birth After Marriage", "Birth of " + spouse.id + " (" +  str(spouse.birthDate) + ") occurred after their marriage (" + str(fam.marriageDate) + ")"))
+
+
+#US03 - Birth before Death
+# This is to check if birth occurred before death of an individual
+def birthBeforeDeath(report: Report, ctx: IndividualContext, out: list[ReportDetail]):
+    indi: Individual = ctx.indi
+    if(indi.birthDate and indi.deathDate and indi.deathDate < indi.birthDate):
+        out.append(ReportDetail("Birth After Death", "Birth of " + indi.id + " (" + str(indi.birthDate) + ") occurs after their death (" + str(indi.deathDate) + ")" ))
+
+
+#US04 - Marriage before divorce
+#Marriage should occur before divorce of spouses, and divorce can only occur after marriage
+def marriageBeforeDivorce(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    if(fam.marriageDate and fam.divorceDate and fam.divorceDate < fam.marriageDate):
+        out.append(ReportDetail("Divorce Before Marriage", "Divorce of " + fam.id + " (" + str(fam.divorceDate) + ") occurs before their marriage (" + str(fam.marriageDate) + ")"))
+    elif(fam.divorceDate and not fam.marriageDate):
+        out.append(ReportDetail("Divorce Without Marriage", "Divorce of " + fam.id + " (" + str(fam.divorceDate) + ") occurs without a recorded marriage date."))
+
+
+#US05 - Marriage before death
+# Marriage should occur before death of either spouse
+def marriageBeforeDeath(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    family: Family = ctx.fam
+    for spouse in (ctx.husband, ctx.wife):
+        if(spouse and spouse.deathDate and family.marriageDate and spouse.deathDate < family.marriageDate):
+            out.append(ReportDetail("Marriage After Death", f"Marriage of {family.id} ({family.marriageDate}) occurs after the death of {spouse.name} ({spouse.deathDate})"))
+
+
+#US06 - Divorce before death
+# Divorce can only occur before death of both spouses
+def divorceBeforeDeath(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    if(fam.divorceDate):
+        husband: Individual = ctx.husband
+        wife: Individual = ctx.wife
+        if(husband and husband.deathDate and fam.divorceDate > husband.deathDate):
+            out.append(ReportDetail("Divorce After Death", f"Divorce for family {fam.id} ({fam.divorceDate}) occurs after the death of the husband ({husband.deathDate})"))
+        if(wife and wife.deathDate and fam.divorceDate > wife.deathDate):
+            out.append(ReportDetail("Divorce Afte Death", f"Divorce for family {fam.id} ({fam.divorceDate}) occurs after the death of the wife ({wife.deathDate})"))
+
+
+#US07 - Less than 150 years old
+# Make sure all individuals are less than 150 years old
+def maxAge(report: Report, ctx: IndividualContext, out: list[ReportDetail]):
+    indi: Individual = ctx.indi
+    if(indi.birthDate):
+        age: int = report.facts["ages"][indi.id]
+        if(age > 150):
+            out.append(ReportDetail("Over 150 Years Old", f"{indi.id} is over 150 years old ({age} years old)"))
+
+
+#US08 - Birth after marriage of parents
+def birthAfterParentsMarriage(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    divorceDate: date = report.facts["effectiveEnd"][fam.id]
+    for childId, child in ctx.children:
+        if(child and fam.marriageDate == None):
+            out.append(ReportDetail("Birth Without Marriage of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured without parents marriage"))
+        elif(child and child.birthDate and fam.marriageDate and fam.marriageDate > child.birthDate):
+            out.append(ReportDetail("Birth Before Marriage of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured before marriage of parents (" + str(fam.marriageDate) + ")"))
+        if(child and child.birthDate and divorceDate != None and (child.birthDate - divorceDate).days > 270):
+            out.append(ReportDetail("Birth After Divorce of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured after 9 months after divorce of parents (" + str(divorceDate) + ")"))
+
+
+#US09 - Birth before death of parents
+def birthBeforeDeathOfParents(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    wife: Individual = ctx.wife
+    if(wife and wife.deathDate != None):
+        for childId, child in ctx.children:
+            if(child and child.birthDate and child.birthDate > wife.deathDate):
+                out.append(ReportDetail("Birth After Death of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured after death of mother (" + str(wife.deathDate) + ")"))
+    husband: Individual = ctx.husband
+    if(husband and husband.deathDate != None):
+        for childId, child in ctx.children:
+            if(child and child.birthDate and (child.birthDate - husband.deathDate).days > 270):
+                out.append(ReportDetail("Birth After Death of Parents", "Birth of " + childId + " (" +  str(child.birthDate) + ") occured after 9 months after death of father (" + str(husband.deathDate) + ")"))
+
+
+#US10 - Marriage after 14
+# Marriage should be at least 14 years after birth of both spouses (husband and wife must be at least 14 years old)
+def marriageAfter14(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    for spouse in (ctx.husband, ctx.wife):
+        if(spouse and spouse.birthDate and fam.marriageDate):
+            if(fam.marriageDate.month < spouse.birthDate.month or fam.marriageDate.month == spouse.birthDate.month and fam.marriageDate.day < spouse.birthDate.day):
+                tooYoung: bool = fam.marriageDate.year - spouse.birthDate.year - 1 < 14 #Birthday hadn't happened yet in the year of the marriage
+            else:
+                tooYoung: bool = fam.marriageDate.year - spouse.birthDate.year < 14
+            if(tooYoung):
+                out.append(ReportDetail("Marriage Before 14", "Marriage for " + spouse.id + " (" +  str(fam.marriageDate) + ") occurs before 14 (" + str(spouse.birthDate) + ")"))
+
+
+#US11 - No bigamy
+# Marriage should not occur during marriage to another spouse
+# Each spouse's marriages are sorted by start date once, then swept through in order. A heap holds the end dates of the marriages that are still going,
+# so every marriage only gets compared against the ones it actually overlaps with
+# Marriages without a date are treated as starting at the earliest possible date, and marriages that haven't ended (see get_divorceDate) never end
+def bigamy(report: Report, out: list[ReportDetail]):
+    famOrder: dict[str, int] = {famId: position for position, famId in enumerate(report.fam_map)}
+    endDates: dict[str, date] = report.facts["effectiveEnd"]
+    found: list[tuple[tuple[int, int, int], str]] = []
+    for indi in report.indi_map.values():
+        if(len(indi.spouseIn) < 2):
+            continue
+        marriages: list[tuple[date, int, str]] = []
+        for famId in dict.fromkeys(indi.spouseIn): #Each family only once, even if it's listed more than once
+            family: Family = report.fam_map.get(famId, None)
+            if(family is None):
+                continue
+            marriages.append((family.marriageDate or date.min, famOrder[famId], famId))
+        marriages.sort()
+
+        ongoing: list[tuple[date, int, str]] = [] #Heap of (end date, family order, family ID)
+        for start, order, famId in marriages:
+            while(ongoing and ongoing[0][0] <= start):
+                heapq.heappop(ongoing)
+            for _, otherOrder, otherId in ongoing:
+                #Reported with the family that comes first in the file first, the same as the families are gone through everywhere else
+                first, second = (otherId, famId) if otherOrder < order else (famId, otherId)
+                role: int = 0 if report.fam_map[first].husbandId == indi.id else 1
+                found.append(((famOrder[first], role, famOrder[second]), "Spouse details are: " + indi.id + " and families are " + first + " and " + second))
+            end: date = endDates[famId]
+            heapq.heappush(ongoing, (date.max if end is None else end, order, famId))
+
+    for _, message in sorted(found):
+        out.append(ReportDetail("Bigamy", message))
+
+
+#US12 - Parents not too old
+# This checks all of the families and compares the ages of both parents to their children
+def parentChildAgeDifference(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    if(len(fam.childIds) == 0 or (fam.husbandId is None and fam.wifeId is None)): #Don't bother if there's no children or no parents
+        return
+    #Store the information and age for the kids so all that doesn't have to be worked out twice (once for father, once for mother)
+    kidsInfo: list[Individual] = [kid for _, kid in ctx.children if kid is not None and kid.birthDate is not None]
+    ageOf: dict[str, int] = report.facts["ages"]
+    kidsAges: list[int] = [ageOf[kid.id] for kid in kidsInfo]
+    for parent, label, limit, pronoun in ((ctx.husband, "Father", 80, "his"), (ctx.wife, "Mother", 60, "her")):
+        if(parent and parent.birthDate):
+            parentAge: int = ageOf[parent.id]
+            tooOldFor: list[str] = [kidsInfo[i].id for i in range(len(kidsInfo)) if parentAge - kidsAges[i] > limit]
+            if(len(tooOldFor) > 0):
+                out.append(ReportDetail("Parent Too Old", f"{label} in family {fam.id} is over {limit} years older than one or more of {pronoun} children {tooOldFor}"))
+
+
+#US14 - Multiple births <= 5
+# No more than five siblings born at the same time
+def multipleBirths(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    birth_dates: dict[date, int] = {} #Dictionary to store birth dates and their counts
+    for _, child in ctx.children:
+        if(child and child.birthDate):
+            birth_dates[child.birthDate] = birth_dates.get(child.birthDate, 0) + 1
+    for birthDate, count in birth_dates.items():
+        if(count > 5):
+            out.append(ReportDetail("Multiple Births", f"More than five siblings were born on {birthDate} in family {ctx.fam.id}."))
+
+
+#US15 - Fewer than 15 siblings
+def fewerThan15Siblings(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    #If there are 15 or more children, the family has too many siblings
+    if(len(ctx.fam.childIds) >= 15):
+        out.append(ReportDetail("Too Many Siblings", f"Family {ctx.fam.id} has 15 or more children"))
+
+
+#US16 - Male last names
+#Makes sure that all male members of a family share the same last name
+def familyMaleSurnames(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    male_surnames: list[str] = []
+    #Since the husband is always the first person checked, just put their last name in automatically
+    if(ctx.husband and ctx.husband.name):
+        male_surnames = [ctx.husband.surname]
+    for _, child in ctx.children:
+        if(child and child.name and child.sex == "M"):
+            child_surname: str = child.surname
+            if(child_surname not in male_surnames):
+                male_surnames.append(child_surname)
+    if(len(male_surnames) > 1):
+        out.append(ReportDetail("Differing Male Surnames", f"Males in family {ctx.fam.id} have several different surnames {male_surnames}"))
+
+
+#US17 - No Marriage to Descendants
+# Marriage between ancestors and descendants is not allowed
+def noMarriageToDescendants(report: Report, ctx: IndividualContext, out: list[ReportDetail]):
+    graph: InternedGraph = report.facts["graph"]
+    kinship: Kinship = report.facts["kinship"]
+    ind: int = ctx.number
+    for fam in graph.spouseIn[ind]:
+        if(graph.family(fam) == noXref):
+            continue
+        husband: int = graph.husband[fam]
+        wife: int = graph.wife[fam]
+        children: tuple[int, ...] = graph.children[fam]
+        #Check if either the husband or wife is a descendant of the current individual
+        if(kinship.isAncestor(ind, husband) or kinship.isAncestor(ind, wife)):
+            if(ind == husband and husband not in children): #Second check is to prevent incorrect recursive descendants
+                otherIndi: int = graph.individual(wife)
+            elif(wife not in children):
+                otherIndi: int = graph.individual(husband)
+            else:
+                continue
+            otherIndiId: str = "NA" if otherIndi == noXref else graph.xrefs.name(otherIndi)
+            out.append(ReportDetail("Marriage to Descendant", f"{graph.xrefs.name(ind)} is married to descendant, {otherIndiId}."))
+
+
+#Ancestry loops
+# Nobody can be their own ancestor. Ancestry loops can only come from corrupted data, and would make any walk through the family tree go on forever
+def ancestryCycles(report: Report, out: list[ReportDetail]):
+    for cycle in report.facts["traversal"].findCycles():
+        ids: list[str] = [report.xrefs.name(number) for number in cycle]
+        if(len(ids) == 1):
+            out.append(ReportDetail("Ancestry Cycle", f"{ids[0]} is their own ancestor"))
+        else:
+            out.append(ReportDetail("Ancestry Cycle", f"{', '.join(ids)} are their own ancestors"))
+
+
+#US18 - Siblings should not marry
+def noSiblingMarriage(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    if(report.facts["kinship"].areSiblings(ctx.husbandNumber, ctx.wifeNumber)):
+        out.append(ReportDetail("Sibling Marriage", f"Siblings {ctx.husband.id} and {ctx.wife.id} should not marry."))
+
+
+#US19 - First cousins should not marry
+def firstCousinsShouldNotMarry(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    #A shared ancestor exactly two generations up on both sides is a shared grandparent
+    if(report.facts["kinship"].areRelatedAs(ctx.husbandNumber, ctx.wifeNumber, 2, 2)):
+        out.append(ReportDetail("First Cousins Marrying", f"First cousins are getting married in Family {ctx.fam.id}"))
+
+
+#US21 - Correct Gender of Role
+def correctGenderForRoles(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    fam: Family = ctx.fam
+    if(fam.husbandId and ctx.husband and ctx.husband.sex != "M"):
+        out.append(ReportDetail("Incorrect Sex", f"Husband in family {fam.id} is female"))
+    if(fam.wifeId and ctx.wife and ctx.wife.sex != "F"):
+        out.append(ReportDetail("Incorrect Sex", f"Wife in family {fam.id} is male"))
+
+
+#US23 - Unique Name and Birth Date
+def uniqueNameAndBirthDate(report: Report, out: list[ReportDetail]):
+    #Individuals grouped by name and birth date
+    name_birth_dict: dict[tuple[str, date], list[str]] = {}
+    for indi in report.indi_map.values():
+        if(indi.name and indi.birthDate):
+            name_birth_dict.setdefault((indi.name, indi.birthDate), []).append(indi.id)
+
+    for (sharedName, sharedBDay), duplicates in name_birth_dict.items():
+        if(len(duplicates) > 1):
+            detailStr: str = ", ".join(duplicates) + f" share a name ({sharedName}) and birthday ({sharedBDay})"
+            out.append(ReportDetail("Duplicate Name and Birthdate", detailStr))
+
+
+#US23F - Near duplicate names and birth years
+# Finds people who are probably the same person, but whose names are spelled differently (ex. John /Smith/ and Jon /Smyth/, born in the same year)
+# Everyone is put into a block by the skeleton of their surname and their birth year, and then by their sex and the skeleton of their given name (see nameSkeleton)
+# Only people in the same block are ever compared, so it stays linear. Blocks where everyone has the same name and birthday are left to US23
+def nearDuplicateNames(report: Report, out: list[ReportDetail]):
+    blocks: dict[tuple[str, int, str, str], list[Individual]] = {}
+    for indi in report.indi_map.values():
+        if(indi.name and indi.birthDate):
+            key: tuple[str, int, str, str] = (nameSkeleton(indi.surname), indi.birthDate.year, indi.sex, nameSkeleton(indi.givenName))
+            blocks.setdefault(key, []).append(indi)
+
+    for (_, year, _, _), candidates in blocks.items():
+        if(len(candidates) > 1 and len({(indi.name, indi.birthDate) for indi in candidates}) > 1):
+            names: list[str] = list(dict.fromkeys(indi.name for indi in candidates))
+            detailStr: str = ", ".join(indi.id for indi in candidates) + f" may be the same person (similar names {' / '.join(names)}, born in {year})"
+            out.append(ReportDetail("Possible Duplicate", detailStr))
+
+
+#US25 - Unique first names in families
+def siblingSameName(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    sibling_name_dict: dict[str, list[str]] = {}
+    for _, sibling in ctx.children:
+        if(sibling and sibling.name):
+            sibling_name_dict.setdefault(sibling.givenName, []).append(sibling.id)
+    for name, ids in sibling_name_dict.items():
+        if(len(ids) > 1):
+            out.append(ReportDetail("Siblings Shared Name", f"Siblings {ids} share a first name ({name})"))
+
+
+#US34 - List couples married when the older spouse was more than twice as old as the younger spouse
+def largeAgeDifference(report: Report, ctx: FamilyContext, out: list[ReportDetail]):
+    husband: Individual = ctx.husband
+    wife: Individual = ctx.wife
+    if(husband and wife and husband.birthDate and wife.birthDate):
+        age_difference: int = abs((husband.birthDate - wife.birthDate).days) // 365
+        husbandAge: int = report.facts["ages"][husband.id]
+        wifeAge: int = report.facts["ages"][wife.id]
+        if(age_difference > min(husbandAge, wifeAge)):
+            if(husband.birthDate < wife.birthDate):
+                out.append(ReportDetail("Large Couple Age Gap", f"Husband {husband.id} (age {husbandAge}) is over twice as old as his wife {wife.id} (age {wifeAge})"))
+            else:
+                out.append(ReportDetail("Large Couple Age Gap", f"Wife {wife.id} (age {wifeAge}) is over twice as old as her husband {husband.id} (age {husbandAge})"))
+
+
+#Every rule, by ID, in the order they're run in (and the order their errors and anomalies end up in)
+ruleRegistry: dict[str, Rule] = {}
+
+#Adds a rule to the end of the registry
+def registerRule(rule: Rule) -> Rule:
+    if(rule.id in ruleRegistry):
+        raise ValueError(f"Check {rule.id} is already registered")
+    ruleRegistry[rule.id] = rule
+    return rule
+
+#Returns the registered rules with the given IDs (all of the ones that aren't optional if none are given), minus the skipped ones, in the order they're run in
+def selectRules(ruleIds: list[str] = None, skipIds: list[str] = None) -> list[Rule]:
+    for ruleId in (ruleIds or []) + (skipIds or []):
+        if(ruleId not in ruleRegistry):
+            raise ValueError(f"Unknown check {ruleId}")
+    return [rule for rule in ruleRegistry.values() if (not rule.optional if ruleIds is None else rule.id in ruleIds) and (skipIds is None or rule.id not in skipIds)]
+
+
+#Listings (US28 isn't really a listing, but it only changes the order the children are printed in)
+def sortChildrenByAge(report: Report, out: list[ReportDetail]):
+    report.sort_children_by_age()
+
+def livingMarried(report: Report, out: list[ReportDetail]):
+    report.list_living_married()
+
+def livingSingles(report: Report, out: list[ReportDetail]):
+    report.list_living_singles()
+
+def recentBirths(report: Report, out: list[ReportDetail]):
+    report.list_recent_births()
+
+def recentDeaths(report: Report, out: list[ReportDetail]):
+    report.list_recent_deaths()
+
+def upcomingBirthdays(report: Report, out: list[ReportDetail]):
+    report.list_upcoming_birthdays()
+
+def upcomingAnniversaries(report: Report, out: list[ReportDetail]):
+    report.list_upcoming_anniversaries()
+
+
+#US01 (future dates), US22 (unique IDs), and US42 (invalid dates) are checked while the file is being read, so they aren't rules
+for rule in [
+    Rule("US26", "Corresponding Entries", "error", individual=correspondingEntriesIndividual, family=correspondingEntriesFamily), #Felt like it fit more at the beginning despite being the 26th story
+    Rule("US02", "Birth Before Marriage", "error", family=birthBeforeMarriage, vectorized=Vectorized.birthBeforeMarriage),
+    Rule("US03", "Birth Before Death", "error", individual=birthBeforeDeath, vectorized=Vectorized.birthBeforeDeath),
+    Rule("US04", "Marriage Before Divorce", "error", family=marriageBeforeDivorce, vectorized=Vectorized.marriageBeforeDivorce),
+    Rule("US05", "Marriage Before Death", "error", family=marriageBeforeDeath, vectorized=Vectorized.marriageBeforeDeath),
+    Rule("US06", "Divorce Before Death", "error", family=divorceBeforeDeath, vectorized=Vectorized.divorceBeforeDeath),
+    Rule("US07", "Less Than 150 Years Old", "error", individual=maxAge, requires=("ages",), vectorized=Vectorized.maxAge),
+    Rule("US08", "Birth After Marriage of Parents", "anomaly", family=birthAfterParentsMarriage, requires=("effectiveEnd",)),
+    Rule("US09", "Birth Before Death of Parents", "error", family=birthBeforeDeathOfParents),
+    Rule("US10", "Marriage After 14", "error", family=marriageAfter14, vectorized=Vectorized.marriageAfter14),
+    Rule("US11", "No Bigamy", "error", whole=bigamy, requires=("effectiveEnd",)),
+    Rule("US12", "Parents Not Too Old", "anomaly", family=parentChildAgeDifference, requires=("ages",)),
+    Rule("US14", "Multiple Births <= 5", "anomaly", family=multipleBirths),
+    Rule("US15", "Fewer Than 15 Siblings", "anomaly", family=fewerThan15Siblings),
+    Rule("US16", "Male Last Names", "anomaly", family=familyMaleSurnames),
+    Rule("US17", "No Marriage to Descendants", "anomaly", individual=noMarriageToDescendants, requires=("graph", "kinship")),
+    Rule("CYCLES", "No Ancestry Loops", "error", whole=ancestryCycles, requires=("traversal",)),
+    Rule("US18", "Siblings Should Not Marry", "anomaly", family=noSiblingMarriage, requires=("kinship",)),
+    Rule("US19", "First Cousins Should Not Marry", "anomaly", family=firstCousinsShouldNotMarry, requires=("kinship",)),
+    Rule("US21", "Correct Gender for Role", "error", family=correctGenderForRoles),
+    Rule("US23", "Unique Name and Birth Date", "anomaly", whole=uniqueNameAndBirthDate),
+    Rule("US23F", "Near Duplicate Names and Birth Years", "anomaly", whole=nearDuplicateNames, optional=True),
+    Rule("US25", "Unique First Names in Families", "anomaly", family=siblingSameName),
+    Rule("US34", "Large Age Differences", "anomaly", family=largeAgeDifference, requires=("ages",)),
+    Rule("US28", "Order Siblings by Age", "listing", whole=sortChildrenByAge),
+    Rule("US30", "List Living Married", "listing", whole=livingMarried, requires=("maritalStatus",)),
+    Rule("US31", "List Living Single", "listing", whole=livingSingles, requires=("maritalStatus",)),
+    Rule("US35", "List Recent Births", "listing", whole=recentBirths),
+    Rule("US36", "List Recent Deaths", "listing", whole=recentDeaths),
+    Rule("US38", "List Upcoming Birthdays", "listing", whole=upcomingBirthdays),
+    Rule("US39", "List Upcoming Anniversaries", "listing", whole=upcomingAnniversaries),
+]:
+    registerRule(rule)
+
+
+#Returns True if the rule can be run on a shard of the families in another process
+#That's any registered rule that only looks at families, and only needs local facts (it can't need the rest of the report)
+def isShardable(rule: Rule) -> bool:
+    return (rule.family is not None and rule.individual is None and rule.whole is None and ruleRegistry.get(rule.id) is rule
+        and all(factRegistry[name].local for name in factOrder(rule.requires)))
+
+#Splits the families into shards of (individuals, families). Each shard has a run of families in their usual order, along with every individual they refer to
+def _makeShards(report: Report, numShards: int) -> list[tuple[list[Individual], list[Family]]]:
+    families: list[Family] = list(report.fam_map.values())
+    size: int = max(1, -(-len(families) // numShards))
+    shards: list[tuple[list[Individual], list[Family]]] = []
+    for start in range(0, len(families), size):
+        shardFamilies: list[Family] = families[start:start+size]
+        members: dict[str, Individual] = {}
+        for fam in shardFamilies:
+            for indiId in (fam.husbandId, fam.wifeId, *fam.childIds):
+                indi: Individual = report.indi_map.get(indiId, None)
+                if(indi is not None):
+                    members[indiId] = indi
+        shards.append((list(members.values()), shardFamilies))
+    return shards
+
+#Returns True if the rule can be run on a group of whole family trees (connected components) in another process, but not on a shard of the families
+#That's any registered rule that only looks at records, and only needs connected facts (ex. US17 and US19, which need everyone's ancestors)
+#Every record a record refers to is in the same tree, so rules that look at individuals (ex. US03, US26) can be run this way too
+#Rules that look at the whole report can't be, since they compare records from different trees (ex. US23, where two unrelated people share a name and birthday)
+def isComponentShardable(rule: Rule) -> bool:
+    return (rule.whole is None and ruleRegistry.get(rule.id) is rule and not isShardable(rule)
+        and all(factRegistry[name].connected for name in factOrder(rule.requires)))
+
+#Splits the records into the given groups of components (see Components.schedule). Each group has its individuals and families in their usual order,
+#along with the position of each of them in the whole report (individuals first, then families)
+def _makeComponentShards(report: Report, groups: list[list[int]]) -> list[tuple[list[Individual], list[Family], list[int]]]:
+    components = report.get_components()
+    groupOf: dict[int, int] = {label: group for group, labels in enumerate(groups) for label in labels}
+    shards: list[tuple[list[Individual], list[Family], list[int]]] = [([], [], []) for _ in groups]
+    for position, indi in enumerate(report.indi_map.values()):
+        individuals, _, positions = shards[groupOf[components.indiLabels[indi.id]]]
+        individuals.append(indi)
+        positions.append(position)
+    for position, fam in enumerate(report.fam_map.values(), len(report.indi_map)):
+        _, families, positions = shards[groupOf[components.famLabels[fam.id]]]
+        families.append(fam)
+        positions.append(position)
+    return shards
+
+#Runs in a worker process. Runs the rules with the given IDs on a report made up of just the shard, and gives back what each rule found
+def _runShard(ruleIds: list[str], individuals: list[Individual], families: list[Family]) -> list[list[ReportDetail]]:
+    shardReport: Report = Report()
+    shardReport.indi_map = {indi.id: indi for indi in individuals}
+    shardReport.fam_map = {fam.id: fam for fam in families}
+    rules: list[Rule] = [ruleRegistry[ruleId] for ruleId in ruleIds]
+    outputs: dict[Rule, list[ReportDetail]] = Validator(shardReport, rules=rules).runRecords(rules)
+    return [outputs[rule] for rule in rules]
+
+#Same as _runShard, but for a group of components. Everything found is paired with the position of the record it was found on, so it can be put back in order
+def _runComponentShard(ruleIds: list[str], individuals: list[Individual], families: list[Family], positions: list[int]) -> list[list[tuple[int, ReportDetail]]]:
+    shardReport: Report = Report()
+    shardReport.indi_map = {indi.id: indi for indi in individuals}
+    shardReport.fam_map = {fam.id: fam for fam in families}
+    rules: list[Rule] = [ruleRegistry[ruleId] for ruleId in ruleIds]
+    outputs: dict[Rule, list[tuple[int, ReportDetail]]] = Validator(shardReport, rules=rules).runRecords(rules, positions)
+    return [outputs[rule] for rule in rules]
+
+
+class Validator():
+    #Only the rules with the given IDs are run if any are given (minus any skipped ones), but they're still run in their usual order
+    #The vectorized versions of the rules are used whenever NumPy is installed, unless vectorized is False
+    def __init__(self, report: Report, ruleIds: list[str] = None, skipIds: list[str] = None, rules: list[Rule] = None, vectorized: bool = True):
+        self.report: Report = report
+        self.rules: list[Rule] = selectRules(ruleIds, skipIds) if rules is None else list(rules)
+        self.vectorized: bool = vectorized and Vectorized.numpy is not None
+
+    #Returns True if the vectorized version of the rule is used
+    def isVectorized(self, rule: Rule) -> bool:
+        return self.vectorized and rule.vectorized is not None
+
+    #Returns the facts the version of the rule that's used needs
+    def requirements(self, rule: Rule) -> tuple[str, ...]:
+        return ("dateColumns",) if self.isVectorized(rule) else rule.requires
+
+    #Runs every rule, going through each record once, then adds what they found to the report
+    #Facts needed by the rules that look at records are built before the records are gone through. Facts only needed by whole report rules are built right
+    #before the first of them runs. Every fact is thrown away as soon as the last rule that needs it (directly, or through another fact) is done
+    #If jobs is more than 1, the rules that only look at families (see isShardable) are run in that many processes, on shards of the families
+    #Each shard is a run of families in their usual order, so putting the shards' results back together in order gives the same results as one process
+    #The relationship rules and the rules that look at individuals (see isComponentShardable) are run on groups of whole family trees instead, if there's more than one tree. Trees can be spread
+    #all through the file, so what those rules find is sorted back into the order of the records it was found on
+    #Rules with a vectorized version (see GEDCOM_Vectorized.py) are run with it instead when NumPy is installed, in the same spot the rule would be run in
+    def run(self, jobs: int = 1) -> None:
+        report: Report = self.report
+        #Records from a columnar store are views into the whole store, so they can't be sent to other processes on their own
+        canShard: bool = jobs > 1 and isinstance(report.fam_map, dict)
+        sharded: list[Rule] = [rule for rule in self.rules if canShard and isShardable(rule) and not self.isVectorized(rule)]
+        componentSharded: list[Rule] = [rule for rule in self.rules if canShard and isComponentShardable(rule) and not self.isVectorized(rule)]
+        groups: list[list[int]] = report.get_components().schedule(jobs) if componentSharded else []
+        if(len(groups) < 2): #Everything is one tree, so there's nothing to split up
+            componentSharded = []
+        local: list[Rule] = [rule for rule in self.rules if rule not in sharded and rule not in componentSharded]
+
+        #Number of rules still to be finished that need each fact. Sharded rules build their own facts
+        self.users: dict[str, int] = {}
+        for rule in local:
+            for name in factOrder(self.requirements(rule)):
+                self.users[name] = self.users.get(name, 0) + 1
+
+        with (ProcessPoolExecutor(max_workers=jobs) if sharded or componentSharded else nullcontext()) as executor:
+            futures: list = []
+            componentFutures: list = []
+            if(componentSharded): #Submitted first, since the largest trees take the longest
+                componentIds: list[str] = [rule.id for rule in componentSharded]
+                componentFutures = [executor.submit(_runComponentShard, componentIds, *shard) for shard in _makeComponentShards(report, groups)]
+            if(sharded):
+                shardIds: list[str] = [rule.id for rule in sharded]
+                futures = [executor.submit(_runShard, shardIds, individuals, families) for individuals, families in _makeShards(report, jobs * 4)]
+            outputs: dict[Rule, list[ReportDetail]] = self.runRecords([rule for rule in local if (rule.individual or rule.family) and not self.isVectorized(rule)])
+            for future in futures:
+                for rule, out in zip(sharded, future.result()):
+                    outputs.setdefault(rule, []).extend(out)
+            tagged: dict[Rule, list[tuple[int, ReportDetail]]] = {rule: [] for rule in componentSharded}
+            for future in componentFutures:
+                for rule, out in zip(componentSharded, future.result()):
+                    tagged[rule].extend(out)
+            for rule, out in tagged.items():
+                #Sorted on the position alone, so everything found on the same record stays in the order it was found in
+                outputs[rule] = [detail for _, detail in sorted(out, key=lambda pair: pair[0])]
+
+        for rule in local:
+            if((rule.individual or rule.family) and not rule.whole and not self.isVectorized(rule)):
+                self.finishRule(rule)
+
+        for rule in self.rules:
+            out: list[ReportDetail] = outputs.setdefault(rule, [])
+            if(self.isVectorized(rule)):
+                self.buildFacts(self.requirements(rule))
+                rule.vectorized(report, out)
+                self.finishRule(rule)
+            elif(rule.whole):
+                self.buildFacts(rule.requires)
+                rule.whole(report, out)
+                self.finishRule(rule)
+            if(rule.target):
+                getattr(report, rule.target).extend(out)
+
+    #Goes through every individual, then every family, once for all of the given rules. Gives back what each rule found
+    #If positions are given (one for every individual, then one for every family), everything found is paired with the position of the record it was found on
+    def runRecords(self, rules: list[Rule], positions: list[int] = None) -> dict[Rule, list[ReportDetail]]:
+        report: Report = self.report
+        outputs: dict[Rule, list[ReportDetail]] = {rule: [] for rule in rules}
+        self.buildFacts([name for rule in rules for name in rule.requires])
+
+        individualRules: list[tuple[Callable, list[ReportDetail]]] = [(rule.individual, outputs[rule]) for rule in rules if rule.individual]
+        if(individualRules):
+            for index, indi in enumerate(report.indi_map.values()):
+                ctx: IndividualContext = IndividualContext(report, indi)
+                if(positions is None):
+                    for check, out in individualRules:
+                        check(report, ctx, out)
+                else:
+                    self.runTagged(individualRules, ctx, positions[index])
+
+        familyRules: list[tuple[Callable, list[ReportDetail]]] = [(rule.family, outputs[rule]) for rule in rules if rule.family]
+        if(familyRules):
+            for index, fam in enumerate(report.fam_map.values(), len(report.indi_map)):
+                ctx: FamilyContext = FamilyContext(report, fam)
+                if(positions is None):
+                    for check, out in familyRules:
+                        check(report, ctx, out)
+                else:
+                    self.runTagged(familyRules, ctx, positions[index])
+        return outputs
+
+    #Runs the checks on one record, pairing everything they find with the record's position
+    def runTagged(self, checks: list[tuple[Callable, list[tuple[int, ReportDetail]]]], ctx, position: int) -> None:
+        for check, out in checks:
+            found: list[ReportDetail] = []
+            check(self.report, ctx, found)
+            out.extend((position, detail) for detail in found)
+
+    #Builds any of the given facts (and the facts they need) that haven't been built yet
+    def buildFacts(self, names: list[str]) -> None:
+        for name in factOrder(names):
+            if(name not in self.report.facts):
+                self.report.facts[name] = factRegistry[name].build(self.report)
+
+    #Throws away any facts that the rule was the last user of
+    def finishRule(self, rule: Rule) -> None:
+        for name in factOrder(self.requirements(rule)):
+            self.users[name] -= 1
+            if(self.users[name] == 0):
+                del self.users[name]
+                self.report.facts.pop(name, None)
+                if(factRegistry[name].release):
+                    factRegistry[name].release(self.report)
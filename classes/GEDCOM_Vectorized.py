@@ -0,0 +1,193 @@
+from datetime import date
+
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Columnar import ColumnarIndividualMap, ColumnarFamilyMap, IndividualView, FamilyView, dateToDay, missingDay, noRow
+
+#Contains the vectorized versions of the date checks (US02, US03, US04, US05, US06, US07, US10), which need NumPy
+#Every date is gathered into arrays of day ordinals once (see DateColumns), and each check is worked out for every record at once as a mask
+#ReportDetails are only made for the records that fail, using the same records and messages as the normal versions, so the results are exactly the same
+#NumPy is optional. If it isn't installed, numpy is None and the validation engine uses the normal versions of the checks
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#Ordinal of 1970-01-01, where NumPy's datetime64 starts counting from
+epochDay: int = date(1970, 1, 1).toordinal()
+
+
+#Dates of every record as arrays of day ordinals (missingDay when there's no date), along with the rows of every family's husband and wife
+#Columns are indexed by row. Rows that don't have a record (references to missing records in a columnar store) are left out of indiRows and famRows,
+#which list the rows of the actual records in the order the checks go through them in
+class DateColumns():
+    def __init__(self, report: Report):
+        indi_map = report.indi_map
+        fam_map = report.fam_map
+        if(isinstance(indi_map, ColumnarIndividualMap) and isinstance(fam_map, ColumnarFamilyMap)):
+            #The store already has the dates as ordinals, so they can be copied over without touching any records
+            store = indi_map.store
+            self.individual = lambda row: IndividualView(store, row)
+            self.family = lambda row: FamilyView(store, row)
+            indiExists = numpy.frombuffer(store.indiExists, dtype=numpy.uint8).astype(bool)
+            self.indiRows = numpy.array(store.indiOrder, dtype=numpy.int64)
+            self.famRows = numpy.array(store.famOrder, dtype=numpy.int64)
+            self.birthDays = numpy.array(store.birthDays, dtype=numpy.int64)
+            self.deathDays = numpy.array(store.deathDays, dtype=numpy.int64)
+            self.marriageDays = numpy.array(store.marriageDays, dtype=numpy.int64)
+            self.divorceDays = numpy.array(store.divorceDays, dtype=numpy.int64)
+            #Husbands and wives without a record are treated the same as missing ones
+            husbandRows = numpy.array(store.husbandRows, dtype=numpy.int64)
+            wifeRows = numpy.array(store.wifeRows, dtype=numpy.int64)
+            self.husbandRows = numpy.where(DateColumns.spouseValues(indiExists, husbandRows, False), husbandRows, noRow)
+            self.wifeRows = numpy.where(DateColumns.spouseValues(indiExists, wifeRows, False), wifeRows, noRow)
+        else:
+            individuals: list = list(indi_map.values())
+            families: list = list(fam_map.values())
+            self.individual = individuals.__getitem__
+            self.family = families.__getitem__
+            self.indiRows = numpy.arange(len(individuals))
+            self.famRows = numpy.arange(len(families))
+            self.birthDays = numpy.fromiter((dateToDay(indi.birthDate) for indi in individuals), dtype=numpy.int64, count=len(individuals))
+            self.deathDays = numpy.fromiter((dateToDay(indi.deathDate) for indi in individuals), dtype=numpy.int64, count=len(individuals))
+            self.marriageDays = numpy.fromiter((dateToDay(fam.marriageDate) for fam in families), dtype=numpy.int64, count=len(families))
+            self.divorceDays = numpy.fromiter((dateToDay(fam.divorceDate) for fam in families), dtype=numpy.int64, count=len(families))
+            rows: dict[str, int] = {id: row for row, id in enumerate(indi_map)}
+            self.husbandRows = numpy.fromiter((rows.get(fam.husbandId, noRow) for fam in families), dtype=numpy.int64, count=len(families))
+            self.wifeRows = numpy.fromiter((rows.get(fam.wifeId, noRow) for fam in families), dtype=numpy.int64, count=len(families))
+
+    #Returns the values of a column for the given individual rows, with the given missing value for rows that are noRow
+    @staticmethod
+    def spouseValues(column, spouseRows, missing):
+        if(len(column) == 0):
+            return numpy.full(len(spouseRows), missing, dtype=column.dtype)
+        return numpy.where(spouseRows != noRow, column[spouseRows], missing)
+
+    #Returns the dates of the given individual rows, with missingDay for rows that are noRow
+    @staticmethod
+    def spouseDays(days, spouseRows):
+        return DateColumns.spouseValues(days, spouseRows, missingDay)
+
+
+#Returns the years and month/day numbers (month * 100 + day, so they can be compared) of the given day ordinals. Missing days give nonsense values
+def yearsAndMonthDays(days) -> tuple:
+    stamps = (days - epochDay).astype("datetime64[D]")
+    months = stamps.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]").astype(numpy.int64) + 1970
+    monthDays = (months.astype(numpy.int64) % 12 + 1) * 100 + (stamps - months).astype(numpy.int64) + 1
+    return years, monthDays
+
+#Number of full years from the first days to the second days (same as Individual.calculateAge)
+def fullYears(fromDays, toDays):
+    fromYears, fromMonthDays = yearsAndMonthDays(fromDays)
+    toYears, toMonthDays = yearsAndMonthDays(toDays)
+    return toYears - fromYears - (fromMonthDays > toMonthDays)
+
+#Returns the (family row, spouse) pairs where the husband (spouse 0) or wife (spouse 1) failed, in the order the normal checks find them in
+def failedSpouses(columns: DateColumns, husbandFailed, wifeFailed) -> list[tuple[int, int]]:
+    failed = numpy.stack([husbandFailed, wifeFailed], axis=1)[columns.famRows]
+    return [(int(columns.famRows[position]), spouse) for position, spouse in numpy.argwhere(failed)]
+
+#Returns the husband (spouse 0) or wife (spouse 1) record of a family row
+def spouseRecord(columns: DateColumns, famRow: int, spouse: int):
+    return columns.individual(int((columns.husbandRows if spouse == 0 else columns.wifeRows)[famRow]))
+
+
+#US02 - Birth before Marriage
+def birthBeforeMarriage(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    marriageDays = columns.marriageDays
+    failed: list = []
+    for spouseRows in (columns.husbandRows, columns.wifeRows):
+        birthDays = DateColumns.spouseDays(columns.birthDays, spouseRows)
+        failed.append((birthDays != missingDay) & (marriageDays != missingDay) & (birthDays > marriageDays))
+    for famRow, spouse in failedSpouses(columns, *failed):
+        fam = columns.family(famRow)
+        spouseIndi = spouseRecord(columns, famRow, spouse)
+        out.append(ReportDetail("Birth After Marriage", "Birth of " + spouseIndi.id + " (" +  str(spouseIndi.birthDate) + ") occurred after their marriage (" + str(fam.marriageDate) + ")"))
+
+
+#US03 - Birth before Death
+def birthBeforeDeath(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    birthDays = columns.birthDays[columns.indiRows]
+    deathDays = columns.deathDays[columns.indiRows]
+    for row in columns.indiRows[(birthDays != missingDay) & (deathDays != missingDay) & (deathDays < birthDays)]:
+        indi = columns.individual(int(row))
+        out.append(ReportDetail("Birth After Death", "Birth of " + indi.id + " (" + str(indi.birthDate) + ") occurs after their death (" + str(indi.deathDate) + ")" ))
+
+
+#US04 - Marriage before divorce
+def marriageBeforeDivorce(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    marriageDays = columns.marriageDays[columns.famRows]
+    divorceDays = columns.divorceDays[columns.famRows]
+    divorced = divorceDays != missingDay
+    beforeMarriage = divorced & (marriageDays != missingDay) & (divorceDays < marriageDays)
+    withoutMarriage = divorced & (marriageDays == missingDay)
+    for row in columns.famRows[beforeMarriage | withoutMarriage]:
+        fam = columns.family(int(row))
+        if(fam.marriageDate):
+            out.append(ReportDetail("Divorce Before Marriage", "Divorce of " + fam.id + " (" + str(fam.divorceDate) + ") occurs before their marriage (" + str(fam.marriageDate) + ")"))
+        else:
+            out.append(ReportDetail("Divorce Without Marriage", "Divorce of " + fam.id + " (" + str(fam.divorceDate) + ") occurs without a recorded marriage date."))
+
+
+#US05 - Marriage before death
+def marriageBeforeDeath(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    marriageDays = columns.marriageDays
+    failed: list = []
+    for spouseRows in (columns.husbandRows, columns.wifeRows):
+        deathDays = DateColumns.spouseDays(columns.deathDays, spouseRows)
+        failed.append((deathDays != missingDay) & (marriageDays != missingDay) & (deathDays < marriageDays))
+    for famRow, spouse in failedSpouses(columns, *failed):
+        family = columns.family(famRow)
+        spouseIndi = spouseRecord(columns, famRow, spouse)
+        out.append(ReportDetail("Marriage After Death", f"Marriage of {family.id} ({family.marriageDate}) occurs after the death of {spouseIndi.name} ({spouseIndi.deathDate})"))
+
+
+#US06 - Divorce before death
+def divorceBeforeDeath(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    divorceDays = columns.divorceDays
+    failed: list = []
+    for spouseRows in (columns.husbandRows, columns.wifeRows):
+        deathDays = DateColumns.spouseDays(columns.deathDays, spouseRows)
+        failed.append((divorceDays != missingDay) & (deathDays != missingDay) & (divorceDays > deathDays))
+    for famRow, spouse in failedSpouses(columns, *failed):
+        fam = columns.family(famRow)
+        if(spouse == 0):
+            husband = spouseRecord(columns, famRow, spouse)
+            out.append(ReportDetail("Divorce After Death", f"Divorce for family {fam.id} ({fam.divorceDate}) occurs after the death of the husband ({husband.deathDate})"))
+        else:
+            wife = spouseRecord(columns, famRow, spouse)
+            out.append(ReportDetail("Divorce Afte Death", f"Divorce for family {fam.id} ({fam.divorceDate}) occurs after the death of the wife ({wife.deathDate})"))
+
+
+#US07 - Less than 150 years old
+# Ages are worked out up to the death date, or today for anyone still alive
+def maxAge(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    birthDays = columns.birthDays[columns.indiRows]
+    deathDays = columns.deathDays[columns.indiRows]
+    born = birthDays != missingDay
+    endDays = numpy.where(deathDays != missingDay, deathDays, date.today().toordinal())
+    ages = fullYears(numpy.where(born, birthDays, endDays), endDays)
+    for position in numpy.flatnonzero(born & (ages > 150)):
+        indi = columns.individual(int(columns.indiRows[position]))
+        out.append(ReportDetail("Over 150 Years Old", f"{indi.id} is over 150 years old ({int(ages[position])} years old)"))
+
+
+#US10 - Marriage after 14
+def marriageAfter14(report: Report, out: list[ReportDetail]):
+    columns: DateColumns = report.facts["dateColumns"]
+    marriageDays = columns.marriageDays
+    failed: list = []
+    for spouseRows in (columns.husbandRows, columns.wifeRows):
+        birthDays = DateColumns.spouseDays(columns.birthDays, spouseRows)
+        dated = (birthDays != missingDay) & (marriageDays != missingDay)
+        failed.append(dated & (fullYears(numpy.where(dated, birthDays, marriageDays), marriageDays) < 14))
+    for famRow, spouse in failedSpouses(columns, *failed):
+        fam = columns.family(famRow)
+        spouseIndi = spouseRecord(columns, famRow, spouse)
+        out.append(ReportDetail("Marriage Before 14", "Marriage for " + spouseIndi.id + " (" +  str(fam.marriageDate) + ") occurs before 14 (" + str(spouseIndi.birthDate) + ")"))
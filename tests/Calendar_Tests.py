@@ -0,0 +1,84 @@
+import random
+import unittest
+from datetime import date, timedelta
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Calendar import DayOfYearIndex, EventIndex
+
+#Finds the upcoming dates by going through every entry, the way US38 and US39 used to
+def upcomingByScan(entries: list[tuple[str, date]], start: date, days: int) -> list[tuple[str, date]]:
+    found: list[tuple[str, date]] = []
+    for id, value in entries:
+        if(value is None):
+            continue
+        year: int = start.year + (1 if (value.month, value.day) < (start.month, start.day) else 0)
+        try:
+            occurrence: date = value.replace(year=year)
+        except ValueError:
+            occurrence: date = date(year, 2, 28)
+        if(start <= occurrence <= start + timedelta(days=days)):
+            found.append((id, occurrence))
+    found.sort(key=lambda entry: entry[1])
+    return found
+
+class Calendar_Tests(unittest.TestCase):
+    def test_same_as_scan(self):
+        generator: random.Random = random.Random(3)
+        entries: list[tuple[str, date]] = [(f"I{i}", None if i % 7 == 0 else date(1900, 1, 1) + timedelta(days=generator.randrange(40000))) for i in range(500)]
+        entries += [("L1", date(1996, 2, 29)), ("L2", date(1990, 2, 28)), ("L3", date(2000, 2, 29)), ("L4", date(1991, 3, 1))]
+        index: DayOfYearIndex = DayOfYearIndex(entries)
+        for start in [date(2023, 1, 1), date(2023, 2, 27), date(2024, 2, 28), date(2023, 12, 20), date(2024, 12, 31), date(2025, 6, 15)]:
+            for days in [0, 1, 5, 30, 60, 364, 365, 800]:
+                self.assertEqual(index.upcoming(start, days), upcomingByScan(entries, start, days), (start, days))
+
+
+    def test_wraps_past_end_of_year(self):
+        index: DayOfYearIndex = DayOfYearIndex([("A", date(1950, 1, 3)), ("B", date(1960, 12, 30)), ("C", date(1970, 6, 1))])
+        self.assertEqual(index.upcoming(date(2023, 12, 28), 10), [("B", date(2023, 12, 30)), ("A", date(2024, 1, 3))])
+
+
+    def test_leap_days(self):
+        index: DayOfYearIndex = DayOfYearIndex([("Leap", date(2000, 2, 29)), ("Before", date(2001, 2, 28))])
+        #The leap day birthday falls on the 28th, alongside the one that's actually on the 28th, but the order of the records is kept
+        self.assertEqual(index.upcoming(date(2023, 2, 1), 30), [("Leap", date(2023, 2, 28)), ("Before", date(2023, 2, 28))])
+        self.assertEqual(index.upcoming(date(2024, 2, 1), 30), [("Before", date(2024, 2, 28)), ("Leap", date(2024, 2, 29))])
+
+
+    def test_report_windows(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", None, None, date(1980, 5, 10), None, None, ["F1"]))
+        testReport.addToReport(Individual("I2", None, None, date(1985, 5, 20), None, None, ["F1"]))
+        testReport.addToReport(Individual("I3", None, None, date(1985, 5, 20), date(2000, 1, 1), None, ["F2"]))
+        testReport.addToReport(Family("F1", "I1", "I2", [], date(2005, 5, 15), None))
+        testReport.addToReport(Family("F2", "I3", "I2", [], date(1999, 5, 16), None))
+        self.assertEqual(testReport.list_upcoming_birthdays(10, date(2023, 5, 10)), [("I1", date(2023, 5, 10)), ("I2", date(2023, 5, 20)), ("I3", date(2023, 5, 20))])
+        self.assertEqual(testReport.list_upcoming_birthdays(5, date(2023, 5, 11)), [])
+        self.assertEqual(testReport.list_upcoming_anniversaries(30, date(2023, 5, 1)), [("F1", date(2023, 5, 15))]) #F2 ended with the death of I3
+        #Adding a record rebuilds the indexes
+        testReport.addToReport(Individual("I4", None, None, date(1990, 5, 12), None, None, []))
+        self.assertEqual(testReport.list_upcoming_birthdays(5, date(2023, 5, 11)), [("I4", date(2023, 5, 12))])
+
+
+    def test_event_ranges(self):
+        generator: random.Random = random.Random(5)
+        individuals: list[Individual] = [Individual(f"I{i}", None, None, date(1900, 1, 1) + timedelta(days=generator.randrange(3000)), None if i % 3 else date(1910, 1, 1) + timedelta(days=generator.randrange(3000)), None, []) for i in range(300)]
+        index: EventIndex = EventIndex([(indi.id, indi) for indi in individuals], [])
+        start: date = date(1904, 3, 1)
+        end: date = date(1906, 7, 31)
+        expected: list[tuple[str, date]] = sorted([(indi.id, indi.birthDate) for indi in individuals if start <= indi.birthDate <= end], key=lambda event: event[1])
+        self.assertEqual(list(index.between("birth", start, end)), expected)
+        self.assertEqual(len(list(index.between("death"))), index.count("death"))
+        self.assertEqual(index.count("death"), 100)
+        self.assertEqual(list(index.between("birth", end=date(1800, 1, 1))), [])
+
+
+    def test_merged_events(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", None, None, date(1980, 5, 10), date(2020, 1, 1), None, ["F1"]))
+        testReport.addToReport(Individual("I2", None, None, date(1982, 1, 1), None, None, ["F1"]))
+        testReport.addToReport(Family("F1", "I1", "I2", [], date(2005, 5, 15), date(2010, 1, 1)))
+        index: EventIndex = testReport.get_event_index()
+        self.assertEqual(list(index.events()), [("birth", "I1", date(1980, 5, 10)), ("birth", "I2", date(1982, 1, 1)), ("marriage", "F1", date(2005, 5, 15)),
+                                                ("divorce", "F1", date(2010, 1, 1)), ("death", "I1", date(2020, 1, 1))])
+        self.assertEqual(list(index.events(date(2000, 1, 1), kinds=["death", "marriage"])), [("marriage", "F1", date(2005, 5, 15)), ("death", "I1", date(2020, 1, 1))])
+        self.assertEqual(list(index.inLastDays("death", 10, date(2020, 1, 5))), [("I1", date(2020, 1, 1))])
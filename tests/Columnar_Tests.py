@@ -0,0 +1,95 @@
+import unittest
+import io
+from datetime import date
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Parser import load_report
+from classes.GEDCOM_Columnar import ColumnarStore, ColumnarReport, missingDay, noRow
+
+#Runs the same checks as GEDCOM_Reader.py
+def runChecks(report: Report) -> None:
+    report.check_corresponding_entries()
+    report.birth_before_marriage()
+    report.birth_before_death()
+    report.marriage_before_divorce()
+    report.marriage_before_death()
+    report.divorce_before_death()
+    report.check_max_age()
+    report.check_birth_after_parents_marriage()
+    report.check_birth_before_death_parents()
+    report.marriage_after_14()
+    report.check_bigamy()
+    report.check_parent_child_age_difference()
+    report.check_multiple_births()
+    report.fewer_than_15_siblings()
+    report.check_family_male_surnames()
+    report.no_marriage_to_descendants()
+    report.no_sibling_marriage()
+    report.first_cousins_should_not_marry()
+    report.check_correct_gender_for_roles()
+    report.check_unique_name_and_birth_date()
+    report.check_sibling_same_name()
+    report.sort_children_by_age()
+    report.list_couples_with_large_age_difference()
+
+class Columnar_Tests(unittest.TestCase):
+    def test_columns(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "John /Doe/", "M", date(1950, 1, 1), None, None, ["F1"]))
+        testReport.addToReport(Individual("I2", "Jane /Doe/", "F", None, date(2000, 1, 1), None, ["F1", "F9"]))
+        testReport.addToReport(Family("F1", "I1", "I2", ["I3"], date(1975, 6, 1)))
+        store: ColumnarStore = ColumnarStore.fromReport(testReport)
+        self.assertEqual(store.indiIds, ["I1", "I2", "I3"])
+        self.assertEqual(store.famIds, ["F1", "F9"])
+        self.assertEqual(list(store.indiExists), [1, 1, 0]) #I3 is only referenced as a child
+        self.assertEqual(list(store.famExists), [1, 0])
+        self.assertEqual(store.birthDays[0], date(1950, 1, 1).toordinal())
+        self.assertEqual(store.birthDays[1], missingDay)
+        self.assertEqual(list(store.getSpouseRows(1)), [0, 1])
+        self.assertEqual(list(store.getChildRows(0)), [2])
+        self.assertEqual(store.childInRows[0], noRow)
+
+
+    def test_adapter_maps(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "John /Doe/", "M", date(1950, 1, 1), None, None, ["F1"]))
+        testReport.addToReport(Family("F1", "I1", None, ["I3"]))
+        columnarReport: Report = ColumnarStore.fromReport(testReport).asReport()
+        self.assertEqual(list(columnarReport.indi_map.keys()), ["I1"])
+        self.assertIsNone(columnarReport.indi_map.get("I3"))
+        self.assertEqual(columnarReport.indi_map["I1"].getRowData(), testReport.indi_map["I1"].getRowData())
+        self.assertEqual(columnarReport.fam_map["F1"].getRowData(columnarReport.indi_map), testReport.fam_map["F1"].getRowData(testReport.indi_map))
+
+
+    def test_checks_match_on_acceptance_file(self):
+        normalReport: Report = load_report("Acceptance_File.txt")
+        columnarReport: Report = ColumnarStore.fromReport(normalReport).asReport()
+        runChecks(normalReport)
+        runChecks(columnarReport)
+        self.assertEqual(columnarReport.errors, normalReport.errors[-len(columnarReport.errors):])
+        self.assertEqual(columnarReport.anomalies, normalReport.anomalies)
+        self.assertEqual([fam.childIds for fam in columnarReport.fam_map.values()], [fam.childIds for fam in normalReport.fam_map.values()])
+
+
+    def test_load_straight_into_columns(self):
+        #F1 comes before the people in it, and I1 is used twice
+        data: str = "\n".join(["0 F1 FAM", "1 HUSB I1", "1 WIFE I2", "1 CHIL I3", "1 MARR", "2 DATE 1 JUN 1975",
+                               "0 I2 INDI", "1 NAME Jane /Doe/", "1 SEX F", "1 FAMS F1",
+                               "0 I1 INDI", "1 NAME John /Doe/", "1 SEX M", "1 BIRT", "2 DATE 1 JAN 1950", "1 FAMS F1",
+                               "0 I1 INDI", "1 NAME Copy /Doe/"]) + "\n"
+        normalReport: Report = load_report(io.StringIO(data))
+        columnarReport: Report = load_report(io.StringIO(data), columnar=True)
+        self.assertIsInstance(columnarReport, ColumnarReport)
+        self.assertEqual(columnarReport.errors, normalReport.errors)
+        self.assertEqual(list(columnarReport.indi_map.keys()), ["I2", "I1", "I1 (1)"]) #Record order, not the order the rows were made in
+        self.assertEqual(columnarReport.store.indiIds, ["I1", "I2", "I3", "I1 (1)"])
+        for id, indi in normalReport.indi_map.items():
+            self.assertEqual(columnarReport.indi_map[id].getRowData(), indi.getRowData())
+        self.assertEqual(columnarReport.fam_map["F1"].getRowData(columnarReport.indi_map), normalReport.fam_map["F1"].getRowData(normalReport.indi_map))
+
+        #Records can still be added afterwards
+        columnarReport.addToReport(Individual("I3", "Sam /Doe/", "M", None, None, "F1", ["F2"]))
+        self.assertEqual(columnarReport.indi_map["I3"].spouseIn, ["F2"])
+        self.assertEqual(columnarReport.indi_map["I2"].spouseIn, ["F1"])
+        with self.assertRaises(ValueError):
+            load_report(io.StringIO(data), columnar=True, lazy_dates=True)
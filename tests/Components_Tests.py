@@ -0,0 +1,77 @@
+import unittest
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Components import Components, UnionFind
+
+#Makes a report with the given number of separate trees, each one a couple (H and W) with two children (C and D) who married each other (sibling marriage)
+#The records of the trees are mixed together, the same way they would be in a file that was added to over time
+def makeForest(trees: int) -> Report:
+    testReport: Report = Report()
+    for tree in range(trees):
+        testReport.addToReport(Individual(f"H{tree}", f"Husband /Tree{tree}/", "M", None, None, None, [f"F{tree}"]))
+    for tree in range(trees):
+        testReport.addToReport(Individual(f"W{tree}", f"Wife /Tree{tree}/", "F", None, None, None, [f"F{tree}"]))
+        testReport.addToReport(Individual(f"C{tree}", f"Son /Tree{tree}/", "M", None, None, f"F{tree}", [f"G{tree}"]))
+        testReport.addToReport(Individual(f"D{tree}", f"Daughter /Tree{tree}/", "F", None, None, f"F{tree}", [f"G{tree}"]))
+    for tree in range(trees):
+        testReport.addToReport(Family(f"F{tree}", f"H{tree}", f"W{tree}", [f"C{tree}", f"D{tree}"]))
+    for tree in range(trees):
+        testReport.addToReport(Family(f"G{tree}", f"C{tree}", f"D{tree}", []))
+    return testReport
+
+class Components_Tests(unittest.TestCase):
+    def test_union_find(self):
+        sets: UnionFind = UnionFind(5)
+        sets.union(0, 1)
+        sets.union(3, 4)
+        sets.union(1, 4)
+        self.assertEqual(sets.find(0), sets.find(3))
+        self.assertNotEqual(sets.find(0), sets.find(2))
+
+
+    def test_labels(self):
+        components: Components = makeForest(3).get_components()
+        self.assertEqual(len(components), 3)
+        self.assertEqual(components.componentOf("H0"), components.componentOf("G0"))
+        self.assertNotEqual(components.componentOf("H0"), components.componentOf("H1"))
+        self.assertEqual(components.individuals[components.componentOf("W2")], ["H2", "W2", "C2", "D2"])
+        self.assertEqual(components.sizes(), [6, 6, 6])
+        self.assertIsNone(components.componentOf("I99"))
+
+
+    def test_one_sided_references(self):
+        #The individual says they're in the family, but the family doesn't list them back. They're still in the same tree
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", None, "M", None, None, "F1", []))
+        testReport.addToReport(Individual("I2", None, "M", None, None, None, []))
+        testReport.addToReport(Family("F1", None, None, ["I9"]))
+        components: Components = testReport.get_components()
+        self.assertEqual(components.componentOf("I1"), components.componentOf("F1"))
+        self.assertEqual(components.sizes(), [2, 1])
+
+
+    def test_sub_report(self):
+        testReport: Report = makeForest(3)
+        components: Components = testReport.get_components()
+        subReport: Report = components.subReport([components.componentOf("H1")])
+        self.assertEqual(list(subReport.indi_map), ["H1", "W1", "C1", "D1"])
+        self.assertEqual(list(subReport.fam_map), ["F1", "G1"])
+        subReport.run_checks(["US18"])
+        self.assertEqual(len(subReport.anomalies), 1)
+        self.assertEqual(testReport.anomalies, [])
+
+
+    def test_schedule(self):
+        testReport: Report = makeForest(2)
+        testReport.addToReport(Individual("I1", None, "M", None, None, None, []))
+        components: Components = testReport.get_components()
+        self.assertEqual(components.schedule(2), [[0, 2], [1]])
+        self.assertEqual(components.schedule(1), [[0, 1, 2]])
+        self.assertEqual(len(components.schedule(10)), 3)
+
+
+    def test_cleared_with_indexes(self):
+        testReport: Report = makeForest(2)
+        self.assertEqual(len(testReport.get_components()), 2)
+        testReport.addToReport(Individual("I1", None, "M", None, None, None, []))
+        self.assertEqual(len(testReport.get_components()), 3)
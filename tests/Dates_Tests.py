@@ -0,0 +1,107 @@
+import unittest
+import io
+from datetime import date
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Dates import DateCache
+from classes.GEDCOM_Parser import load_report
+
+lazyFile: str = """0 I1 INDI
+1 NAME John /Doe/
+1 BIRT
+2 DATE 1 JAN 2099
+0 F1 FAM
+1 HUSB I1
+1 MARR
+2 DATE 30 FEB 2001
+"""
+
+class Dates_Tests(unittest.TestCase):
+    def test_cache_hits_and_misses(self):
+        cache: DateCache = DateCache()
+        self.assertEqual(cache.convert("28 NOV 2001"), date(2001, 11, 28))
+        self.assertEqual(cache.convert("28 NOV 2001"), date(2001, 11, 28))
+        self.assertEqual(cache.convert("1 JAN 1900"), date(1900, 1, 1))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+    def test_cache_eviction(self):
+        cache: DateCache = DateCache(2)
+        cache.convert("1 JAN 2000")
+        cache.convert("2 JAN 2000")
+        cache.convert("1 JAN 2000") #Makes 2 JAN the least recently used
+        cache.convert("3 JAN 2000")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertNotIn("2 JAN 2000", cache.entries)
+        self.assertIn("1 JAN 2000", cache.entries)
+
+
+    def test_cached_invalid_date_still_reported(self):
+        testReport: Report = Report(DateCache())
+        self.assertIsNone(testReport.getDateFromString("30 FEB 2001"))
+        self.assertIsNone(testReport.getDateFromString("30 FEB 2001"))
+        invalidDetail: ReportDetail = ReportDetail("Invalid Date", "30 FEB 2001 is not a valid date (the day is probably too large for the current month)")
+        self.assertEqual(testReport.errors, [invalidDetail, invalidDetail])
+        self.assertEqual(testReport.date_cache.hits, 1)
+
+
+    def test_bulk_conversion(self):
+        testReport: Report = Report(DateCache())
+        dates: list[date] = testReport.getDatesFromStrings(["1 JAN 2000", "28 BADMONTH 2001", "1 JAN 2000", "5 MAY 1990"])
+        self.assertEqual(dates, [date(2000, 1, 1), None, date(2000, 1, 1), date(1990, 5, 5)])
+        self.assertEqual(testReport.errors, [ReportDetail("Invalid Date", "<month> of date (BADMONTH) is not a valid month string")])
+        self.assertEqual(testReport.date_cache.misses, 3)
+
+
+    def test_lazy_dates_convert_on_first_read(self):
+        indi: Individual = Individual("I1")
+        indi.setRawDate("28 NOV 2001", "BIRT")
+        with self.assertRaises(AttributeError): #Field should be unset until it's read
+            object.__getattribute__(indi, "birthDate")
+        self.assertEqual(indi.birthDate, date(2001, 11, 28))
+        self.assertIsNone(indi.deathDate)
+
+
+    def test_lazy_invalid_date_reads_as_none(self):
+        fam: Family = Family("F1")
+        fam.setRawDate("30 FEB 2001", "MARR")
+        self.assertIsNone(fam.marriageDate)
+
+
+    def test_validate_dates_gives_errors(self):
+        testReport: Report = load_report(io.StringIO(lazyFile), lazy_dates=True)
+        self.assertEqual(testReport.errors, [])
+        self.assertIsNone(testReport.fam_map["F1"].marriageDate) #Reading an invalid date shouldn't give the error by itself
+        testReport.validate_dates()
+        self.assertEqual(testReport.errors, [ReportDetail("Future Date", "Date that has yet to happen (2099-01-01) has been detected"), ReportDetail("Invalid Date", "30 FEB 2001 is not a valid date (the day is probably too large for the current month)")])
+        self.assertEqual(testReport.indi_map["I1"].birthDate, date(2099, 1, 1))
+        testReport.validate_dates() #Dates should only be validated once
+        self.assertEqual(len(testReport.errors), 2)
+
+
+    def test_lazy_matches_normal_read(self):
+        lazyReport: Report = load_report(io.StringIO(lazyFile), lazy_dates=True)
+        normalReport: Report = load_report(io.StringIO(lazyFile))
+        self.assertEqual(lazyReport.indi_map["I1"].birthDate, normalReport.indi_map["I1"].birthDate)
+        self.assertEqual(lazyReport.indi_map["I1"].deathDate, normalReport.indi_map["I1"].deathDate)
+        self.assertEqual(lazyReport.fam_map["F1"].marriageDate, normalReport.fam_map["F1"].marriageDate)
+
+
+    def test_run_checks_validates_lazy_dates(self):
+        testReport: Report = load_report(io.StringIO(lazyFile), lazy_dates=True)
+        testReport.run_checks(["US02"])
+        self.assertEqual([error.detailType for error in testReport.errors], ["Future Date", "Invalid Date"])
+        self.assertFalse(testReport.has_unvalidated_dates())
+
+
+    def test_lazy_dates_use_report_cache(self):
+        cache: DateCache = DateCache()
+        testReport: Report = load_report(io.StringIO(lazyFile), Report(cache), lazy_dates=True)
+        self.assertEqual(testReport.indi_map["I1"].birthDate, date(2099, 1, 1))
+        self.assertEqual(cache.misses, 1)
+        self.assertIn("1 JAN 2099", cache.entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
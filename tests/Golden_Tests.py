@@ -0,0 +1,73 @@
+import unittest
+import json
+import os
+from datetime import date
+from unittest import mock
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Parser import load_report
+from classes.GEDCOM_Validation import Validator
+from classes.GEDCOM_Columnar import ColumnarReport
+from classes import GEDCOM_Units, GEDCOM_Vectorized
+
+#Errors and anomalies for the sample files, as given by the original checks (before the validation engine), in the order they gave them
+#Ages depend on the day the checks are run, so they were captured on goldenDate, and the checks are run as if it's still that day
+repoFolder: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+with open(os.path.join(repoFolder, "tests", "Golden_Outputs.json"), encoding="utf-8") as goldenFile:
+    goldenOutputs: dict[str, dict[str, list[list[str]]]] = json.load(goldenFile)
+goldenDate: date = date(2026, 10, 18)
+
+class GoldenDate(date):
+    @classmethod
+    def today(cls):
+        return cls(goldenDate.year, goldenDate.month, goldenDate.day)
+
+
+class Golden_Tests(unittest.TestCase):
+    def setUp(self):
+        for module in (GEDCOM_Units, GEDCOM_Vectorized):
+            patcher = mock.patch.object(module, "date", GoldenDate)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    #Reads the sample file and runs every check on it, giving back the errors and anomalies as (type, message) lists
+    def check(self, fileName: str, jobs: int = 1, vectorized: bool = True, **options) -> dict[str, list[list[str]]]:
+        report: Report = ColumnarReport() if options.get("columnar") else Report()
+        report.run_date = goldenDate
+        load_report(os.path.join(repoFolder, fileName), report, **options)
+        Validator(report, vectorized=vectorized).run(jobs)
+        return {"errors": [error.getRowData() for error in report.errors], "anomalies": [anomaly.getRowData() for anomaly in report.anomalies]}
+
+
+    def test_same_as_original_checks(self):
+        for fileName, expected in goldenOutputs.items():
+            with self.subTest(fileName):
+                self.assertEqual(self.check(fileName), expected)
+
+
+    def test_scalar_checks(self):
+        for fileName, expected in goldenOutputs.items():
+            with self.subTest(fileName):
+                self.assertEqual(self.check(fileName, vectorized=False), expected)
+
+
+    def test_parallel_checks(self):
+        for fileName, expected in goldenOutputs.items():
+            with self.subTest(fileName):
+                self.assertEqual(self.check(fileName, jobs=2), expected)
+
+
+    def test_compact_mmap_read(self):
+        for fileName, expected in goldenOutputs.items():
+            with self.subTest(fileName):
+                self.assertEqual(self.check(fileName, use_mmap=True, compact=True), expected)
+
+
+
+    def test_columnar_read(self):
+        for fileName, expected in goldenOutputs.items():
+            with self.subTest(fileName):
+                self.assertEqual(self.check(fileName, columnar=True), expected)
+                self.assertEqual(self.check(fileName, jobs=2, columnar=True), expected)
+
+if __name__ == '__main__':
+    unittest.main()
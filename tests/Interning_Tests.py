@@ -0,0 +1,41 @@
+import unittest
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Interning import XrefInterner, InternedGraph, noXref
+
+class Interning_Tests(unittest.TestCase):
+    def test_interner(self):
+        xrefs: XrefInterner = XrefInterner()
+        self.assertEqual(xrefs.intern("I1"), 0)
+        self.assertEqual(xrefs.intern("F1"), 1)
+        self.assertEqual(xrefs.intern("I1"), 0)
+        self.assertEqual(xrefs.intern(None), noXref)
+        self.assertEqual(xrefs.lookup("I2"), noXref)
+        self.assertEqual(xrefs.name(1), "F1")
+        self.assertEqual(len(xrefs), 2)
+
+
+    def test_ids_interned_when_added(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("a"))
+        testReport.addToReport(Individual("a")) #Duplicate gets renamed, and the new name is interned
+        self.assertEqual(testReport.xrefs.ids, ["a", "a (1)"])
+
+
+    def test_graph(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", None, "M", None, None, None, ["F1"]))
+        testReport.addToReport(Individual("I2", None, "F", None, None, "F0", ["F1"]))
+        testReport.addToReport(Family("F1", "I1", "I2", ["I3"]))
+        graph: InternedGraph = testReport.get_interned_graph()
+        xrefs: XrefInterner = testReport.xrefs
+        f1: int = xrefs.lookup("F1")
+        self.assertEqual(graph.husband[f1], xrefs.lookup("I1"))
+        self.assertEqual(graph.children[f1], (xrefs.lookup("I3"),))
+        self.assertEqual(graph.individual(xrefs.lookup("I3")), noXref) #Only referenced, no record
+        self.assertEqual(graph.family(xrefs.lookup("F0")), noXref)
+        self.assertEqual(graph.spouseIn[xrefs.lookup("I2")], (f1,))
+        self.assertEqual(graph.individuals, [xrefs.lookup("I1"), xrefs.lookup("I2")])
+        self.assertIs(testReport.get_interned_graph(), graph)
+        testReport.addToReport(Individual("I3"))
+        self.assertIsNot(testReport.get_interned_graph(), graph)
@@ -0,0 +1,97 @@
+import unittest
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Kinship import Kinship, Relationship
+
+#Makes a family tree where G1 and G2 have the children A1 and B1. Each of those has a line of descendants (A2, A3, ... and B2, B3, ...)
+#Every child is in a family of their own with an unknown spouse, so they can have children
+def makeTree(aLength: int, bLength: int) -> Report:
+    testReport: Report = Report()
+    testReport.addToReport(Individual("G1", None, "M", None, None, None, ["FG"]))
+    testReport.addToReport(Individual("G2", None, "F", None, None, None, ["FG"]))
+    testReport.addToReport(Family("FG", "G1", "G2", ["A1", "B1"]))
+    for line, length in [("A", aLength), ("B", bLength)]:
+        for i in range(1, length + 1):
+            parentFam: str = "FG" if i == 1 else f"F{line}{i-1}"
+            testReport.addToReport(Individual(f"{line}{i}", None, "M", None, None, parentFam, [f"F{line}{i}"]))
+            testReport.addToReport(Family(f"F{line}{i}", f"{line}{i}", None, [f"{line}{i+1}"] if i < length else []))
+    return testReport
+
+class Kinship_Tests(unittest.TestCase):
+    def test_describe(self):
+        testReport: Report = makeTree(4, 3)
+        self.assertEqual(testReport.describe_relationship("A1", "B1"), "sibling")
+        self.assertEqual(testReport.describe_relationship("A2", "B2"), "first cousin")
+        self.assertEqual(testReport.describe_relationship("A3", "B2"), "first cousin once removed")
+        self.assertEqual(testReport.describe_relationship("A4", "B3"), "second cousin once removed")
+        self.assertEqual(testReport.describe_relationship("A2", "B1"), "aunt/uncle")
+        self.assertEqual(testReport.describe_relationship("B1", "A3"), "great-niece/nephew")
+        self.assertEqual(testReport.describe_relationship("A1", "A4"), "great-grandchild")
+        self.assertEqual(testReport.describe_relationship("A3", "G1"), "great-grandparent")
+        self.assertEqual(testReport.describe_relationship("A3", "A3"), "self")
+
+
+    def test_agrees_with_checks(self):
+        #The fathers say they're children of F1 (FAMC), but F1 doesn't list them (no CHIL)
+        testReport: Report = Report()
+        testReport.addToReport(Individual("G1", "Grandpa /Doe/", "M", None, None, None, ["F1"]))
+        testReport.addToReport(Individual("G2", "Grandma /Doe/", "F", None, None, None, ["F1"]))
+        testReport.addToReport(Individual("I1", "John /Doe/", "M", None, None, "F1", ["F2", "F5"]))
+        testReport.addToReport(Individual("I2", "Jane /Doe/", "F", None, None, "F1", ["F3", "F5"]))
+        testReport.addToReport(Individual("I3", "Alice /Doe/", "F", None, None, "F2", ["F4"]))
+        testReport.addToReport(Individual("I4", "Tyler /Doe/", "M", None, None, "F3", ["F4"]))
+        testReport.addToReport(Family("F1", "G1", "G2", [], None, None))
+        testReport.addToReport(Family("F2", "I1", None, ["I3"], None, None))
+        testReport.addToReport(Family("F3", None, "I2", ["I4"], None, None))
+        testReport.addToReport(Family("F4", "I4", "I3", [], None, None))
+        testReport.addToReport(Family("F5", "I1", "I2", [], None, None))
+        testReport.run_checks(["US18", "US19"])
+        self.assertEqual([anomaly.detailType for anomaly in testReport.anomalies], ["Sibling Marriage", "First Cousins Marrying"])
+        self.assertEqual(testReport.describe_relationship("I1", "I2"), "sibling")
+        self.assertEqual(testReport.describe_relationship("I3", "I4"), "first cousin")
+        self.assertEqual(testReport.describe_relationship("I1", "I4"), "niece/nephew")
+
+
+    def test_relationship(self):
+        testReport: Report = makeTree(3, 3)
+        kinship: Kinship = testReport.get_kinship()
+        number = testReport.xrefs.lookup
+        self.assertEqual(kinship.relationship(number("A3"), number("B2")), Relationship(number("G1"), 3, 2))
+        self.assertEqual(kinship.relationship(number("A3"), number("B2")).degree, 1)
+        self.assertEqual(kinship.relationship(number("A3"), number("B2")).removed, 1)
+        testReport.addToReport(Individual("X1", None, "F", None, None, None, []))
+        kinship = testReport.get_kinship()
+        self.assertIsNone(kinship.relationship(number("A3"), number("X1")))
+
+
+    def test_related_through_every_line(self):
+        testReport: Report = makeTree(2, 2)
+        #A2 marries B1 and has a child, who is B1's child and also B1's grandniece/nephew through A2
+        testReport.fam_map["FA2"].wifeId = "B1"
+        testReport.fam_map["FA2"].childIds = ["C1"]
+        testReport.indi_map["B1"].spouseIn.append("FA2")
+        testReport.addToReport(Individual("C1", None, "F", None, None, "FA2", []))
+        kinship: Kinship = testReport.get_kinship()
+        number = testReport.xrefs.lookup
+        self.assertEqual(kinship.relationship(number("B1"), number("C1")).describe(), "child")
+        self.assertTrue(kinship.areRelatedAs(number("B1"), number("C1"), 1, 3))
+        self.assertFalse(kinship.areRelatedAs(number("B1"), number("C1"), 2, 2))
+        self.assertTrue(kinship.isAncestor(number("G2"), number("C1")))
+
+
+    def test_related_as_without_indexes(self):
+        testReport: Report = makeTree(6, 6)
+        number = testReport.xrefs.lookup
+        kinship: Kinship = Kinship(testReport.get_traversal(), 3)
+        self.assertTrue(kinship.areRelatedAs(number("A1"), number("B1"), 1, 1))
+        self.assertFalse(kinship.areRelatedAs(number("A1"), number("B1"), 2, 2))
+        self.assertFalse(kinship.areRelatedAs(number("A6"), number("B6"), 6, 6)) #Past maxDepth
+        self.assertEqual(kinship.indexes, {})
+
+
+    def test_max_depth(self):
+        testReport: Report = makeTree(6, 6)
+        number = testReport.xrefs.lookup
+        kinship: Kinship = Kinship(testReport.get_traversal(), 3)
+        self.assertIsNone(kinship.relationship(number("A6"), number("B6")))
+        self.assertEqual(kinship.relationship(number("A6"), number("A3")).describe(), "great-grandparent")
@@ -0,0 +1,45 @@
+import unittest
+from datetime import date
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_MaritalStatus import MaritalStatusTable
+
+def makeReport() -> Report:
+    testReport: Report = Report()
+    testReport.addToReport(Individual("I1", "John /Doe/", "M", date(1950, 1, 1), None, None, ["F1", "F2"]))
+    testReport.addToReport(Individual("I2", "Jane /Doe/", "F", date(1952, 1, 1), date(2000, 1, 1), None, ["F1"]))
+    testReport.addToReport(Individual("I3", "Mary /Roe/", "F", date(1960, 1, 1), None, None, ["F2"]))
+    testReport.addToReport(Individual("I4", "Sam /Roe/", "M", date(1970, 1, 1), None, None, ["F3"]))
+    testReport.addToReport(Individual("I5", "Young /Roe/", "M", date.today(), None, None, []))
+    testReport.addToReport(Family("F1", "I1", "I2", [], date(1975, 1, 1), None)) #Ended with the death of I2
+    testReport.addToReport(Family("F2", "I1", "I3", [], date(2005, 1, 1), None))
+    return testReport
+
+class MaritalStatus_Tests(unittest.TestCase):
+    def test_table(self):
+        table: MaritalStatusTable = makeReport().get_marital_status()
+        self.assertEqual(table.effectiveEnds, {"F1": date(2000, 1, 1), "F2": None})
+        self.assertEqual(table.currentFamilies["I1"], ["F2"])
+        self.assertEqual(table.currentFamilies["I4"], ["F3"]) #F3 doesn't have a record, so nothing says it ended
+        self.assertEqual(table.ages["I2"], 48)
+
+
+    def test_listings(self):
+        table: MaritalStatusTable = makeReport().get_marital_status()
+        self.assertEqual([(indi.id, families) for indi, families in table.livingMarried()], [("I1", ["F2"]), ("I3", ["F2"]), ("I4", ["F3"])])
+        self.assertEqual([indi.id for indi, _ in table.livingSingles(30)], [])
+        self.assertEqual([(indi.id, age) for indi, age in table.livingSingles(-1)], [("I5", 0)])
+
+
+    def test_shared_with_checks(self):
+        testReport: Report = makeReport()
+        testReport.run_checks(["US08", "US11", "US12"])
+        table: MaritalStatusTable = testReport.marital_status
+        self.assertIsNotNone(table)
+        self.assertIs(testReport.get_marital_status(), table)
+        #Made again on the next run, in case any dates changed
+        testReport.fam_map["F2"].divorceDate = date(2010, 1, 1)
+        testReport.run_checks(["US11"])
+        self.assertEqual(testReport.get_marital_status().effectiveEnds["F2"], date(2010, 1, 1))
+        self.assertFalse(testReport.check_single_status(testReport.indi_map["I4"]))
+        self.assertTrue(testReport.check_single_status(testReport.indi_map["I3"]))
@@ -0,0 +1,86 @@
+import unittest
+from datetime import date
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual
+from classes.GEDCOM_Names import splitName, nameWords, soundex, PhoneticIndex, NameSearchIndex
+
+class Names_Tests(unittest.TestCase):
+    def test_split_name(self):
+        self.assertEqual(splitName("John /Smith/"), ("John", "Smith"))
+        self.assertEqual(splitName("Dr. John /Smith/"), ("Dr. John", "Smith"))
+        self.assertEqual(splitName("John"), ("John", ""))
+        self.assertEqual(splitName("John /Smith"), ("John", "Smith"))
+        self.assertEqual(splitName("John //"), ("", ""))
+
+
+    def test_parts_at_ingest(self):
+        indi: Individual = Individual("I1", "John /Smith/")
+        self.assertEqual((indi.givenName, indi.surname), ("John", "Smith"))
+        indi.readDataFromFields(["1", "NAME", "Jon /Smyth/"])
+        self.assertEqual((indi.givenName, indi.surname), ("Jon", "Smyth"))
+        #Changing the name directly still gives the right parts
+        indi.name = "Jane /Doe/"
+        self.assertEqual((indi.givenName, indi.surname), ("Jane", "Doe"))
+        self.assertEqual((Individual("I2").givenName, Individual("I2").surname), (None, None))
+
+
+    def test_soundex(self):
+        self.assertEqual(soundex("Robert"), "R163")
+        self.assertEqual(soundex("Rupert"), "R163")
+        self.assertEqual(soundex("Ashcraft"), "A261") #h doesn't separate the s and c
+        self.assertEqual(soundex("Tymczak"), "T522") #a vowel does separate the c and k
+        self.assertEqual(soundex("Pfister"), "P236")
+        self.assertEqual(soundex("Lee"), "L000")
+        self.assertEqual(soundex("Müller"), soundex("Mueller"))
+        self.assertEqual(soundex(""), "")
+
+
+    def test_phonetic_index(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "John /Smith/", "M", date(1950, 1, 1)))
+        testReport.addToReport(Individual("I2", "Jon /Smyth/", "M", date(1950, 1, 1)))
+        testReport.addToReport(Individual("I3", "Mary /Jones/", "F", date(1960, 1, 1)))
+        testReport.addToReport(Individual("I4", "Nobody"))
+        self.assertIsNone(testReport.phonetic_index) #Only built the first time it's needed
+        self.assertEqual(testReport.find_sounds_like("Smithe"), ["I1", "I2"])
+        self.assertEqual(testReport.find_sounds_like("Ann /Jonas/"), ["I3"])
+        self.assertEqual(testReport.find_sounds_like("Brown"), [])
+        #Adding someone adds them to the index
+        testReport.addToReport(Individual("I5", "Sam /Smit/", "M"))
+        self.assertEqual(testReport.find_sounds_like("Smith"), ["I1", "I2", "I5"])
+
+        index: PhoneticIndex = PhoneticIndex()
+        index.add(testReport.indi_map["I3"])
+        self.assertEqual(index.soundsLike("Jones"), ["I3"])
+
+
+    def test_name_words(self):
+        self.assertEqual(nameWords("Mary-Ann O'Neil"), ["mary", "ann", "oneil"])
+        self.assertEqual(nameWords("  Müller "), ["muller"])
+
+
+    def test_name_search(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "Johnathan /Smith/"))
+        testReport.addToReport(Individual("I2", "John /Smithers/"))
+        testReport.addToReport(Individual("I3", "John /Smith/"))
+        testReport.addToReport(Individual("I4", "Mary /Jones/"))
+        testReport.addToReport(Individual("I5"))
+        self.assertEqual(testReport.search_names("jo sm"), ["I1", "I2", "I3"])
+        #Whole words rank above partial ones
+        self.assertEqual(testReport.search_names("john smith"), ["I3", "I1", "I2"])
+        self.assertEqual(testReport.search_names("SMITH"), ["I1", "I3", "I2"])
+        self.assertEqual(testReport.search_names("jo sm", 1), ["I1"])
+        self.assertEqual(testReport.search_names("mary smith"), [])
+        self.assertEqual(testReport.search_names(""), [])
+        #Adding someone adds them to the index, with any new words kept in order
+        index: NameSearchIndex = testReport.get_name_index()
+        testReport.addToReport(Individual("I6", "Aaron /Smith/"))
+        self.assertIs(testReport.get_name_index(), index)
+        self.assertEqual(index.words, sorted(index.words))
+        self.assertEqual(testReport.search_names("smith"), ["I1", "I3", "I6", "I2"])
+        self.assertEqual(testReport.search_names("aa"), ["I6"])
+
+
+if __name__ == '__main__':
+    unittest.main()
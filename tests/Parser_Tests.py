@@ -0,0 +1,132 @@
+import unittest
+import io
+import contextlib
+import os
+import tempfile
+from datetime import date
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Units import GEDCOMUnit, Individual, Family
+from classes.GEDCOM_Dates import DateCache
+from classes.GEDCOM_Parser import parse, parse_mmap, parse_parallel, load_report
+
+sampleFile: str = """0 HEAD
+0 I1 INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 1 JAN 1970
+1 FAMS F1
+0 I2 INDI
+1 NAME Jane /Doe/
+1 SEX F
+1 FAMS F1
+0 I1 INDI
+1 NAME Copy /Doe/
+1 BIRT
+2 DATE 30 FEB 1970
+0 F1 FAM
+1 HUSB I1
+1 WIFE I2
+1 MARR
+2 DATE 5 MAY 1990
+0 TRLR
+"""
+
+class Parser_Tests(unittest.TestCase):
+    def test_parse_yields_records_in_order(self):
+        records: list[GEDCOMUnit] = list(parse(io.StringIO(sampleFile)))
+        self.assertEqual([record.id for record in records], ["I1", "I2", "I1 (1)", "F1"])
+        self.assertIsInstance(records[0], Individual)
+        self.assertIsInstance(records[3], Family)
+        self.assertEqual(records[0].birthDate, date(1970, 1, 1))
+        self.assertEqual(records[3].husbandId, "I1")
+        self.assertEqual(records[3].marriageDate, date(1990, 5, 5))
+
+
+    def test_load_report(self):
+        testReport: Report = load_report(io.StringIO(sampleFile))
+        self.assertEqual(list(testReport.indi_map.keys()), ["I1", "I2", "I1 (1)"])
+        self.assertEqual(list(testReport.fam_map.keys()), ["F1"])
+        self.assertEqual(testReport.errors, [ReportDetail("Duplicate IDs", "I1 is already used"), ReportDetail("Invalid Date", "30 FEB 1970 is not a valid date (the day is probably too large for the current month)")])
+
+
+    def test_load_report_into_existing_report(self):
+        testReport: Report = Report()
+        returnedReport: Report = load_report(io.StringIO(sampleFile), testReport)
+        self.assertIs(returnedReport, testReport)
+        self.assertEqual(len(testReport.indi_map), 3)
+
+
+    def test_reports_are_independent(self):
+        reportA: Report = load_report(io.StringIO(sampleFile))
+        reportB: Report = load_report(io.StringIO(sampleFile))
+        self.assertIsNot(reportA.indi_map["I1"], reportB.indi_map["I1"])
+        self.assertEqual(len(reportB.errors), 2)
+
+
+    def test_bad_lines_are_skipped(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            testReport: Report = load_report(io.StringIO("1 NAME Nobody\n0 I1 INDI\n1 NAME Somebody\n3 BAD LINE\n"))
+        self.assertEqual(list(testReport.indi_map.keys()), ["I1"])
+        self.assertEqual(testReport.indi_map["I1"].name, "Somebody")
+        self.assertEqual(len(testReport.line_errors), 2)
+        self.assertEqual(output.getvalue(), "") #Kept in the report, not printed
+
+
+    #Makes a temporary file holding the given bytes, since the memory mapped reader only takes paths
+    def writeTempFile(self, data: bytes) -> str:
+        file = tempfile.NamedTemporaryFile(suffix=".ged", delete=False)
+        file.write(data)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+
+    def test_mmap_matches_text_parse(self):
+        path: str = self.writeTempFile(sampleFile.encode())
+        textReport: Report = load_report(io.StringIO(sampleFile))
+        mmapReport: Report = load_report(path, use_mmap=True)
+        self.assertEqual(mmapReport.errors, textReport.errors)
+        for id, indi in textReport.indi_map.items():
+            self.assertEqual(mmapReport.indi_map[id].getRowData(), indi.getRowData())
+        for id, fam in textReport.fam_map.items():
+            self.assertEqual(mmapReport.fam_map[id].getRowData(), fam.getRowData())
+
+
+    def test_mmap_windows_line_endings(self):
+        path: str = self.writeTempFile(sampleFile.replace("\n", "\r\n").encode())
+        records: list[GEDCOMUnit] = list(parse_mmap(path))
+        self.assertEqual([record.id for record in records], ["I1", "I2", "I1 (1)", "F1"])
+        self.assertEqual(records[0].name, "John /Doe/")
+        self.assertEqual(records[3].wifeId, "I2")
+
+
+    def test_mmap_empty_file(self):
+        path: str = self.writeTempFile(b"")
+        self.assertEqual(list(parse_mmap(path)), [])
+
+
+    def test_parallel_lazy_dates_stay_raw(self):
+        path: str = self.writeTempFile(sampleFile.encode())
+        cache: DateCache = DateCache()
+        testReport: Report = load_report(path, Report(cache), jobs=2, lazy_dates=True)
+        self.assertEqual(len(cache), 0) #Nothing was converted while reading, or while sending the records back
+        self.assertEqual(testReport.indi_map["I1"].birthDate, date(1970, 1, 1))
+        self.assertIn("1 JAN 1970", cache.entries)
+
+
+    #Duplicate IDs spread out across the whole file, so they'll end up in different chunks
+    def test_parallel_matches_text_parse(self):
+        lines: list[str] = ["0 HEAD"]
+        for i in range(300):
+            lines += [f"0 I{i % 50} INDI", f"1 NAME Person{i} /Doe/", "1 BIRT", f"2 DATE {i % 31 + 1} JAN {1900 + i}", "0 NOTE ----"]
+        data: str = "\n".join(lines) + "\n"
+        path: str = self.writeTempFile(data.encode())
+        textReport: Report = load_report(io.StringIO(data))
+        parallelReport: Report = Report()
+        records: list[GEDCOMUnit] = list(parse_parallel(path, 3, parallelReport))
+        self.assertEqual([record.id for record in records], list(textReport.indi_map.keys()))
+        self.assertEqual(list(parallelReport.indi_map.keys()), list(textReport.indi_map.keys()))
+        self.assertEqual(parallelReport.errors, textReport.errors)
+        self.assertEqual([indi.name for indi in parallelReport.indi_map.values()], [indi.name for indi in textReport.indi_map.values()])
@@ -0,0 +1,150 @@
+import unittest
+import hashlib
+import os
+import pickle
+import tempfile
+from datetime import date
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Parser import load_report
+from classes.GEDCOM_Dates import DateCache
+from classes.GEDCOM_Snapshot import snapshotPath, fileHash, load_snapshot, signatureSize
+
+sampleFile: str = """0 HEAD
+0 I1 INDI
+1 NAME John /Doe/
+1 BIRT
+2 DATE 1 JAN 1970
+1 FAMS F1
+0 I1 INDI
+1 NAME Copy /Doe/
+1 BIRT
+2 DATE 30 FEB 1970
+3 BAD LINE
+0 F1 FAM
+1 HUSB I1
+1 MARR
+2 DATE 1 JAN 2999
+0 TRLR
+"""
+
+#Pickle that runs code (making a file) when it's read
+class Payload():
+    def __init__(self, path: str):
+        self.path = path
+
+    def __reduce__(self):
+        return (open, (self.path, "w"))
+
+
+class Snapshot_Tests(unittest.TestCase):
+    #Makes a temporary folder for the GEDCOM file, and another for the snapshots, and writes the given text to the file
+    def setUpFiles(self, text: str) -> None:
+        for name in ("source", "cache"):
+            folder = tempfile.TemporaryDirectory()
+            self.addCleanup(folder.cleanup)
+            setattr(self, name, folder.name)
+        self.path: str = os.path.join(self.source, "test.ged")
+        with open(self.path, "w") as file:
+            file.write(text)
+
+    def load(self, report: Report = None) -> Report:
+        return load_report(self.path, report, snapshot=True, snapshot_folder=self.cache)
+
+    def loadSnapshot(self, report: Report = None, **options) -> bool:
+        return load_snapshot(Report() if report is None else report, fileHash(self.path), folder=self.cache, **options)
+
+
+    def test_snapshot_matches_parse(self):
+        self.setUpFiles(sampleFile)
+        parsed: Report = self.load()
+        self.assertEqual(os.listdir(self.source), ["test.ged"]) #Nothing is written next to the file
+        self.assertTrue(os.path.exists(snapshotPath(self.cache, fileHash(self.path))))
+        loaded: Report = Report()
+        self.assertTrue(self.loadSnapshot(loaded))
+        self.assertEqual(list(loaded.indi_map), ["I1", "I1 (1)"])
+        self.assertEqual([indi.name for indi in loaded.indi_map.values()], ["John /Doe/", "Copy /Doe/"])
+        self.assertEqual(loaded.fam_map["F1"].marriageDate, date(2999, 1, 1))
+        self.assertEqual(loaded.errors, parsed.errors)
+        self.assertEqual([error.detailType for error in loaded.errors], ["Duplicate IDs", "Invalid Date", "Future Date"])
+        self.assertEqual(loaded.line_errors, parsed.line_errors)
+        self.assertEqual(len(loaded.line_errors), 1)
+        self.assertEqual(loaded.duplicate_id_map, {"I1": 2})
+        self.assertEqual(loaded.xrefs.ids, parsed.xrefs.ids)
+        #Reading it again gives the same report, straight from the snapshot
+        self.assertEqual(self.load().errors, parsed.errors)
+
+
+    def test_snapshots_are_opt_in(self):
+        self.setUpFiles(sampleFile)
+        load_report(self.path)
+        self.assertFalse(self.loadSnapshot())
+
+
+    def test_file_hash_in_chunks(self):
+        self.setUpFiles(sampleFile * 20000) #Bigger than one chunk
+        with open(self.path, "rb") as file:
+            self.assertEqual(fileHash(self.path), hashlib.sha256(file.read()).hexdigest())
+
+
+    def test_changed_file_is_read_again(self):
+        self.setUpFiles(sampleFile)
+        self.load()
+        with open(self.path, "w") as file:
+            file.write(sampleFile.replace("John", "Jon"))
+        self.assertFalse(self.loadSnapshot())
+        self.assertEqual(self.load().indi_map["I1"].name, "Jon /Doe/")
+        self.assertTrue(self.loadSnapshot()) #Saved again for the new contents
+
+
+    def test_snapshot_only_used_with_same_options(self):
+        self.setUpFiles(sampleFile)
+        self.load()
+        self.assertFalse(self.loadSnapshot(compact=True))
+        self.assertFalse(self.loadSnapshot(lazy_dates=True))
+
+
+    def test_snapshot_expires_with_future_dates(self):
+        self.setUpFiles(sampleFile)
+        self.load()
+        later: Report = Report()
+        later.run_date = date(2999, 1, 1) #The marriage isn't in the future anymore, so US01 wouldn't give an error for it
+        self.assertFalse(self.loadSnapshot(later))
+        self.assertNotIn(ReportDetail("Future Date", "Date that has yet to happen (2999-01-01) has been detected"), self.load(later).errors)
+
+
+    def test_unsigned_snapshot_is_never_unpickled(self):
+        self.setUpFiles(sampleFile)
+        self.load()
+        marker: str = os.path.join(self.cache, "ran")
+        path: str = snapshotPath(self.cache, fileHash(self.path))
+        with open(path, "rb") as file:
+            signature: bytes = file.read(signatureSize)
+        with open(path, "wb") as file:
+            file.write(signature + pickle.dumps(Payload(marker)))
+        self.assertFalse(self.loadSnapshot())
+        self.assertFalse(os.path.exists(marker))
+        #The file is read again, and the snapshot is replaced with a good one
+        self.assertEqual(list(self.load().indi_map), ["I1", "I1 (1)"])
+        self.assertTrue(self.loadSnapshot())
+
+
+    def test_lazy_snapshot_uses_loading_report_cache(self):
+        self.setUpFiles(sampleFile)
+        load_report(self.path, lazy_dates=True, snapshot=True, snapshot_folder=self.cache)
+        cache: DateCache = DateCache()
+        loaded: Report = Report(cache)
+        self.assertTrue(self.loadSnapshot(loaded, lazy_dates=True))
+        self.assertEqual(loaded.indi_map["I1"].birthDate, date(1970, 1, 1))
+        self.assertIn("1 JAN 1970", cache.entries)
+
+
+    def test_snapshot_not_used_for_filled_report(self):
+        self.setUpFiles(sampleFile)
+        self.load()
+        testReport: Report = load_report(self.path)
+        self.load(testReport)
+        self.assertEqual(list(testReport.indi_map), ["I1", "I1 (1)", "I1 (2)", "I1 (3)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Traversal import Traversal
+
+#Makes a report where I0 is the parent of I1, who is the parent of I2, and so on
+def makeChain(length: int) -> Report:
+    testReport: Report = Report()
+    for i in range(length):
+        testReport.addToReport(Individual(f"I{i}", None, "M", None, None, f"F{i-1}" if i > 0 else None, [f"F{i}"]))
+        testReport.addToReport(Family(f"F{i}", f"I{i}", None, [f"I{i+1}"] if i + 1 < length else []))
+    return testReport
+
+class Traversal_Tests(unittest.TestCase):
+    def test_depths(self):
+        testReport: Report = makeChain(4)
+        traversal: Traversal = testReport.get_traversal()
+        number = testReport.xrefs.lookup
+        self.assertEqual(traversal.descendants(number("I0")), {number("I1"): 1, number("I2"): 2, number("I3"): 3})
+        self.assertEqual(traversal.ancestors(number("I3")), {number("I2"): 1, number("I1"): 2, number("I0"): 3})
+        self.assertEqual(traversal.generation(number("I3"), 2), {number("I1")})
+        self.assertEqual(traversal.findCycles(), [])
+
+
+    def test_one_sided_links(self):
+        testReport: Report = makeChain(3)
+        testReport.fam_map["F0"].childIds = [] #I1 still says they're a child of F0 (FAMC), but F0 doesn't list them
+        testReport.indi_map["I2"].childIn = None #F1 still lists I2 (CHIL), but I2 doesn't say so
+        testReport.invalidate_indexes()
+        traversal: Traversal = testReport.get_traversal()
+        number = testReport.xrefs.lookup
+        self.assertEqual(traversal.descendants(number("I0")), {number("I1"): 1, number("I2"): 2})
+        self.assertEqual(traversal.parentsOf[number("I1")], (number("I0"),))
+
+
+    def test_deep_pedigree(self):
+        testReport: Report = makeChain(30000) #Well past the recursion limit
+        self.assertEqual(len(testReport.get_descendants("I0")), 29999)
+        self.assertEqual(len(testReport.get_traversal().ancestors(testReport.xrefs.lookup("I29999"))), 29999)
+        testReport.no_marriage_to_descendants()
+        self.assertEqual(testReport.anomalies, [])
+
+
+    def test_is_ancestor(self):
+        testReport: Report = makeChain(4)
+        testReport.addToReport(Individual("I9", None, "F", None, None, None, []))
+        traversal: Traversal = testReport.get_traversal()
+        number = testReport.xrefs.lookup
+        self.assertTrue(traversal.isAncestor(number("I0"), number("I3")))
+        self.assertTrue(traversal.isAncestor(number("I2"), number("I3")))
+        self.assertFalse(traversal.isAncestor(number("I3"), number("I0")))
+        self.assertFalse(traversal.isAncestor(number("I0"), number("I0")))
+        self.assertFalse(traversal.isAncestor(number("I9"), number("I3")))
+        self.assertFalse(traversal.isAncestor(number("I0"), number("I9")))
+
+
+    def test_cycles_are_reported(self):
+        testReport: Report = makeChain(3)
+        testReport.fam_map["F2"].childIds = ["I0"] #I2 is now the parent of I0, which makes a loop
+        testReport.addToReport(Individual("I5", None, "F", None, None, "F5", ["F5"]))
+        testReport.addToReport(Family("F5", None, "I5", ["I5"])) #Own child
+        testReport.invalidate_indexes()
+
+        number = testReport.xrefs.lookup
+        self.assertTrue(testReport.get_traversal().isAncestor(number("I2"), number("I1")))
+        self.assertTrue(testReport.get_traversal().isAncestor(number("I5"), number("I5")))
+
+        self.assertEqual(testReport.get_descendants("I1"), {"I0", "I1", "I2"})
+        testReport.check_ancestry_cycles()
+        self.assertEqual(testReport.errors, [ReportDetail("Ancestry Cycle", "I0, I1, I2 are their own ancestors"), ReportDetail("Ancestry Cycle", "I5 is their own ancestor")])
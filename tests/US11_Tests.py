@@ -56,4 +56,38 @@ class US11_Tests(unittest.TestCase):
         testReport.addToReport(family2)
 
         testReport.check_bigamy()
-        self.assertEqual(testReport.errors[0].message, "Spouse details are: I2 and families are F1 and F2")
\ No newline at end of file
+        self.assertEqual(testReport.errors[0].message, "Spouse details are: I2 and families are F1 and F2")
+
+    def test_check_bigamy_does_not_change_families (self):
+        testReport: Report = Report()
+        husband = Individual ("I1", "Jon Snow", "M", date(1971, 2, 23), date(2001, 3, 4), None, ["F1", "F2"])
+        wife = Individual ("I2", "Rose", "F", date(1973, 12, 28), None, None, ["F1"])
+        wife2 = Individual("I3", "Dany T", "F", date(1961, 4, 21), None, None, ["F2"])
+        family = Family ("F1", husband.id, wife.id, None, date(1989, 5, 30), None)
+        family2 = Family ("F2", husband.id, wife2.id, None, date(1996, 2, 12), None)
+
+        for unit in [husband, wife, family, wife2, family2]:
+            testReport.addToReport(unit)
+
+        testReport.check_bigamy()
+        self.assertEqual(testReport.errors[0].message, "Spouse details are: I1 and families are F1 and F2")
+        self.assertIsNone(family.divorceDate)
+        self.assertIsNone(family2.divorceDate)
+
+    def test_check_bigamy_serial_remarriage (self):
+        testReport: Report = Report()
+        famIds = [f"F{i}" for i in range(1, 51)]
+        testReport.addToReport(Individual ("I1", "Jon Snow", "M", date(1900, 1, 1), None, None, famIds))
+        for i, famId in enumerate(famIds):
+            #Every marriage ends the day the next one starts, except for the last one. The marriages are listed out of order
+            end = date(1921 + i, 1, 1) if i < len(famIds) - 1 else None
+            testReport.addToReport(Family (famId, "I1", None, None, date(1920 + i, 1, 1), end))
+        testReport.fam_map = dict(reversed(list(testReport.fam_map.items())))
+        testReport.check_bigamy()
+        self.assertEqual(testReport.errors, [])
+
+        testReport.fam_map["F10"].divorceDate = date(1935, 6, 1) #Now overlaps with F11 up to F16
+        testReport.check_bigamy()
+        self.assertEqual([error.message for error in testReport.errors], ["Spouse details are: I1 and families are F16 and F10", "Spouse details are: I1 and families are F15 and F10",
+            "Spouse details are: I1 and families are F14 and F10", "Spouse details are: I1 and families are F13 and F10", "Spouse details are: I1 and families are F12 and F10",
+            "Spouse details are: I1 and families are F11 and F10"])
@@ -40,4 +40,29 @@ class TestNoMarriageToDescendants(unittest.TestCase):
         # Assert that there are no descendant marriages
         self.assertEqual(len(testReport.anomalies), 1)
         self.assertEqual(testReport.anomalies[0].detailType, "Marriage to Descendant")
-        self.assertEqual(testReport.anomalies[0].message, "I1 is married to descendant, I3.")
\ No newline at end of file
+        self.assertEqual(testReport.anomalies[0].message, "I1 is married to descendant, I3.")
+
+    def test_marriage_to_grandchild(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "Grandpa", "M", None, None, None, ["F1", "F3"]))
+        testReport.addToReport(Individual("I2", "Grandma", "F", None, None, None, ["F1"]))
+        testReport.addToReport(Individual("I3", "Parent", "M", None, None, "F1", ["F2"]))
+        testReport.addToReport(Individual("I4", "Grandchild", "F", None, None, "F2", ["F3"]))
+        testReport.addToReport(Family("F1", "I1", "I2", ["I3"], None, None))
+        testReport.addToReport(Family("F2", "I3", None, ["I4"], None, None))
+        testReport.addToReport(Family("F3", "I1", "I4", [], None, None))
+
+        self.assertEqual(testReport.get_descendants("I1"), {"I3", "I4"})
+        testReport.no_marriage_to_descendants()
+        self.assertEqual(testReport.anomalies, [ReportDetail("Marriage to Descendant", "I1 is married to descendant, I4.")])
+
+
+    def test_ancestry_loop_finishes(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "A", "M", None, None, "F2", ["F1"]))
+        testReport.addToReport(Individual("I2", "B", "M", None, None, "F1", ["F2"]))
+        testReport.addToReport(Family("F1", "I1", None, ["I2"], None, None))
+        testReport.addToReport(Family("F2", "I2", None, ["I1"], None, None))
+
+        testReport.no_marriage_to_descendants()
+        self.assertIn("I2", testReport.get_descendants("I1"))
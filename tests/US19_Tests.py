@@ -87,3 +87,21 @@ class US19_Tests(unittest.TestCase):
 
         # Assert that there is an error in the report
         self.assertEqual(len(testReport.anomalies), 0)
+
+    def test_one_sided_parent_links(self):
+        #The fathers say they're children of F1 (FAMC), but F1 doesn't list them (no CHIL)
+        testReport = Report()
+        testReport.addToReport(Individual("G1", "Grandpa /Doe/", "M", None, None, None, ["F1"]))
+        testReport.addToReport(Individual("G2", "Grandma /Doe/", "F", None, None, None, ["F1"]))
+        testReport.addToReport(Individual("I1", "John /Doe/", "M", None, None, "F1", ["F2"]))
+        testReport.addToReport(Individual("I2", "Mike /Doe/", "M", None, None, "F1", ["F3"]))
+        testReport.addToReport(Individual("I3", "Alice /Doe/", "F", None, None, "F2", ["F4"]))
+        testReport.addToReport(Individual("I4", "Tyler /Doe/", "M", None, None, "F3", ["F4"]))
+        testReport.addToReport(Family("F1", "G1", "G2", [], None, None))
+        testReport.addToReport(Family("F2", "I1", None, ["I3"], None, None))
+        testReport.addToReport(Family("F3", "I2", None, ["I4"], None, None))
+        testReport.addToReport(Family("F4", "I4", "I3", [], None, None))
+
+        testReport.first_cousins_should_not_marry()
+
+        self.assertEqual([anomaly.message for anomaly in testReport.anomalies], ["First cousins are getting married in Family F4"])
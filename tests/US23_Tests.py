@@ -50,3 +50,25 @@ class TestCheckUniqueNamesAndBirthDates(unittest.TestCase):
         self.assertEqual(report.anomalies[0].detailType, "Duplicate Name and Birthdate")
         self.assertEqual(report.anomalies[0].message, f"Indi1, Indi2 share a name (Lastname1 /Lastname/) and birthday (1990-01-01)")
 
+
+
+class TestNearDuplicateNames(unittest.TestCase):
+    def test_spelling_variants(self):
+        report = Report()
+        report.addToReport(Individual("I1", "John /Smith/", "M", date(1950, 3, 1), None, None, []))
+        report.addToReport(Individual("I2", "Jon /Smyth/", "M", date(1950, 7, 9), None, None, []))
+        report.addToReport(Individual("I3", "Jane /Smith/", "F", date(1950, 3, 1), None, None, []))  #Same given name skeleton as John, but not the same sex
+        report.addToReport(Individual("I4", "John /Smith/", "M", date(1951, 3, 1), None, None, [])) #Different birth year
+        report.addToReport(Individual("I5", "Mary /Müller/", "F", date(1900, 1, 1), None, None, []))
+        report.addToReport(Individual("I6", "Mary /Mueller/", "F", date(1900, 5, 5), None, None, []))
+        report.run_checks(["US23F"])
+        self.assertEqual([anomaly.message for anomaly in report.anomalies], ["I1, I2 may be the same person (similar names John /Smith/ / Jon /Smyth/, born in 1950)",
+                                                                             "I5, I6 may be the same person (similar names Mary /Müller/ / Mary /Mueller/, born in 1900)"])
+
+    def test_exact_duplicates_left_to_us23(self):
+        report = Report()
+        report.addToReport(Individual("I1", "John /Smith/", "M", date(1950, 3, 1), None, None, []))
+        report.addToReport(Individual("I2", "John /Smith/", "M", date(1950, 3, 1), None, None, []))
+        report.run_checks(["US23", "US23F"])
+        self.assertEqual([anomaly.detailType for anomaly in report.anomalies], ["Duplicate Name and Birthdate"])
+        self.assertEqual(report.anomalies[0].message, "I1, I2 share a name (John /Smith/) and birthday (1950-03-01)")
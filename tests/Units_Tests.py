@@ -0,0 +1,45 @@
+import unittest
+import io
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family, CompactIndividual, CompactFamily
+from classes.GEDCOM_Parser import load_report
+
+class Units_Tests(unittest.TestCase):
+    def test_units_have_no_dict(self):
+        indi: Individual = Individual("I1")
+        with self.assertRaises(AttributeError):
+            indi.nickname = "Johnny"
+        self.assertFalse(hasattr(Family("F1"), "__dict__"))
+
+
+    def test_compact_units_share_empty_ids(self):
+        indiA: CompactIndividual = CompactIndividual("I1")
+        indiB: CompactIndividual = CompactIndividual("I2")
+        self.assertIs(indiA.spouseIn, indiB.spouseIn)
+        self.assertEqual(len(indiA.spouseIn), 0)
+        self.assertIs(CompactFamily("F1").childIds, CompactFamily("F2").childIds)
+
+
+    def test_compact_units_read_ids(self):
+        indi: CompactIndividual = CompactIndividual("I1")
+        indi.readDataFromFields(["1", "FAMS", "F1"])
+        indi.readDataFromFields(["1", "FAMS", "F2"])
+        self.assertEqual(indi.spouseIn, ["F1", "F2"])
+        self.assertEqual(len(CompactIndividual("I2").spouseIn), 0) #Shared empty value shouldn't have been changed
+        fam: CompactFamily = CompactFamily("F1")
+        fam.readDataFromFields(["1", "CHIL", "I1"])
+        self.assertEqual(fam.childIds, ["I1"])
+
+
+    def test_compact_row_data_matches(self):
+        self.assertEqual(CompactIndividual("I1").getRowData(), Individual("I1").getRowData())
+        self.assertEqual(CompactFamily("F1").getRowData(), Family("F1").getRowData())
+
+
+    def test_load_compact_report(self):
+        testReport: Report = load_report(io.StringIO("0 I1 INDI\n1 NAME John /Doe/\n0 I2 INDI\n1 FAMS F1\n0 F1 FAM\n1 WIFE I2\n"), compact=True)
+        self.assertIsInstance(testReport.indi_map["I1"], CompactIndividual)
+        self.assertIsInstance(testReport.fam_map["F1"], CompactFamily)
+        self.assertEqual(testReport.indi_map["I2"].spouseIn, ["F1"])
+        testReport.check_corresponding_entries()
+        self.assertEqual(testReport.errors, [])
@@ -0,0 +1,142 @@
+import unittest
+from datetime import date
+from classes.GEDCOM_Reporting import Report, ReportDetail
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Parser import load_report
+from classes.GEDCOM_Validation import Validator, Rule, Fact, ruleRegistry, factRegistry, registerRule, registerFact, selectRules, isShardable, isComponentShardable
+
+sampleFiles: list[str] = ["Acceptance_File.txt", "GEDCOM_Sample_V2.txt", "GEDCOM_Sample_V3.ged"]
+
+#Runs every check one at a time, in the same order as the validation engine
+def runSeparately(report: Report) -> None:
+    for rule in ruleRegistry.values():
+        report.run_checks([rule.id])
+
+class Validation_Tests(unittest.TestCase):
+    def test_same_as_separate_checks(self):
+        for path in sampleFiles:
+            fusedReport: Report = load_report(path)
+            separateReport: Report = load_report(path)
+            fusedReport.run_checks()
+            runSeparately(separateReport)
+            self.assertEqual([error.getRowData() for error in fusedReport.errors], [error.getRowData() for error in separateReport.errors])
+            self.assertEqual([anomaly.getRowData() for anomaly in fusedReport.anomalies], [anomaly.getRowData() for anomaly in separateReport.anomalies])
+            self.assertGreater(len(fusedReport.errors) + len(fusedReport.anomalies), 0)
+
+
+    def test_order_follows_rules(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "John /Doe/", "F", date(2000, 1, 1), date(1990, 1, 1), None, ["F1"]))
+        testReport.addToReport(Family("F1", "I1", None, [], date(1980, 1, 1), None))
+        testReport.run_checks(["US21", "US02", "US03"]) #Given out of order
+        self.assertEqual([error.detailType for error in testReport.errors], ["Birth After Marriage", "Birth After Death", "Incorrect Sex"])
+
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ValueError):
+            Validator(Report(), ["US99"])
+
+
+    def test_select_and_skip(self):
+        self.assertEqual([rule.id for rule in selectRules(["US11", "US02"])], ["US02", "US11"])
+        selected: list[Rule] = selectRules(skipIds=["US17", "US19"])
+        self.assertEqual(len(selected), len(ruleRegistry) - 3) #Along with the optional US23F
+        self.assertNotIn("US23F", [rule.id for rule in selectRules()])
+        self.assertEqual([rule.id for rule in selectRules(["US23F"])], ["US23F"])
+        self.assertNotIn("US17", [rule.id for rule in selected])
+        with self.assertRaises(ValueError):
+            selectRules(skipIds=["US99"])
+
+
+    def test_registry(self):
+        for rule in ruleRegistry.values():
+            self.assertIn(rule.category, ["error", "anomaly", "listing"])
+        self.assertEqual(ruleRegistry["US19"].requires, ("kinship",))
+        self.assertEqual(ruleRegistry["US34"].name, "Large Age Differences")
+        with self.assertRaises(ValueError):
+            registerRule(Rule("US02", "Again", "error"))
+        with self.assertRaises(ValueError):
+            Rule("US98", "Bad", "warning")
+
+
+    def test_listings(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "John /Doe/", "M", testReport.run_date, None, None, []))
+        testReport.run_checks(["US35"])
+        self.assertEqual(testReport.errors, [])
+        self.assertEqual(testReport.recent_births, [ReportDetail("I1", testReport.run_date)])
+
+
+    def test_marital_status_listings(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "John /Doe/", "M", date(1950, 1, 1), None, None, ["F1"]))
+        testReport.addToReport(Individual("I2", "Jane /Doe/", "F", date(1950, 1, 1), None, None, ["F1"]))
+        testReport.addToReport(Individual("I3", "Sam /Roe/", "M", date(1950, 1, 1), None, None, []))
+        testReport.addToReport(Family("F1", "I1", "I2", [], date(1975, 1, 1), None))
+        testReport.run_checks(["US30"])
+        self.assertEqual([(indi.id, families) for indi, families in testReport.living_married], [("I1", ["F1"]), ("I2", ["F1"])])
+        self.assertEqual(testReport.living_singles, [])
+        testReport.run_checks(skip_ids=["US30"])
+        self.assertEqual([indi.id for indi, _ in testReport.living_singles], ["I3"])
+
+
+    def test_facts_built_once_and_released(self):
+        built: list[str] = []
+        seen: list[set[str]] = []
+        for fact in [Fact("testBase", lambda report: built.append("testBase") or 1), Fact("testDerived", lambda report: built.append("testDerived") or report.facts["testBase"] + 1, ("testBase",))]:
+            registerFact(fact)
+            self.addCleanup(factRegistry.pop, fact.name)
+
+        testReport: Report = Report()
+        testReport.addToReport(Family("F1"))
+        testReport.addToReport(Family("F2"))
+        rules: list[Rule] = [
+            Rule("T1", "Record Rule", "error", family=lambda report, ctx, out: seen.append(set(report.facts)), requires=("testDerived",)),
+            Rule("T2", "Whole Rule", "error", whole=lambda report, out: seen.append(set(report.facts)), requires=("testBase",)),
+        ]
+        Validator(testReport, rules=rules).run()
+        self.assertEqual(built, ["testBase", "testDerived"])
+        self.assertEqual(seen, [{"testBase", "testDerived"}, {"testBase", "testDerived"}, {"testBase"}]) #testDerived is gone once the families have been gone through
+        self.assertEqual(testReport.facts, {})
+
+
+    def test_cached_facts_are_cleared(self):
+        testReport: Report = load_report(sampleFiles[0])
+        testReport.run_checks(["US19"])
+        self.assertIsNone(testReport.kinship)
+        self.assertIsNone(testReport.interned_graph)
+        self.assertEqual(testReport.facts, {})
+
+
+    def test_parallel_same_as_serial(self):
+        for path in sampleFiles:
+            for lazy in [False, True]:
+                serialReport: Report = load_report(path, lazy_dates=lazy)
+                parallelReport: Report = load_report(path, lazy_dates=lazy)
+                serialReport.run_checks()
+                parallelReport.run_checks(jobs=3)
+                self.assertEqual([error.getRowData() for error in parallelReport.errors], [error.getRowData() for error in serialReport.errors])
+                self.assertEqual([anomaly.getRowData() for anomaly in parallelReport.anomalies], [anomaly.getRowData() for anomaly in serialReport.anomalies])
+
+
+    def test_shardable_rules(self):
+        shardable: list[str] = [rule.id for rule in ruleRegistry.values() if isShardable(rule)]
+        for ruleId in ["US02", "US04", "US08", "US09", "US10", "US12", "US14", "US15", "US16", "US21", "US25"]:
+            self.assertIn(ruleId, shardable)
+        for ruleId in ["US26", "US11", "US17", "US18", "US19", "US23", "US39"]:
+            self.assertNotIn(ruleId, shardable)
+
+
+    def test_component_parallel_same_as_serial(self):
+        from tests.Components_Tests import makeForest
+        serialReport: Report = makeForest(6)
+        parallelReport: Report = makeForest(6)
+        serialReport.run_checks()
+        parallelReport.run_checks(jobs=3)
+        self.assertEqual([anomaly.getRowData() for anomaly in parallelReport.anomalies], [anomaly.getRowData() for anomaly in serialReport.anomalies])
+        self.assertEqual(len([anomaly for anomaly in parallelReport.anomalies if anomaly.detailType == "Sibling Marriage"]), 6)
+        componentShardable: list[str] = [rule.id for rule in ruleRegistry.values() if isComponentShardable(rule)]
+        for ruleId in ["US03", "US17", "US18", "US19", "US26"]:
+            self.assertIn(ruleId, componentShardable)
+        for ruleId in ["US02", "US11", "US23", "CYCLES", "US39"]: #Family shards, or the whole report
+            self.assertNotIn(ruleId, componentShardable)
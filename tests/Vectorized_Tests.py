@@ -0,0 +1,74 @@
+import random
+import unittest
+from datetime import date, timedelta
+from classes.GEDCOM_Reporting import Report
+from classes.GEDCOM_Units import Individual, Family
+from classes.GEDCOM_Parser import load_report
+from classes.GEDCOM_Columnar import ColumnarStore
+from classes.GEDCOM_Validation import Validator
+from classes.GEDCOM_Vectorized import numpy
+
+sampleFiles: list[str] = ["Acceptance_File.txt", "GEDCOM_Sample_V2.txt", "GEDCOM_Sample_V3.ged"]
+dateRules: list[str] = ["US02", "US03", "US04", "US05", "US06", "US07", "US10"]
+
+#Makes a report full of random dates (some missing), including leap days and spouses that don't have a record
+def makeRandomReport(seed: int) -> Report:
+    generator: random.Random = random.Random(seed)
+    def randomDate() -> date:
+        if(generator.random() < 0.2):
+            return None
+        if(generator.random() < 0.1):
+            return date(generator.choice([1600, 1904, 1996, 2000]), 2, 29)
+        return date(1700, 1, 1) + timedelta(days=generator.randrange(120000))
+    testReport: Report = Report()
+    for i in range(200):
+        testReport.addToReport(Individual(f"I{i}", f"Person /{i}/", generator.choice("MF"), randomDate(), randomDate(), None, []))
+    for i in range(150):
+        testReport.addToReport(Family(f"F{i}", f"I{generator.randrange(220)}", f"I{generator.randrange(220)}", [], randomDate(), randomDate()))
+    return testReport
+
+#Runs the date checks on the report, with or without the vectorized versions, and gives back what they found
+def runDateRules(report: Report, vectorized: bool) -> list[list[str]]:
+    report.errors = []
+    report.anomalies = []
+    Validator(report, dateRules, vectorized=vectorized).run()
+    return [detail.getRowData() for detail in report.errors + report.anomalies]
+
+@unittest.skipIf(numpy is None, "NumPy isn't installed")
+class Vectorized_Tests(unittest.TestCase):
+    def test_same_as_scalar_on_samples(self):
+        for path in sampleFiles:
+            for lazy in [False, True]:
+                testReport: Report = load_report(path, lazy_dates=lazy)
+                self.assertEqual(runDateRules(testReport, True), runDateRules(testReport, False))
+
+
+    def test_same_as_scalar_on_random_dates(self):
+        for seed in range(5):
+            testReport: Report = makeRandomReport(seed)
+            scalar: list[list[str]] = runDateRules(testReport, False)
+            self.assertGreater(len(scalar), 0)
+            self.assertEqual(runDateRules(testReport, True), scalar)
+
+
+    def test_same_as_scalar_on_columnar(self):
+        normalReport: Report = makeRandomReport(10)
+        columnarReport: Report = ColumnarStore.fromReport(normalReport).asReport()
+        self.assertEqual(runDateRules(columnarReport, True), runDateRules(normalReport, False))
+
+
+    def test_leap_day_ages(self):
+        testReport: Report = Report()
+        testReport.addToReport(Individual("I1", "Leap /Day/", "M", date(1996, 2, 29), None, None, ["F1"]))
+        testReport.addToReport(Individual("I2", "Old /Man/", "M", date(1800, 3, 1), date(1951, 3, 1), None, []))
+        testReport.addToReport(Individual("I3", "Not /Quite/", "M", date(1800, 3, 1), date(1951, 2, 28), None, []))
+        testReport.addToReport(Family("F1", "I1", None, [], date(2010, 2, 28), None))
+        self.assertEqual(runDateRules(testReport, True), runDateRules(testReport, False))
+        self.assertEqual([row[0] for row in runDateRules(testReport, True)], ["Over 150 Years Old", "Marriage Before 14"])
+
+
+    def test_empty_report(self):
+        testReport: Report = Report()
+        testReport.addToReport(Family("F1", "I1", "I2", [], date(2000, 1, 1), date(1999, 1, 1)))
+        self.assertEqual(runDateRules(testReport, True), runDateRules(testReport, False))
+        self.assertEqual(testReport.facts, {})